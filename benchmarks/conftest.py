@@ -0,0 +1,34 @@
+import os
+import pytest
+from requests_oauthlib import OAuth2Session
+from classification import Classification
+from mockportal import MockPortal
+
+
+# The mock portal speaks plain HTTP
+os.environ.setdefault('OAUTHLIB_INSECURE_TRANSPORT', '1')
+
+
+def make_client(portal, **options):
+    session = OAuth2Session(client_id='dummy',
+                            token={'access_token': 'dummy',
+                                   'token_type': 'Bearer'})
+    client = Classification('dummy', 'dummy', session=session, **options)
+    client.API_URL = portal.url
+    return client
+
+
+@pytest.fixture(scope='session')
+def portal():
+    with MockPortal(students=int(os.environ.get('BENCH_STUDENTS', 300)),
+                    tasks=int(os.environ.get('BENCH_TASKS', 20)),
+                    latency=float(os.environ.get('BENCH_LATENCY', 0)),
+                    groups=int(os.environ.get('BENCH_GROUPS', 10)),
+                    seed=int(os.environ.get('BENCH_SEED', 0))) \
+            as portal:
+        yield portal
+
+
+@pytest.fixture
+def client(portal):
+    return make_client(portal)
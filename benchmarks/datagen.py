@@ -0,0 +1,239 @@
+"""A generator of synthetic courses for load testing.
+
+It produces data shaped like the responses of
+:py:meth:`~classification.classification.Classification.find_classifications_for_course`
+(classification definitions),
+:py:meth:`~classification.classification.Classification.get_course_groups`
+and
+:py:meth:`~classification.classification.Classification.find_student_group_classifications`
+(``username`` plus ``classificationMap``). The output is deterministic
+for a given seed and the student records can be streamed one by one,
+so even faculty-sized courses never have to be held in memory.
+
+Run it as a script to write the data to disk::
+
+    python benchmarks/datagen.py --students 20000 --tasks 40 out/
+
+"""
+
+import argparse
+import json
+import os
+import random
+
+
+VALUE_TYPES = ('NUMBER', 'BOOLEAN', 'STRING')
+
+
+class CourseGenerator:
+    """Generates a synthetic course.
+
+    Attributes:
+        students (int): The number of students.
+        tasks (int): The number of regular (not calculated) tasks.
+        groups (int): The number of student groups.
+        value_types (Tuple[str]): Value types of regular tasks,
+            assigned in a round-robin fashion (with ``NUMBER`` first).
+        fill_rate (float): The probability that a student has a grade
+            for a regular task.
+        seed (int): The seed making the output reproducible.
+        course_code (str): The code of the course.
+        semester (str): The semester code.
+
+    """
+
+    def __init__(self, students=1000, tasks=20, groups=10,
+                 value_types=VALUE_TYPES, fill_rate=0.9, seed=0,
+                 course_code='BI-SYN', semester='B241'):
+        self.students = students
+        self.tasks = tasks
+        self.groups = groups
+        self.value_types = tuple(value_types)
+        self.fill_rate = fill_rate
+        self.seed = seed
+        self.course_code = course_code
+        self.semester = semester
+        self._definitions = None
+
+    def usernames(self):
+        """Yields usernames of all the students."""
+
+        for s in range(self.students):
+            yield f'student{s:06}'
+
+    def group_code(self, username):
+        """Returns the code of the group the student belongs to."""
+
+        rng = random.Random(f'{self.seed}:group:{username}')
+        return f'G{rng.randrange(self.groups):03}'
+
+    def course_groups(self):
+        """Returns groups shaped like ``get_course_groups`` output."""
+
+        return [{'code': f'G{g:03}', 'name': f'Parallel {g + 1}'}
+                for g in range(self.groups)]
+
+    def definitions(self):
+        """Returns definitions like ``find_classifications_for_course``.
+
+        Regular tasks are followed by calculated ones: ``total``
+        (the sum of numeric tasks), ``passed`` (comparing ``total``
+        with the required minimum) and ``mark`` (derived from both).
+
+        """
+
+        if self._definitions is not None:
+            return self._definitions
+
+        rng = random.Random(f'{self.seed}:definitions')
+        definitions = list()
+
+        for t in range(self.tasks):
+            value_type = self.value_types[t % len(self.value_types)]
+            maximum = float(rng.choice([5, 10, 20, 30])) \
+                if value_type == 'NUMBER' else None
+            definitions.append(self._definition(
+                len(definitions), f'task{t:03}', value_type,
+                maximum=maximum,
+                minimum=maximum / 2 if maximum else None,
+                mandatory=value_type == 'NUMBER' and rng.random() < 0.3))
+
+        numeric = [d['identifier'] for d in definitions
+                   if d['valueType'] == 'NUMBER']
+        maximum = sum(d['maximumValue'] for d in definitions
+                      if d['valueType'] == 'NUMBER')
+        required = maximum / 2
+
+        definitions.append(self._definition(
+            len(definitions), 'total', 'NUMBER',
+            expression=' + '.join(numeric) or '0', maximum=maximum,
+            minimum=required, mandatory=True))
+        definitions.append(self._definition(
+            len(definitions), 'passed', 'BOOLEAN',
+            expression=f'total >= {required}'))
+        definitions.append(self._definition(
+            len(definitions), 'mark', 'STRING',
+            expression=f'if(passed, if(total >= {maximum * 0.9}, "A", "C"),'
+                       f' "F")'))
+
+        self._definitions = definitions
+        return definitions
+
+    def student_record(self, username):
+        """Returns the record of one student with its classification map."""
+
+        rng = random.Random(f'{self.seed}:grades:{username}')
+        grades = dict()
+        total = 0.0
+
+        for definition in self.definitions():
+            if definition['calculated']:
+                continue
+            if rng.random() >= self.fill_rate:
+                continue
+
+            identifier = definition['identifier']
+            value_type = definition['valueType']
+            if value_type == 'NUMBER':
+                value = round(rng.uniform(0, definition['maximumValue']), 2)
+                total += value
+            elif value_type == 'BOOLEAN':
+                value = rng.random() < 0.8
+            else:
+                value = f'{rng.getrandbits(32):08x}'
+            grades[identifier] = value
+
+        definitions = {d['identifier']: d for d in self.definitions()}
+        passed = total >= definitions['total']['minimumRequiredValue']
+        grades['total'] = round(total, 2)
+        grades['passed'] = passed
+        grades['mark'] = 'F' if not passed else \
+            'A' if total >= definitions['total']['maximumValue'] * 0.9 \
+            else 'C'
+
+        return {'username': username,
+                'firstName': f'First{username[7:]}',
+                'lastName': f'Last{username[7:]}',
+                'fullName': None,
+                'email': f'{username}@fit.cvut.cz',
+                'classificationMap': grades}
+
+    def group_classifications(self, group_code='ALL'):
+        """Yields records like ``find_student_group_classifications``."""
+
+        for username in self.usernames():
+            if group_code == 'ALL' or self.group_code(username) == group_code:
+                yield self.student_record(username)
+
+    def write_definitions(self, path):
+        """Writes the definitions as a JSON array."""
+
+        with open(path, 'w') as f:
+            json.dump(self.definitions(), f)
+
+    def write_group_classifications(self, path, group_code='ALL'):
+        """Streams the student records into a JSON array in a file.
+
+        Returns:
+            The number of written records.
+
+        """
+
+        count = 0
+        with open(path, 'w') as f:
+            f.write('[')
+            for record in self.group_classifications(group_code):
+                if count:
+                    f.write(',\n')
+                json.dump(record, f)
+                count += 1
+            f.write(']\n')
+        return count
+
+    def _definition(self, index, identifier, value_type, expression=None,
+                    maximum=None, minimum=None, mandatory=False):
+        return {'id': index + 1,
+                'identifier': identifier,
+                'lowercaseIdentifier': identifier.lower(),
+                'courseCode': self.course_code,
+                'semesterCode': self.semester,
+                'calculated': expression is not None,
+                'expression': expression,
+                'minimumRequiredValue': minimum,
+                'maximumValue': maximum,
+                'classificationType': 'OTHER' if expression else 'HOMEWORK',
+                'valueType': value_type,
+                'classificationTextDtos': [{'identifier': 'cs',
+                                            'name': identifier}],
+                'hidden': False,
+                'mandatory': mandatory,
+                'index': index}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('output', help='directory for the generated files')
+    parser.add_argument('--students', type=int, default=1000)
+    parser.add_argument('--tasks', type=int, default=20)
+    parser.add_argument('--groups', type=int, default=10)
+    parser.add_argument('--value-types', default=','.join(VALUE_TYPES))
+    parser.add_argument('--fill-rate', type=float, default=0.9)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    generator = CourseGenerator(args.students, args.tasks, args.groups,
+                                args.value_types.split(','), args.fill_rate,
+                                args.seed)
+
+    os.makedirs(args.output, exist_ok=True)
+    generator.write_definitions(os.path.join(args.output,
+                                             'definitions.json'))
+    with open(os.path.join(args.output, 'groups.json'), 'w') as f:
+        json.dump(generator.course_groups(), f)
+    count = generator.write_group_classifications(
+        os.path.join(args.output, 'student-classifications.json'))
+    print(f'Generated {count} students into {args.output}')
+
+
+if __name__ == '__main__':
+    main()
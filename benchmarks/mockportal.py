@@ -0,0 +1,221 @@
+"""A local stand-in for the Classification portal API.
+
+It implements the endpoints used by
+:py:class:`classification.classification.Classification` well enough
+to benchmark the library without network access. Every response can be
+delayed by a configurable latency. The course is synthesized by
+:py:class:`datagen.CourseGenerator`, so its size (students, tasks
+and groups) determines the size of the payloads.
+
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from datagen import CourseGenerator
+
+
+API_PATH = '/api/v1'
+
+
+class MockPortal:
+    """A threaded HTTP server pretending to be the portal.
+
+    Attributes:
+        latency (float): Seconds every response is delayed by.
+        definitions (List[dict]): Classification definitions
+            of every course.
+        grades (Dict[str, Dict[str, Any]]): Grades in the s2t format,
+            shared by every course.
+        students (Dict[str, dict]): Student records (without grades)
+            by username.
+        groups (Dict[str, List[str]]): Usernames in each group.
+        editors (Dict[str, Set[str]]): Editors per course.
+        requests (int): The number of handled requests.
+
+    """
+
+    def __init__(self, students=100, tasks=10, latency=0.0,
+                 host='127.0.0.1', port=0, groups=10, seed=0):
+        self.latency = latency
+        generator = CourseGenerator(students, tasks, groups, seed=seed)
+        self.definitions = generator.definitions()
+        self.students = dict()
+        self.grades = dict()
+        self.groups = {g['code']: list() for g in generator.course_groups()}
+        for record in generator.group_classifications():
+            username = record['username']
+            self.grades[username] = record.pop('classificationMap')
+            self.students[username] = record
+            self.groups[generator.group_code(username)].append(username)
+        self.editors = dict()
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._routes = [(method, re.compile(pattern), handler)
+                        for method, pattern, handler in self._route_table()]
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """The base URL to be used as ``Classification.API_URL``."""
+
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}{API_PATH}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    # -----------------------------------------------
+    # ------------------- ROUTES --------------------
+    # -----------------------------------------------
+    def group_classifications(self, query, body, course, group):
+        usernames = self.groups.get(group) if group != 'ALL' \
+            else sorted(self.students)
+        if usernames is None:
+            return 404, None
+        return 200, [dict(self.students[u], classificationMap=self.grades[u])
+                     for u in usernames]
+
+    def definitions_for_course(self, query, body, course):
+        return 200, self.definitions
+
+    def definition(self, query, body, course, identifier):
+        for definition in self.definitions:
+            if definition['identifier'] == identifier:
+                return 200, definition
+        return 404, None
+
+    def student_classification(self, query, body, course, username):
+        if username not in self.grades:
+            return 404, None
+        return 200, {'username': username,
+                     'studentClassificationFullDtos': [
+                         dict(d, value=self.grades[username].get(
+                             d['identifier']))
+                         for d in self.definitions]}
+
+    def save_student_classifications(self, query, body, course):
+        with self._lock:
+            for item in body:
+                self.grades.setdefault(item['studentUsername'], dict())[
+                    item['classificationIdentifier']] = item.get('value')
+        return 201, None
+
+    def course_groups(self, query, body, course):
+        return 200, [{'code': code, 'name': code} for code in self.groups]
+
+    def get_editors(self, query, body, course):
+        return 200, sorted(self.editors.get(course, set()))
+
+    def add_editor(self, query, body, course, username):
+        with self._lock:
+            self.editors.setdefault(course, set()).add(username)
+        return 201, None
+
+    def delete_editor(self, query, body, course, username):
+        with self._lock:
+            self.editors.get(course, set()).discard(username)
+        return 204, None
+
+    def clone(self, query, body, course, target):
+        return 201, None
+
+    def analyses(self, query, body, prefix=None):
+        if 'expressions' in body:
+            return 201, {k: {'valid': True} for k in body['expressions']}
+        return 201, {'valid': True}
+
+    def settings(self, query, body):
+        return 200, {'unsubscribeEmails': False}
+
+    def _route_table(self):
+        c = r'/public/courses/(?P<course>[^/]+)'
+        return [
+            ('GET', c + r'/group/(?P<group>[^/]+)/student-classifications$',
+             self.group_classifications),
+            ('GET', c + r'/classifications$', self.definitions_for_course),
+            ('GET', c + r'/classifications/(?P<identifier>[^/]+)$',
+             self.definition),
+            ('GET', c + r'/student-classifications/(?P<username>[^/]+)$',
+             self.student_classification),
+            ('PUT', c + r'/student-classifications$',
+             self.save_student_classifications),
+            ('PUT', c + r'/classifications/clones/(?P<target>[^/]+)$',
+             self.clone),
+            ('GET', c + r'/editors$', self.get_editors),
+            ('PUT', c + r'/editors/(?P<username>[^/]+)$', self.add_editor),
+            ('DELETE', c + r'/editors/(?P<username>[^/]+)$',
+             self.delete_editor),
+            ('GET', r'/public/course/(?P<course>[^/]+)/student-groups$',
+             self.course_groups),
+            ('POST', r'/public/(?P<prefix>course-)?expressions/analyses$',
+             self.analyses),
+            ('GET', r'/public/settings/my$', self.settings),
+        ]
+
+    def _dispatch(self, method, path, query, body):
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        if not path.startswith(API_PATH):
+            return 404, None
+        path = path[len(API_PATH):]
+
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if route_method != method or match is None:
+                continue
+            return handler(query, body, **match.groupdict())
+
+        return 404, None
+
+    def _handler(self):
+        portal = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _serve(self):
+                parsed = urlparse(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length) if length else b''
+                body = json.loads(raw) if raw else None
+
+                status, payload = portal._dispatch(
+                    self.command, parsed.path, parse_qs(parsed.query), body)
+
+                data = b'' if payload is None else \
+                    json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_PUT = do_POST = do_DELETE = _serve
+
+        return Handler
@@ -0,0 +1,43 @@
+"""Encoding one million grades into save request bodies in one
+process compared to a pool of processes."""
+
+import json
+from classification import payloadconverters
+from classification.bulk import encode_s2t_chunks
+from datagen import CourseGenerator
+import pytest
+
+
+STUDENTS = 50000
+TASKS = 17  # plus 3 calculated ones, i.e. 20 grades per student
+CHUNK_SIZE = 10000
+
+
+@pytest.fixture(scope='module')
+def s2t():
+    return payloadconverters.s2t_from_get_response(
+        CourseGenerator(STUDENTS, TASKS, fill_rate=1.0)
+        .group_classifications())
+
+
+def convert_and_dump(student_to_tasks):
+    body = payloadconverters.save_request_from_s2t(student_to_tasks,
+                                                   as_dicts=True)
+    return [json.dumps(body[i:i + CHUNK_SIZE]).encode('utf-8')
+            for i in range(0, len(body), CHUNK_SIZE)]
+
+
+@pytest.mark.benchmark(group='encode-1M')
+@pytest.mark.parametrize('processes', [1, None], ids=['serial', 'pool'])
+def test_encode(benchmark, s2t, processes):
+    chunks = benchmark.pedantic(encode_s2t_chunks, (s2t,),
+                                {'chunk_size': CHUNK_SIZE,
+                                 'processes': processes}, rounds=3)
+    assert len(chunks) == 100
+
+
+@pytest.mark.benchmark(group='encode-1M')
+def test_convert_and_dump(benchmark, s2t):
+    chunks = benchmark.pedantic(convert_and_dump, (s2t,), rounds=3)
+    assert len(chunks) == 100
+
@@ -0,0 +1,58 @@
+"""Speed of the payload converters and of entity serialization."""
+
+from classification import payloadconverters
+from classification.entities import StudentClassificationPreviewDto, \
+    ClassificationDto
+import pytest
+from datagen import CourseGenerator
+
+
+SIZES = [1000, 10000, 100000]
+TASKS = 20
+
+
+def get_response(records):
+    students = max(1, records // TASKS)
+    return list(CourseGenerator(students, TASKS, fill_rate=1.0)
+                .group_classifications())
+
+
+@pytest.fixture(params=SIZES, ids=lambda n: f'{n}-grades')
+def response(request):
+    return get_response(request.param)
+
+
+def test_s2t_from_get_response(benchmark, response):
+    benchmark(payloadconverters.s2t_from_get_response, response)
+
+
+def test_t2s_from_get_response(benchmark, response):
+    benchmark(payloadconverters.t2s_from_get_response, response)
+
+
+def test_save_request_from_s2t(benchmark, response):
+    s2t = payloadconverters.s2t_from_get_response(response)
+    benchmark(payloadconverters.save_request_from_s2t, s2t)
+
+
+def test_save_request_from_t2s(benchmark, response):
+    t2s = payloadconverters.t2s_from_get_response(response)
+    benchmark(payloadconverters.save_request_from_t2s, t2s)
+
+
+@pytest.mark.parametrize('count', SIZES)
+def test_student_classification_to_dict(benchmark, count):
+    dtos = [StudentClassificationPreviewDto(
+        classification_identifier=f'task{i % TASKS:03}',
+        student_username=f'student{i // TASKS:06}',
+        value=float(i)) for i in range(count)]
+    benchmark(lambda: [dto.to_dict() for dto in dtos])
+
+
+def test_classification_dto_to_dict(benchmark):
+    dto = ClassificationDto(identifier='total', calculated=True,
+                            expression='task001 + task002',
+                            classification_text_dtos=[
+                                {'identifier': 'cs', 'name': 'Celkem'}],
+                            value_type='NUMBER', mandatory=True)
+    benchmark(dto.to_dict)
@@ -0,0 +1,104 @@
+"""Optimized payload converters compared to the original ones
+on a response with one million grades."""
+
+from classification import payloadconverters
+from classification.entities import StudentClassificationPreviewDto
+from datagen import CourseGenerator
+import pytest
+
+
+STUDENTS = 50000
+TASKS = 17  # plus 3 calculated ones, i.e. 20 grades per student
+
+
+def legacy_s2t_from_get_response(resp_body):
+    result = dict()
+    for record in resp_body:
+        username = record['username']
+        grades = record['classificationMap']
+        result_for_student = dict()
+        for task, grade in grades.items():
+            result_for_student[task] = grade
+        result[username] = result_for_student
+    return result
+
+
+def legacy_save_body_from_s2t(student_to_tasks):
+    result = list()
+    for username, grades in student_to_tasks.items():
+        for task, value in grades.items():
+            elem = StudentClassificationPreviewDto(
+                classification_identifier=task,
+                student_username=username,
+                value=value
+            )
+            result.append(elem)
+    return [dto.to_dict() for dto in result]
+
+
+def save_body_from_s2t(student_to_tasks):
+    return payloadconverters.save_request_from_s2t(student_to_tasks,
+                                                   as_dicts=True)
+
+
+def s2t_without_copy(resp_body):
+    return payloadconverters.s2t_from_get_response(resp_body, copy=False)
+
+
+def first_column_of_view(s2t):
+    return payloadconverters.TransposedView(s2t)['task000']
+
+
+def first_column_of_t2s(resp_body):
+    return payloadconverters.t2s_from_get_response(resp_body)['task000']
+
+
+@pytest.fixture(scope='module')
+def response():
+    result = list(CourseGenerator(STUDENTS, TASKS, fill_rate=1.0)
+                  .group_classifications())
+    assert sum(len(r['classificationMap']) for r in result) == 1000000
+    return result
+
+
+@pytest.fixture(scope='module')
+def s2t(response):
+    return payloadconverters.s2t_from_get_response(response)
+
+
+@pytest.mark.benchmark(group='s2t-1M')
+@pytest.mark.parametrize('convert', [
+    legacy_s2t_from_get_response,
+    payloadconverters.s2t_from_get_response,
+    s2t_without_copy,
+], ids=['legacy', 'copy', 'no-copy'])
+def test_s2t(benchmark, response, convert):
+    result = benchmark(convert, response)
+    assert len(result) == STUDENTS
+
+
+@pytest.mark.benchmark(group='t2s-1M')
+def test_t2s(benchmark, response):
+    result = benchmark(payloadconverters.t2s_from_get_response, response)
+    assert len(result) == TASKS + 3
+
+
+@pytest.mark.benchmark(group='one-t2s-column-1M')
+def test_one_column_eager(benchmark, response):
+    benchmark(first_column_of_t2s, response)
+
+
+@pytest.mark.benchmark(group='one-t2s-column-1M')
+def test_one_column_lazy(benchmark, s2t):
+    benchmark(first_column_of_view, s2t)
+
+
+@pytest.mark.benchmark(group='save-body-1M')
+@pytest.mark.parametrize('convert', [
+    legacy_save_body_from_s2t,
+    save_body_from_s2t,
+], ids=['legacy', 'optimized'])
+def test_save_body(benchmark, s2t, convert):
+    result = benchmark.pedantic(convert, (s2t,), rounds=3)
+    assert len(result) == 1000000
+
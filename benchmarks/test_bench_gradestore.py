@@ -0,0 +1,41 @@
+"""Queries of the indexed in-memory grade store."""
+
+from classification.gradestore import GradeStore
+from datagen import CourseGenerator
+import pytest
+
+
+@pytest.fixture(scope='module')
+def store():
+    generator = CourseGenerator(students=10000, tasks=30)
+    store = GradeStore()
+    store.set_definitions(generator.definitions())
+    store.add_records(generator.group_classifications())
+    return store
+
+
+def test_below_minimum(benchmark, store):
+    result = benchmark(store.below_minimum)
+    assert result
+
+
+def test_range(benchmark, store):
+    result = benchmark(store.range, 'task000', 0, 1)
+    assert result
+
+
+def test_student(benchmark, store):
+    assert benchmark(store.student, 'student000042')
+
+
+def test_add_records(benchmark):
+    records = list(CourseGenerator(students=20000, tasks=17)
+                   .group_classifications())
+
+    def load():
+        store = GradeStore()
+        store.add_records(records)
+        return store
+
+    store = benchmark.pedantic(load, rounds=3)
+    assert len(store.students()) == 20000
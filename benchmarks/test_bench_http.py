@@ -0,0 +1,57 @@
+"""Throughput and latency of API calls against the local mock portal."""
+
+from concurrent.futures import ThreadPoolExecutor
+from classification.payloadconverters import s2t_from_get_response
+
+
+def test_find_classifications_for_course(benchmark, client):
+    result = benchmark(client.find_classifications_for_course, 'BI-PYT')
+    assert result
+
+
+def test_find_student_group_classifications(benchmark, client, portal):
+    result = benchmark(client.find_student_group_classifications, 'BI-PYT')
+    assert len(result) == len(portal.grades)
+
+
+def test_find_student_group_classifications_simple_t2s(benchmark, client):
+    result = benchmark(client.find_student_group_classifications_simple_t2s,
+                       'BI-PYT')
+    assert result
+
+
+def test_find_student_classification(benchmark, client):
+    result = benchmark(client.find_student_classification,
+                       'BI-PYT', 'student000000')
+    assert result['username'] == 'student000000'
+
+
+def test_concurrent_reads(benchmark, client, portal):
+    def read_all_groups():
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return list(executor.map(
+                lambda g: client.find_student_group_classifications(
+                    'BI-PYT', g), list(portal.groups)))
+
+    result = benchmark(read_all_groups)
+    assert len(result) == len(portal.groups)
+
+
+def test_save_student_classifications_simple_s2t(benchmark, client, portal):
+    s2t = s2t_from_get_response(
+        client.find_student_group_classifications('BI-PYT'))
+    benchmark(client.save_student_classifications_simple_s2t, 'BI-PYT', s2t)
+
+
+def test_save_student_classifications_simple_t2s(benchmark, client):
+    t2s = client.find_student_group_classifications_simple_t2s('BI-PYT')
+    benchmark(client.save_student_classifications_simple_t2s, 'BI-PYT', t2s)
+
+
+def test_find_student_group_classifications_lazy_t2s_one_task(benchmark,
+                                                              client):
+    def read_one_task():
+        return client.find_student_group_classifications_simple_t2s(
+            'BI-PYT', lazy=True)['task000']
+
+    assert benchmark(read_one_task)
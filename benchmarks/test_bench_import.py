@@ -0,0 +1,13 @@
+"""Time needed to import the library in a fresh interpreter."""
+
+import subprocess
+import sys
+
+
+def import_library():
+    subprocess.run([sys.executable, '-c', 'import classification'],
+                   check=True)
+
+
+def test_import_time(benchmark):
+    benchmark.pedantic(import_library, rounds=5, iterations=1)
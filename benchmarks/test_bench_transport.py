@@ -0,0 +1,39 @@
+"""The overhead of a single API call with the default OAuth2Session
+compared to the lean urllib3 transport."""
+
+from classification import Urllib3Transport
+from conftest import make_client
+import pytest
+
+
+@pytest.fixture(params=[None, Urllib3Transport.from_session],
+                ids=['session', 'urllib3'])
+def transport_client(request, portal):
+    client = make_client(portal, transport=request.param)
+    yield client
+    client.drop_session()
+
+
+@pytest.mark.benchmark(group='transport-overhead')
+def test_empty_get(benchmark, transport_client):
+    assert benchmark(transport_client.get_editors, 'BI-PYT') is None
+
+
+@pytest.mark.benchmark(group='transport-small-get')
+def test_small_get(benchmark, transport_client):
+    result = benchmark(transport_client.find_student_classification,
+                       'BI-PYT', 'student000000')
+    assert result['username'] == 'student000000'
+
+
+@pytest.mark.benchmark(group='transport-large-get')
+def test_large_get(benchmark, transport_client, portal):
+    result = benchmark(transport_client.find_student_group_classifications,
+                       'BI-PYT')
+    assert len(result) == len(portal.grades)
+
+
+@pytest.mark.benchmark(group='transport-put')
+def test_put(benchmark, transport_client):
+    benchmark(transport_client.save_student_classifications_simple_s2t,
+              'BI-PYT', {'student000000': {'task000': 1}})
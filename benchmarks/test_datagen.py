@@ -0,0 +1,51 @@
+"""Sanity checks of the synthetic course generator."""
+
+import json
+from datagen import CourseGenerator, main
+
+
+def test_same_seed_same_course():
+    first = CourseGenerator(students=50, tasks=6, seed=3)
+    second = CourseGenerator(students=50, tasks=6, seed=3)
+    assert first.definitions() == second.definitions()
+    assert list(first.group_classifications()) == \
+        list(second.group_classifications())
+
+
+def test_different_seed_different_grades():
+    first = CourseGenerator(students=50, tasks=6, seed=1)
+    second = CourseGenerator(students=50, tasks=6, seed=2)
+    assert list(first.group_classifications()) != \
+        list(second.group_classifications())
+
+
+def test_calculated_values_follow_expressions():
+    generator = CourseGenerator(students=20, tasks=9, fill_rate=1.0)
+    definitions = {d['identifier']: d for d in generator.definitions()}
+    numeric = [i for i, d in definitions.items()
+               if d['valueType'] == 'NUMBER' and not d['calculated']]
+    assert definitions['total']['expression'] == ' + '.join(numeric)
+    assert {d['valueType'] for d in definitions.values()} == \
+        {'NUMBER', 'BOOLEAN', 'STRING'}
+
+    for record in generator.group_classifications():
+        grades = record['classificationMap']
+        assert grades['total'] == round(sum(grades[i] for i in numeric), 2)
+        assert grades['passed'] == (
+            grades['total'] >= definitions['total']['minimumRequiredValue'])
+
+
+def test_groups_partition_students():
+    generator = CourseGenerator(students=100, groups=4)
+    codes = [g['code'] for g in generator.course_groups()]
+    members = [r['username'] for c in codes
+               for r in generator.group_classifications(c)]
+    assert sorted(members) == list(generator.usernames())
+
+
+def test_main_streams_to_disk(tmpdir):
+    main([str(tmpdir), '--students', '30', '--tasks', '4', '--seed', '7'])
+    with open(tmpdir.join('student-classifications.json')) as f:
+        records = json.load(f)
+    assert records == list(CourseGenerator(30, 4, seed=7)
+                           .group_classifications())
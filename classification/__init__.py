@@ -1,7 +1,24 @@
 from .classification import Classification
 from .classificationproxy import ClassificationParamsProxy
+from .expressioncache import ExpressionCache
+from .singleflight import SingleFlight
+from .retrying import RetryPolicy
+from .ratelimiting import TokenBucket, SQLiteTokenBucket, RateLimiter
+from .circuitbreaker import CircuitBreaker
+from .instrumentation import Instrumentation
+from .tracing import NoOpTracer, InMemoryTracer, OpenTelemetryTracer
+from .compression import Compression
+from .mirror import GradeMirror
+from .gradestore import GradeStore
+from .export import CourseExporter
+from .importer import GradeImporter
+from .orchestration import Plan, Orchestrator
+from .editors import EditorReconciler
+from .batching import WriteBatcher
+from .journal import GradeJournal
+from .transport import Urllib3Transport
 from .exceptions import AuthError, SavedTokenError, \
-    MissingParameterError
+    MissingParameterError, CircuitOpenError, ColumnMappingError
 from .entities import ClassificationTextDto, ClassificationDto,\
     StudentClassificationPreviewDto, UserSettingsDto, \
     UserCourseSettingsDto, ExpressionParseAllRequestDto, \
@@ -9,9 +26,33 @@ from .entities import ClassificationTextDto, ClassificationDto,\
 
 __all__ = ['Classification',
            'ClassificationParamsProxy',
+           'ExpressionCache',
+           'SingleFlight',
+           'RetryPolicy',
+           'TokenBucket',
+           'SQLiteTokenBucket',
+           'RateLimiter',
+           'CircuitBreaker',
+           'Instrumentation',
+           'NoOpTracer',
+           'InMemoryTracer',
+           'OpenTelemetryTracer',
+           'Compression',
+           'GradeMirror',
+           'GradeStore',
+           'CourseExporter',
+           'GradeImporter',
+           'Plan',
+           'Orchestrator',
+           'EditorReconciler',
+           'WriteBatcher',
+           'GradeJournal',
+           'Urllib3Transport',
            'AuthError',
            'SavedTokenError',
            'MissingParameterError',
+           'CircuitOpenError',
+           'ColumnMappingError',
            'ClassificationTextDto',
            'ClassificationDto',
            'StudentClassificationPreviewDto',
@@ -0,0 +1,225 @@
+import threading
+import time
+from concurrent.futures import Future
+from classification.payloadconverters import _preview_dict
+
+
+class _Batch:
+    __slots__ = ('course_code', 'semester', 'started', 'cells')
+
+    def __init__(self, course_code, semester, started):
+        self.course_code = course_code
+        self.semester = semester
+        self.started = started
+        # (username, identifier) -> [value, futures]
+        self.cells = dict()
+
+
+class WriteBatcher:
+    """Merges single grade updates into batched save requests.
+
+    Auto-graders and similar tools save grades one by one, as soon
+    as they are known. Instead of calling
+    :py:meth:`~.classification.Classification.save_student_classifications`
+    for every grade, :py:meth:`submit` them to the batcher. A background
+    thread collects the updates of each course and semester and saves
+    them with a single request once the oldest of them has waited
+    ``max_delay`` seconds or ``max_size`` grades have been collected.
+    When the same grade (a student and a classification) is submitted
+    again before it is saved, only the last value is sent.
+
+    Every :py:meth:`submit` returns a :py:class:`~concurrent.futures.Future`
+    that resolves once the batch with the grade has been saved
+    (or fails with the error of the request). The futures cannot be
+    cancelled.
+
+    Use the batcher as a context manager or call :py:meth:`close`,
+    so that the remaining grades are saved::
+
+        with WriteBatcher(client, max_delay=0.5) as batcher:
+            for submission in submissions:
+                batcher.submit('MI-PYT', submission.username,
+                               'homework_1', grade(submission))
+
+    Attributes:
+        client: The :py:class:`~.classification.Classification` client
+            (or its proxy) used to save the grades.
+        max_delay (float): The maximal time (in seconds) a grade waits
+            before its batch is saved.
+        max_size (int): The number of distinct grades of a course
+            that triggers saving immediately.
+        batches (int): The number of saved batches.
+        collapsed (int): The number of updates replaced by a later
+            update of the same grade.
+
+    """
+
+    def __init__(self, client, max_delay: float=0.5, max_size: int=1000,
+                 **kwargs):
+        """Starts the background thread.
+
+        Args:
+            client: See :py:attr:`client`.
+            max_delay: See :py:attr:`max_delay`.
+            max_size: See :py:attr:`max_size`.
+            **kwargs: Anything that :py:func:`put` function
+                from `Requests
+                <http://docs.python-requests.org/en/master/>`__
+                library can take except for ``params`` and ``json``.
+
+        """
+
+        self.client = client
+        self.max_delay = max_delay
+        self.max_size = max_size
+        self.batches = 0
+        self.collapsed = 0
+        self._kwargs = kwargs
+        self._pending = dict()
+        self._in_flight = 0
+        self._flush_requested = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run,
+                                        name='WriteBatcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, course_code: str, username: str, identifier: str,
+               value, semester: str=None) -> Future:
+        """Queues a grade to be saved.
+
+        Args:
+            course_code: The code of the course.
+            username: The username of the student.
+            identifier: Classification identifier.
+            value: The grade. ``None`` clears it.
+            semester: Semester identifier.
+
+        Returns:
+            A future resolving to the response body of the request
+            that saved the grade.
+
+        Raises:
+            RuntimeError: If the batcher has been closed.
+
+        """
+
+        future = Future()
+        future.set_running_or_notify_cancel()
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('The batcher has been closed')
+
+            key = (course_code, semester)
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = self._pending[key] = _Batch(course_code, semester,
+                                                    time.monotonic())
+                self._condition.notify()
+
+            cell = batch.cells.get((username, identifier))
+            if cell is None:
+                batch.cells[(username, identifier)] = [value, [future]]
+                if len(batch.cells) >= self.max_size:
+                    self._condition.notify()
+            else:
+                cell[0] = value
+                cell[1].append(future)
+                self.collapsed += 1
+
+        return future
+
+    def flush(self, timeout: float=None) -> bool:
+        """Saves all the queued grades now and waits until they are saved.
+
+        Args:
+            timeout: The maximal time to wait (in seconds).
+
+        Returns:
+            Whether everything queued before the call has been saved
+            (successfully or not) in time.
+
+        """
+
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._in_flight, timeout)
+
+    def close(self, timeout: float=None) -> None:
+        """Saves the queued grades and stops the background thread.
+
+        Args:
+            timeout: The maximal time to wait (in seconds).
+
+        """
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                ready = self._wait_for_ready()
+                if ready is None:
+                    return
+                self._in_flight += len(ready)
+
+            for batch in ready:
+                self._save(batch)
+
+            with self._condition:
+                self._in_flight -= len(ready)
+                self._condition.notify_all()
+
+    def _wait_for_ready(self):
+        # Called with the condition held; None means the thread is done
+        while True:
+            if self._closed or self._flush_requested:
+                self._flush_requested = False
+                ready = list(self._pending.values())
+                self._pending.clear()
+                if ready or not self._closed:
+                    return ready
+                return None
+
+            now = time.monotonic()
+            ready = [key for key, batch in self._pending.items()
+                     if len(batch.cells) >= self.max_size
+                     or now - batch.started >= self.max_delay]
+            if ready:
+                return [self._pending.pop(key) for key in ready]
+
+            if self._pending:
+                oldest = min(b.started for b in self._pending.values())
+                self._condition.wait(oldest + self.max_delay - now)
+            else:
+                self._condition.wait()
+
+    def _save(self, batch):
+        body = [_preview_dict(identifier, username, value)
+                for (username, identifier), (value, _) in batch.cells.items()]
+
+        try:
+            result = self.client.save_student_classifications(
+                batch.course_code, body, batch.semester, **self._kwargs)
+        except BaseException as e:
+            for _, futures in batch.cells.values():
+                for future in futures:
+                    future.set_exception(e)
+        else:
+            for _, futures in batch.cells.values():
+                for future in futures:
+                    future.set_result(result)
+        finally:
+            self.batches += 1
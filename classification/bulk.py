@@ -0,0 +1,136 @@
+import contextvars
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List
+from classification.payloadconverters import _preview_dict
+from classification.utils import EncodedJson
+
+
+def encode_s2t_chunks(student_to_tasks, chunk_size: int=10000,
+                      processes: int=None) -> List[EncodedJson]:
+    """Encodes grades in the s2t format into bodies of save requests.
+
+    This is the parallel version of
+    :py:func:`~.payloadconverters.save_request_from_s2t`
+    followed by JSON serialization. Students are split into shards
+    of about ``chunk_size`` grades (the grades of one student always
+    stay together) and the shards are encoded in a pool of processes,
+    so that all the cores are used.
+
+    Every shard is pickled once and sent only to the worker encoding
+    it, so the data travel to the workers just once in total, whatever
+    the start method of :py:mod:`multiprocessing` (the default one
+    is used). Concurrent calls (from several threads) are independent.
+
+    Args:
+        student_to_tasks: Grades in the s2t format
+            (``{username: {identifier: value}}``).
+        chunk_size: The approximate number of grades in one chunk.
+        processes: The number of worker processes. Defaults to
+            the number of CPUs. With 1, everything is encoded
+            in this process.
+
+    Returns:
+        A list of :py:class:`~.utils.EncodedJson` bodies ready for
+        :py:func:`upload_chunks` (or
+        :py:meth:`~.classification.Classification.save_student_classifications`).
+
+    """
+
+    return _encode(list(student_to_tasks.items()), _encode_s2t,
+                   chunk_size, processes)
+
+
+def encode_t2s_chunks(task_to_students, chunk_size: int=10000,
+                      processes: int=None) -> List[EncodedJson]:
+    """Encodes grades in the t2s format into bodies of save requests.
+
+    The same as :py:func:`encode_s2t_chunks`, except that the input
+    is sharded by classifications (the grades of one classification
+    stay together), since transposing it first would cost more than
+    the encoding itself.
+
+    """
+
+    return _encode(list(task_to_students.items()), _encode_t2s,
+                   chunk_size, processes)
+
+
+def upload_chunks(client, course_code: str, chunks, semester: str=None,
+                  max_workers: int=4, **kwargs) -> int:
+    """Saves encoded chunks, at most ``max_workers`` at a time.
+
+    Args:
+        client: The :py:class:`~.classification.Classification` client
+            (or its proxy).
+        course_code: The code of the course.
+        chunks: Encoded bodies, e.g. from :py:func:`encode_s2t_chunks`.
+        semester: Semester identifier.
+        max_workers: The maximal number of concurrent requests.
+        **kwargs: Anything that :py:func:`put` function
+            from `Requests
+            <http://docs.python-requests.org/en/master/>`__
+            library can take except for ``params`` and ``json``.
+
+    Returns:
+        The number of saved chunks.
+
+    Note:
+        On failure, this function raises standard `Requests errors
+        <http://docs.python-requests.org/en/master/
+        _modules/requests/exceptions/>`__.
+
+    """
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(contextvars.copy_context().run,
+                                   client.save_student_classifications,
+                                   course_code, chunk, semester, **kwargs)
+                   for chunk in chunks]
+        for future in futures:
+            future.result()
+
+    return len(futures)
+
+
+def _encode(items, encode, chunk_size, processes):
+    bounds = _shard(items, chunk_size)
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(bounds) <= 1:
+        return [encode(items[start:stop]) for start, stop in bounds]
+
+    processes = min(processes, len(bounds))
+    with ProcessPoolExecutor(processes) as pool:
+        return list(pool.map(encode, (items[start:stop]
+                                      for start, stop in bounds)))
+
+
+def _shard(items, chunk_size):
+    bounds = list()
+    start = size = 0
+    for index, (_, inner) in enumerate(items):
+        size += len(inner)
+        if size >= chunk_size:
+            bounds.append((start, index + 1))
+            start, size = index + 1, 0
+    if start < len(items):
+        bounds.append((start, len(items)))
+    return bounds
+
+
+def _encode_s2t(items):
+    return _dumps([_preview_dict(task, username, value)
+                   for username, grades in items
+                   for task, value in grades.items()])
+
+
+def _encode_t2s(items):
+    return _dumps([_preview_dict(task, username, value)
+                   for task, grades in items
+                   for username, value in grades.items()])
+
+
+def _dumps(body):
+    return EncodedJson(json.dumps(body, allow_nan=False,
+                                  separators=(',', ':')).encode('utf-8'))
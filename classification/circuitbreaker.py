@@ -0,0 +1,210 @@
+import threading
+import time
+from collections import deque
+from requests.exceptions import ConnectionError, Timeout
+from classification.exceptions import CircuitOpenError
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class _GroupState:
+    """The state of the circuit of one endpoint group."""
+
+    def __init__(self, window_size):
+        self.state = CLOSED
+        self.outcomes = deque(maxlen=window_size)
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_successes = 0
+
+
+class CircuitBreaker:
+    """Stops sending requests to the portal while it seems to be down.
+
+    Each endpoint group (see
+    :py:attr:`~.classification.Classification.ENDPOINT_GROUPS`)
+    has its own circuit. A circuit is *closed* at first and requests
+    pass through. The outcomes of the last ``window_size`` requests
+    are remembered; once there are at least ``minimum_calls`` of them
+    and either the rate of failures (connection errors, timeouts and
+    5xx responses) or the rate of slow requests reaches its threshold,
+    the circuit *opens*. While it is open, requests fail immediately
+    with :py:exc:`~.exceptions.CircuitOpenError`. After ``reset_timeout``
+    seconds, the circuit becomes *half-open* and lets
+    ``half_open_max_calls`` probing requests through. If all of them
+    succeed, the circuit closes again, otherwise it opens again.
+
+    The breaker is thread-safe.
+
+    Attributes:
+        failure_rate_threshold (float): The rate of failed requests
+            (from 0 to 1) opening the circuit.
+        slow_call_threshold (float): Requests taking longer than
+            this (in seconds) are considered slow. ``None`` means
+            latency is not taken into account.
+        slow_call_rate_threshold (float): The rate of slow requests
+            (from 0 to 1) opening the circuit.
+        window_size (int): How many recent outcomes are remembered.
+        minimum_calls (int): How many outcomes are needed
+            before the rates are evaluated.
+        reset_timeout (float): How long (in seconds) the circuit
+            stays open before probing.
+        half_open_max_calls (int): The number of probing requests.
+
+    """
+
+    def __init__(self, failure_rate_threshold: float=0.5,
+                 slow_call_threshold: float=None,
+                 slow_call_rate_threshold: float=1.0,
+                 window_size: int=20, minimum_calls: int=10,
+                 reset_timeout: float=30.0, half_open_max_calls: int=1,
+                 clock=None):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.window_size = window_size
+        self.minimum_calls = min(minimum_calls, window_size)
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock or time.monotonic
+        self._groups = dict()
+        self._lock = threading.Lock()
+
+    def state(self, group: str) -> str:
+        """Returns ``'closed'``, ``'open'`` or ``'half_open'``."""
+
+        with self._lock:
+            state = self._groups.get(group)
+            if state is None:
+                return CLOSED
+            if state.state == OPEN and self._retry_in(state) <= 0:
+                return HALF_OPEN
+            return state.state
+
+    def allow(self, group: str) -> None:
+        """Checks that a request of the given group can be sent.
+
+        Raises:
+            ~classification.exceptions.CircuitOpenError: If the circuit
+                is open or all the probes of a half-open circuit
+                are already in flight.
+
+        """
+
+        with self._lock:
+            state = self._group(group)
+
+            if state.state == OPEN:
+                retry_in = self._retry_in(state)
+                if retry_in > 0:
+                    raise CircuitOpenError(group, retry_in)
+                state.state = HALF_OPEN
+                state.probes = 0
+                state.probe_successes = 0
+
+            if state.state == HALF_OPEN:
+                if state.probes >= self.half_open_max_calls:
+                    raise CircuitOpenError(group, 0.0)
+                state.probes += 1
+
+    def measure(self, group: str, send):
+        """Sends a request and records its outcome.
+
+        Exceptions other than connection errors and timeouts (an expired
+        token, for example) tell nothing about the health of the portal,
+        so they are not recorded; the probe they used is released.
+
+        Args:
+            group: The endpoint group of the request.
+            send: A function without arguments sending the request
+                and returning the response.
+
+        Returns:
+            The response returned by ``send``.
+
+        """
+
+        start = self._clock()
+        try:
+            resp = send()
+        except (ConnectionError, Timeout):
+            self.record(group, False, self._clock() - start)
+            raise
+        except BaseException:
+            self.release(group)
+            raise
+
+        self.record(group, resp.status_code < 500, self._clock() - start)
+        return resp
+
+    def record(self, group: str, success: bool, duration: float) -> None:
+        """Records the outcome of a request of the given group."""
+
+        slow = self.slow_call_threshold is not None \
+            and duration > self.slow_call_threshold
+
+        with self._lock:
+            state = self._group(group)
+
+            if state.state == HALF_OPEN:
+                if not success or slow:
+                    self._open(state)
+                    return
+                state.probe_successes += 1
+                if state.probe_successes >= self.half_open_max_calls:
+                    state.state = CLOSED
+                    state.outcomes.clear()
+                return
+
+            if state.state == OPEN:
+                return
+
+            state.outcomes.append((success, slow))
+            if len(state.outcomes) < self.minimum_calls:
+                return
+
+            count = len(state.outcomes)
+            failures = sum(1 for s, _ in state.outcomes if not s)
+            slow_calls = sum(1 for _, s in state.outcomes if s)
+
+            if failures / count >= self.failure_rate_threshold \
+                    or (self.slow_call_threshold is not None
+                        and slow_calls / count
+                        >= self.slow_call_rate_threshold):
+                self._open(state)
+
+    def release(self, group: str) -> None:
+        """Gives back a probe of a half-open circuit taken by
+        :py:meth:`allow` for a request that ended without an outcome."""
+
+        with self._lock:
+            state = self._groups.get(group)
+            if state is not None and state.state == HALF_OPEN \
+                    and state.probes > 0:
+                state.probes -= 1
+
+    def reset(self, group: str=None) -> None:
+        """Closes the circuit of the given group (or of all groups)."""
+
+        with self._lock:
+            if group is None:
+                self._groups.clear()
+            else:
+                self._groups.pop(group, None)
+
+    def _group(self, group):
+        state = self._groups.get(group)
+        if state is None:
+            state = self._groups[group] = _GroupState(self.window_size)
+        return state
+
+    def _open(self, state):
+        state.state = OPEN
+        state.opened_at = self._clock()
+        state.outcomes.clear()
+
+    def _retry_in(self, state):
+        return state.opened_at + self.reset_timeout - self._clock()
@@ -1,18 +1,45 @@
 from classification.sessionutils import get_session_from_token, \
     SavedTokenError, get_new_session, save_token
-from classification.utils import make_dict_body, \
-    get_body_or_raise_error
+from classification.utils import get_body_or_raise_error, \
+    get_raw_body_or_raise_error, encoded_json_as_data, make_dict_body, \
+    make_dict_bodies
 from classification.payloadconverters \
     import save_request_from_s2t, save_request_from_t2s, \
-    s2t_from_get_response, t2s_from_get_response
+    s2t_from_get_response, t2s_from_get_response, TransposedView
 from classification.types import RespDict, ClassificationDtoType, \
-    ParseAllDtoType, ParseDtoType, SettingsDtoType, \
-    CourseSettingsDtoType, StudentClassificationDtoType, \
-    StudentsToTasksType, TasksToStudentsType
+    ParseAllDtoType, ParseDtoType, SettingsDtoType, CourseSettingsDtoType, \
+    StudentClassificationDtoType, StudentsToTasksType, TasksToStudentsType
+from classification.expressioncache import ExpressionCache, MISS
+from classification.singleflight import SingleFlight
+from classification.retrying import RetryPolicy
+from classification.ratelimiting import RateLimiter
+from classification.circuitbreaker import CircuitBreaker
+from classification.instrumentation import Instrumentation, \
+    NULL_MEASUREMENT
+from classification.tracing import NoOpTracer
+from classification.compression import Compression
+from classification.entities import ExpressionParseAllRequestDto, \
+    ExpressionParseRequestDto
+from classification.endpoints import endpoint_groups
 from oauthlib.oauth2 import TokenExpiredError
 from requests.auth import HTTPBasicAuth
 from requests_oauthlib import OAuth2Session
 from functools import wraps
+from contextlib import contextmanager
+import contextvars
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Arguments of API methods recorded as attributes of tracing spans
+_SPAN_ATTRIBUTES = {'course_code': 'course',
+                    'target_course_code': 'course',
+                    'source_course_code': 'source_course',
+                    'group_code': 'group',
+                    'semester': 'semester',
+                    'target_semester': 'semester',
+                    'source_semester': 'source_semester'}
 
 
 class Classification:
@@ -47,13 +74,48 @@ class Classification:
             is used to acquire/refresh token and to make API calls.
             Can be passed through the constructor, but it was
             made possible for the purpose of testing; do not pass
-            it in for the regular usage.
+            it in for the regular usage. With :py:attr:`transport` set,
+            this is the transport wrapping the session.
         client_id (str): A special ID you get when you register
             your application in the
             `AppsManager <https://auth.fit.cvut.cz/manager/>`__.
         client_secret (str): A special secret code you get
             when you register your application in the
             `AppsManager <https://auth.fit.cvut.cz/manager/>`__.
+        expression_cache (~.expressioncache.ExpressionCache): If set,
+            results of :py:meth:`try_validity` and :py:meth:`evaluate_all`
+            are memoized there. ``None`` disables caching.
+        single_flight (~.singleflight.SingleFlight): If set, identical
+            GET requests made concurrently (for example, from several
+            threads of a web application) share a single HTTP request
+            and its parsed result. ``None`` disables coalescing.
+        retry_policy (~.retrying.RetryPolicy): If set, transient
+            failures (connection errors, timeouts and statuses like 503)
+            are retried according to this policy. ``None`` disables
+            retrying.
+        rate_limiter (~.ratelimiting.RateLimiter): If set, every HTTP
+            request waits for a token of its endpoint group
+            (see :py:attr:`ENDPOINT_GROUPS`). ``None`` disables limiting.
+        circuit_breaker (~.circuitbreaker.CircuitBreaker): If set,
+            requests of an endpoint group that keeps failing fail fast
+            with :py:exc:`~.exceptions.CircuitOpenError` instead
+            of being sent. ``None`` disables the breaker.
+        instrumentation (~.instrumentation.Instrumentation): If set,
+            it collects metrics about every HTTP request and calls
+            its hooks around them. ``None`` disables metrics.
+        tracer: Receives nested spans of API calls (see
+            :py:mod:`~classification.tracing`). Defaults to
+            a :py:class:`~.tracing.NoOpTracer`.
+        compression (~.compression.Compression): If set, large request
+            bodies are compressed. ``None`` disables compression.
+        transport (Callable[[OAuth2Session], ~.transport.Transport]):
+            If set, it is called with every new session, and the object
+            it returns makes the API calls instead (see
+            :py:mod:`~classification.transport`). ``None`` makes the calls
+            with the session.
+        ENDPOINT_GROUPS (Dict[str, Tuple[str]]): The names
+            of the API methods grouped by the controller of the API
+            they belong to.
 
     """
 
@@ -63,9 +125,18 @@ class Classification:
     API_URL = 'https://rozvoj.fit.cvut.cz/evolution-dev/' \
               'classification-dev/api/v1'
 
+    ENDPOINT_GROUPS = endpoint_groups()
+
     def __init__(self, client_id: str, client_secret: str,
                  callback_host: str='localhost', callback_port: int=8080,
-                 force_new_token: bool=False, session: OAuth2Session=None):
+                 force_new_token: bool=False, session: OAuth2Session=None,
+                 expression_cache: ExpressionCache=None,
+                 single_flight: SingleFlight=None,
+                 retry_policy: RetryPolicy=None,
+                 rate_limiter: RateLimiter=None,
+                 circuit_breaker: CircuitBreaker=None,
+                 instrumentation: Instrumentation=None, tracer=None,
+                 compression: Compression=None, transport=None):
         """Creates a new instance of the library with a new session.
 
         Initially needed to create a new session, client ID
@@ -94,19 +165,56 @@ class Classification:
                 Can be passed through the constructor, but it was
                 made possible for the purpose of testing; do not pass
                 it in for the regular usage.
+            expression_cache: A cache for expression analysis results.
+                See :py:class:`~.expressioncache.ExpressionCache`.
+                Defaults to ``None`` (no caching).
+            single_flight: Coalesces identical concurrent GET requests.
+                See :py:class:`~.singleflight.SingleFlight`.
+                Defaults to ``None`` (no coalescing).
+            retry_policy: Describes how transient failures are retried.
+                See :py:class:`~.retrying.RetryPolicy`.
+                Defaults to ``None`` (no retrying).
+            rate_limiter: Limits the rate of requests per endpoint group.
+                See :py:class:`~.ratelimiting.RateLimiter`.
+                Defaults to ``None`` (no limiting).
+            circuit_breaker: Fails requests fast while the portal is down.
+                See :py:class:`~.circuitbreaker.CircuitBreaker`.
+                Defaults to ``None`` (no breaker).
+            instrumentation: Collects metrics and calls request hooks.
+                See :py:class:`~.instrumentation.Instrumentation`.
+                Defaults to ``None`` (no metrics).
+            tracer: Receives tracing spans, for example
+                :py:class:`~.tracing.InMemoryTracer` or
+                :py:class:`~.tracing.OpenTelemetryTracer`.
+                Defaults to ``None`` (no tracing).
+            compression: Compresses large request bodies.
+                See :py:class:`~.compression.Compression`.
+                Defaults to ``None`` (bodies are sent uncompressed).
+            transport: Wraps the session in another transport, for example
+                :py:meth:`~.transport.Urllib3Transport.from_session`.
+                Defaults to ``None`` (the session makes the calls).
 
         """
 
         self.session = None
         self.client_id = client_id
         self.client_secret = client_secret
+        self.expression_cache = expression_cache
+        self.single_flight = single_flight
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.instrumentation = instrumentation
+        self.tracer = tracer or NoOpTracer()
+        self.compression = compression
+        self.transport = transport
 
         # Note that session injection is used primarily for testing purposes
         # You will still need client_id and _secret values for token refresh
         if session is None:
             self.reinit_session(callback_host, callback_port, force_new_token)
         else:
-            self.session = session
+            self._use_session(session)
 
     def reinit_session(self, callback_host: str='localhost',
                        callback_port: int=8080,
@@ -129,21 +237,27 @@ class Classification:
 
         if not force_new_token:
             try:
-                self.session = get_session_from_token(self.client_id,
-                                                      self.client_secret,
-                                                      callback_host,
-                                                      callback_port,
-                                                      self.TOKEN_URL)
+                self._use_session(get_session_from_token(self.client_id,
+                                                         self.client_secret,
+                                                         callback_host,
+                                                         callback_port,
+                                                         self.TOKEN_URL))
                 return
             except SavedTokenError:
                 pass
 
         if self.session is None:
 
-            self.session = get_new_session(self.client_id, self.client_secret,
-                                           callback_host, callback_port,
-                                           self.AUTHORIZE_URL,
-                                           self.TOKEN_URL)
+            self._use_session(get_new_session(self.client_id,
+                                              self.client_secret,
+                                              callback_host, callback_port,
+                                              self.AUTHORIZE_URL,
+                                              self.TOKEN_URL))
+
+    def _use_session(self, session):
+        if self.transport is not None:
+            session = self.transport(session)
+        self.session = session
 
     def drop_session(self) -> None:
         """Closes and deletes internal OAuth2 session."""
@@ -166,20 +280,51 @@ class Classification:
 
             except TokenExpiredError:
                 # If the token is expired - get a new one and try again
-                r_token = self.session.token['refresh_token']
-                auth = HTTPBasicAuth(self.client_id, self.client_secret)
-                token = self.session.refresh_token(self.TOKEN_URL,
-                                                   refresh_token=r_token,
-                                                   auth=auth)
-                self.session.token = token
-                save_token(token)
+                with self.tracer.start_span('refresh_token'):
+                    r_token = self.session.token['refresh_token']
+                    auth = HTTPBasicAuth(self.client_id, self.client_secret)
+                    token = self.session.refresh_token(self.TOKEN_URL,
+                                                       refresh_token=r_token,
+                                                       auth=auth)
+                    self.session.token = token
+                    save_token(token)
+                self._count('token_refreshes')
                 return fun(self, *args, **kwargs)
 
         return inner
 
-    # -----------------------------------------------
-    # ---------- CLASSIFICATION CONTROLLER ----------
-    # -----------------------------------------------
+    def traced(fun):
+        """A decorator used internally to trace API methods.
+
+        It wraps the call in a tracing span named after the method,
+        with the course, group and semester among its attributes.
+        Spans of the HTTP requests, token refreshes and processing
+        stages made by the method become its children.
+
+        """
+        signature = inspect.signature(fun)
+
+        @wraps(fun)
+        def inner(self, *args, **kwargs):
+            if not self.tracer.enabled:
+                return fun(self, *args, **kwargs)
+
+            bound = signature.bind_partial(self, *args, **kwargs)
+            bound.apply_defaults()
+            attributes = {_SPAN_ATTRIBUTES[k]: v
+                          for k, v in bound.arguments.items()
+                          if k in _SPAN_ATTRIBUTES and v is not None}
+
+            with self.tracer.start_span(fun.__name__, attributes):
+                return fun(self, *args, **kwargs)
+
+        return inner
+
+    # Methods calling a single endpoint of the API (such as
+    # get_editors or save_student_classifications), rendered
+    # from the table in classification.endpoints
+    # --- Generated by classification.codegen, do not edit ---
+    @traced
     @refresh_token
     def delete_classification(self, course_code: str, classification_id: str,
                               semester: str=None, **kwargs) -> RespDict:
@@ -209,20 +354,21 @@ class Classification:
 
         """
 
-        params = {'classification-identifier': classification_id,
-                  'semester': semester}
-
-        resp = self.session.delete(f'{self.API_URL}/public'
-                                   f'/courses/{course_code}'
-                                   f'/classifications',
-                                   params=params, **kwargs)
+        params = {'classification-identifier': classification_id}
+        if semester is not None:
+            params['semester'] = semester
 
-        return get_body_or_raise_error(resp, 204)
+        return self._request('delete_classification', 'DELETE', 204,
+                             f'{self.API_URL}/public'
+                             f'/courses/{course_code}'
+                             f'/classifications',
+                             params=params, **kwargs)
 
+    @traced
     @refresh_token
     def find_classifications_for_course(self, course_code: str,
                                         semester: str=None, lang: str=None,
-                                        **kwargs) -> RespDict:
+                                        raw: bool=False, **kwargs) -> RespDict:
         """Finds classification for the given course.
 
         See `Classification portal API documentation
@@ -233,6 +379,10 @@ class Classification:
             course_code: The code of the course.
             semester: Semester identifier.
             lang: Language tag.
+            raw: If True, the body is not decoded and
+                a :py:class:`~.utils.RawResponse` with the undecoded
+                bytes and the headers is returned instead.
+                Defaults to False.
             **kwargs: Anything that :py:func:`get` function
                 from `Requests
                 <http://docs.python-requests.org/en/master/>`__
@@ -249,15 +399,19 @@ class Classification:
 
         """
 
-        params = {'semester': semester, 'lang': lang}
+        params = {}
+        if semester is not None:
+            params['semester'] = semester
+        if lang is not None:
+            params['lang'] = lang
 
-        resp = self.session.get(f'{self.API_URL}/public'
-                                f'/courses/{course_code}'
-                                f'/classifications',
-                                params=params, **kwargs)
-
-        return get_body_or_raise_error(resp, 200)
+        return self._request('find_classifications_for_course', 'GET', 200,
+                             f'{self.API_URL}/public'
+                             f'/courses/{course_code}'
+                             f'/classifications',
+                             params=params, raw=raw, **kwargs)
 
+    @traced
     @refresh_token
     def save_classification(self, course_code: str,
                             classification_dto: ClassificationDtoType=None,
@@ -289,15 +443,16 @@ class Classification:
 
         """
 
-        body = make_dict_body(classification_dto)
+        with self._measure('serialize'):
+            body = make_dict_body(classification_dto)
 
-        resp = self.session.post(f'{self.API_URL}/public'
-                                 f'/courses/{course_code}'
-                                 f'/classifications',
-                                 json=body, **kwargs)
-
-        return get_body_or_raise_error(resp, 201)
+        return self._request('save_classification', 'POST', 201,
+                             f'{self.API_URL}/public'
+                             f'/courses/{course_code}'
+                             f'/classifications',
+                             json=body, **kwargs)
 
+    @traced
     @refresh_token
     def change_order_of_classifications(self, course_code: str, indexes: dict,
                                         semester: str=None,
@@ -329,20 +484,22 @@ class Classification:
 
         """
 
-        params = {'semester': semester}
-
-        resp = self.session.put(f'{self.API_URL}/public'
-                                f'/courses/{course_code}'
-                                f'/classifications/order',
-                                params=params, json=indexes,
-                                **kwargs)
+        params = {}
+        if semester is not None:
+            params['semester'] = semester
 
-        return get_body_or_raise_error(resp, 201)
+        return self._request('change_order_of_classifications', 'PUT', 201,
+                             f'{self.API_URL}/public'
+                             f'/courses/{course_code}'
+                             f'/classifications'
+                             f'/order',
+                             params=params, json=indexes, **kwargs)
 
+    @traced
     @refresh_token
     def find_classification(self, course_code: str, identifier: str,
-                            semester: str=None,
-                            lang: str=None, **kwargs) -> RespDict:
+                            semester: str=None, lang: str=None,
+                            raw: bool=False, **kwargs) -> RespDict:
         """Finds classification by identifier.
 
         See `Classification portal API documentation
@@ -354,6 +511,10 @@ class Classification:
             identifier: Classification identifier.
             semester: Semester identifier.
             lang: Language tag.
+            raw: If True, the body is not decoded and
+                a :py:class:`~.utils.RawResponse` with the undecoded
+                bytes and the headers is returned instead.
+                Defaults to False.
             **kwargs: Anything that :py:func:`get` function
                 from `Requests
                 <http://docs.python-requests.org/en/master/>`__
@@ -370,15 +531,19 @@ class Classification:
 
         """
 
-        params = {'semester': semester, 'lang': lang}
+        params = {}
+        if semester is not None:
+            params['semester'] = semester
+        if lang is not None:
+            params['lang'] = lang
 
-        resp = self.session.get(f'{self.API_URL}/public'
-                                f'/courses/{course_code}'
-                                f'/classifications/{identifier}',
-                                params=params, **kwargs)
-
-        return get_body_or_raise_error(resp, 200)
+        return self._request('find_classification', 'GET', 200,
+                             f'{self.API_URL}/public'
+                             f'/courses/{course_code}'
+                             f'/classifications/{identifier}',
+                             params=params, raw=raw, **kwargs)
 
+    @traced
     @refresh_token
     def clone_classification_definitions(self, target_semester: str,
                                          target_course_code: str,
@@ -418,19 +583,17 @@ class Classification:
                   'source-semester': source_semester,
                   'remove-existing': remove_existing}
 
-        resp = self.session.put(f'{self.API_URL}/public'
-                                f'/courses/{source_course_code}'
-                                f'/classifications'
-                                f'/clones/{target_course_code}',
-                                params=params, **kwargs)
-
-        return get_body_or_raise_error(resp, 201)
+        return self._request('clone_classification_definitions', 'PUT', 201,
+                             f'{self.API_URL}/public'
+                             f'/courses/{source_course_code}'
+                             f'/classifications'
+                             f'/clones/{target_course_code}',
+                             params=params, **kwargs)
 
-    # -----------------------------------------------
-    # -------------- EDITOR CONTROLLER --------------
-    # -----------------------------------------------
+    @traced
     @refresh_token
-    def get_editors(self, course_code: str, **kwargs) -> RespDict:
+    def get_editors(self, course_code: str, raw: bool=False,
+                    **kwargs) -> RespDict:
         """Get editors.
 
         See `Classification portal API documentation
@@ -439,6 +602,10 @@ class Classification:
 
         Args:
             course_code: The code of the course.
+            raw: If True, the body is not decoded and
+                a :py:class:`~.utils.RawResponse` with the undecoded
+                bytes and the headers is returned instead.
+                Defaults to False.
             **kwargs: Anything that :py:func:`get` function
                 from `Requests
                 <http://docs.python-requests.org/en/master/>`__
@@ -455,12 +622,13 @@ class Classification:
 
         """
 
-        resp = self.session.get(f'{self.API_URL}/public'
-                                f'/courses/{course_code}/editors',
-                                **kwargs)
-
-        return get_body_or_raise_error(resp, 200)
+        return self._request('get_editors', 'GET', 200,
+                             f'{self.API_URL}/public'
+                             f'/courses/{course_code}'
+                             f'/editors',
+                             raw=raw, **kwargs)
 
+    @traced
     @refresh_token
     def delete_editor(self, course_code: str, username: str,
                       **kwargs) -> RespDict:
@@ -489,13 +657,13 @@ class Classification:
 
         """
 
-        resp = self.session.delete(f'{self.API_URL}/public'
-                                   f'/courses/{course_code}'
-                                   f'/editors/{username}',
-                                   **kwargs)
-
-        return get_body_or_raise_error(resp, 204)
+        return self._request('delete_editor', 'DELETE', 204,
+                             f'{self.API_URL}/public'
+                             f'/courses/{course_code}'
+                             f'/editors/{username}',
+                             **kwargs)
 
+    @traced
     @refresh_token
     def add_editor(self, course_code: str, username: str,
                    **kwargs) -> RespDict:
@@ -521,18 +689,16 @@ class Classification:
             On failure, this method raises standard `Requests errors
             <http://docs.python-requests.org/en/master/
             _modules/requests/exceptions/>`__.
-        """
 
-        resp = self.session.put(f'{self.API_URL}/public'
-                                f'/courses/{course_code}'
-                                f'/editors/{username}',
-                                **kwargs)
+        """
 
-        return get_body_or_raise_error(resp, 201)
+        return self._request('add_editor', 'PUT', 201,
+                             f'{self.API_URL}/public'
+                             f'/courses/{course_code}'
+                             f'/editors/{username}',
+                             **kwargs)
 
-    # -----------------------------------------------
-    # ------------ EXPRESSION CONTROLLER ------------
-    # -----------------------------------------------
+    @traced
     @refresh_token
     def evaluate_all(self, expressions_dto: ParseAllDtoType=None,
                      **kwargs) -> RespDict:
@@ -562,14 +728,19 @@ class Classification:
 
         """
 
-        body = make_dict_body(expressions_dto)
+        with self._measure('serialize'):
+            body = make_dict_body(expressions_dto)
 
-        resp = self.session.post(f'{self.API_URL}/public'
-                                 f'/course-expressions/analyses',
+        def send():
+            return self._request('evaluate_all', 'POST', 201,
+                                 f'{self.API_URL}/public'
+                                 f'/course-expressions'
+                                 f'/analyses',
                                  json=body, **kwargs)
 
-        return get_body_or_raise_error(resp, 201)
+        return self._cached_expression_call('evaluate_all', body, send)
 
+    @traced
     @refresh_token
     def try_validity(self, expression_dto: ParseDtoType=None,
                      **kwargs) -> RespDict:
@@ -599,16 +770,21 @@ class Classification:
 
         """
 
-        body = make_dict_body(expression_dto)
+        with self._measure('serialize'):
+            body = make_dict_body(expression_dto)
 
-        resp = self.session.post(f'{self.API_URL}/public'
-                                 f'/expressions/analyses',
+        def send():
+            return self._request('try_validity', 'POST', 201,
+                                 f'{self.API_URL}/public'
+                                 f'/expressions'
+                                 f'/analyses',
                                  json=body, **kwargs)
 
-        return get_body_or_raise_error(resp, 201)
+        return self._cached_expression_call('try_validity', body, send)
 
+    @traced
     @refresh_token
-    def get_functions(self, **kwargs) -> RespDict:
+    def get_functions(self, raw: bool=False, **kwargs) -> RespDict:
         """Get all functions.
 
         See `Classification portal API documentation
@@ -616,6 +792,10 @@ class Classification:
         classification/api/v1/private/documentation>`__.
 
         Args:
+            raw: If True, the body is not decoded and
+                a :py:class:`~.utils.RawResponse` with the undecoded
+                bytes and the headers is returned instead.
+                Defaults to False.
             **kwargs: Anything that :py:func:`get` function
                 from `Requests
                 <http://docs.python-requests.org/en/master/>`__
@@ -632,18 +812,16 @@ class Classification:
 
         """
 
-        resp = self.session.get(f'{self.API_URL}/public'
-                                f'/expressions/functions',
-                                **kwargs)
+        return self._request('get_functions', 'GET', 200,
+                             f'{self.API_URL}/public'
+                             f'/expressions'
+                             f'/functions',
+                             raw=raw, **kwargs)
 
-        return get_body_or_raise_error(resp, 200)
-
-    # -----------------------------------------------
-    # ----------- NOTIFICATION CONTROLLER -----------
-    # -----------------------------------------------
+    @traced
     @refresh_token
     def get_all_notifications(self, username: str, count: int=None,
-                              page: int=None, lang: str=None,
+                              page: int=None, lang: str=None, raw: bool=False,
                               **kwargs) -> RespDict:
         """Get all notifications.
 
@@ -656,6 +834,10 @@ class Classification:
             count: Count.
             page: Page.
             lang: Language tag.
+            raw: If True, the body is not decoded and
+                a :py:class:`~.utils.RawResponse` with the undecoded
+                bytes and the headers is returned instead.
+                Defaults to False.
             **kwargs: Anything that :py:func:`get` function
                 from `Requests
                 <http://docs.python-requests.org/en/master/>`__
@@ -672,18 +854,25 @@ class Classification:
 
         """
 
-        params = {'count': count, 'page': page, 'lang': lang}
-
-        resp = self.session.get(f'{self.API_URL}/public'
-                                f'/notifications/{username}/all',
-                                params=params, **kwargs)
-
-        return get_body_or_raise_error(resp, 200)
-
+        params = {}
+        if count is not None:
+            params['count'] = count
+        if page is not None:
+            params['page'] = page
+        if lang is not None:
+            params['lang'] = lang
+
+        return self._request('get_all_notifications', 'GET', 200,
+                             f'{self.API_URL}/public'
+                             f'/notifications/{username}'
+                             f'/all',
+                             params=params, raw=raw, **kwargs)
+
+    @traced
     @refresh_token
     def get_unread_notifications(self, username: str, count: int=None,
                                  page: int=None, lang: str=None,
-                                 **kwargs) -> RespDict:
+                                 raw: bool=False, **kwargs) -> RespDict:
         """Get all unread notifications.
 
         See `Classification portal API documentation
@@ -695,6 +884,10 @@ class Classification:
             count: Count.
             page: Page.
             lang: Language tag.
+            raw: If True, the body is not decoded and
+                a :py:class:`~.utils.RawResponse` with the undecoded
+                bytes and the headers is returned instead.
+                Defaults to False.
             **kwargs: Anything that :py:func:`get` function
                 from `Requests
                 <http://docs.python-requests.org/en/master/>`__
@@ -711,17 +904,23 @@ class Classification:
 
         """
 
-        params = {'count': count, 'page': page, 'lang': lang}
-
-        resp = self.session.get(f'{self.API_URL}/public'
-                                f'/notifications/{username}/new',
-                                params=params, **kwargs)
-
-        return get_body_or_raise_error(resp, 200)
-
+        params = {}
+        if count is not None:
+            params['count'] = count
+        if page is not None:
+            params['page'] = page
+        if lang is not None:
+            params['lang'] = lang
+
+        return self._request('get_unread_notifications', 'GET', 200,
+                             f'{self.API_URL}/public'
+                             f'/notifications/{username}'
+                             f'/new',
+                             params=params, raw=raw, **kwargs)
+
+    @traced
     @refresh_token
-    def unread_all_notifications(self, username: str,
-                                 **kwargs) -> RespDict:
+    def unread_all_notifications(self, username: str, **kwargs) -> RespDict:
         """Mark all notifications unread.
 
         See `Classification portal API documentation
@@ -746,15 +945,15 @@ class Classification:
 
         """
 
-        resp = self.session.delete(f'{self.API_URL}/public'
-                                   f'/notifications/{username}/read',
-                                   **kwargs)
-
-        return get_body_or_raise_error(resp, 204)
+        return self._request('unread_all_notifications', 'DELETE', 204,
+                             f'{self.API_URL}/public'
+                             f'/notifications/{username}'
+                             f'/read',
+                             **kwargs)
 
+    @traced
     @refresh_token
-    def read_all_notifications(self, username: str,
-                               **kwargs) -> RespDict:
+    def read_all_notifications(self, username: str, **kwargs) -> RespDict:
         """Mark all notifications read.
 
         See `Classification portal API documentation
@@ -779,12 +978,13 @@ class Classification:
 
         """
 
-        resp = self.session.put(f'{self.API_URL}/public'
-                                f'/notifications/{username}/read',
-                                **kwargs)
-
-        return get_body_or_raise_error(resp, 201)
+        return self._request('read_all_notifications', 'PUT', 201,
+                             f'{self.API_URL}/public'
+                             f'/notifications/{username}'
+                             f'/read',
+                             **kwargs)
 
+    @traced
     @refresh_token
     def unread_notification(self, username: str, id: int,
                             **kwargs) -> RespDict:
@@ -813,15 +1013,15 @@ class Classification:
 
         """
 
-        resp = self.session.delete(f'{self.API_URL}/public'
-                                   f'/notifications/{username}/read/{id}',
-                                   **kwargs)
-
-        return get_body_or_raise_error(resp, 204)
+        return self._request('unread_notification', 'DELETE', 204,
+                             f'{self.API_URL}/public'
+                             f'/notifications/{username}'
+                             f'/read/{id}',
+                             **kwargs)
 
+    @traced
     @refresh_token
-    def read_notification(self, username: str, id: int,
-                          **kwargs) -> RespDict:
+    def read_notification(self, username: str, id: int, **kwargs) -> RespDict:
         """Mark a single notification as read.
 
         See `Classification portal API documentation
@@ -847,17 +1047,15 @@ class Classification:
 
         """
 
-        resp = self.session.put(f'{self.API_URL}/public'
-                                f'/notifications/{username}/read/{id}',
-                                **kwargs)
-
-        return get_body_or_raise_error(resp, 201)
+        return self._request('read_notification', 'PUT', 201,
+                             f'{self.API_URL}/public'
+                             f'/notifications/{username}'
+                             f'/read/{id}',
+                             **kwargs)
 
-    # -----------------------------------------------
-    # ------------- SETTINGS CONTROLLER -------------
-    # -----------------------------------------------
+    @traced
     @refresh_token
-    def get_settings(self, semester: str=None, lang: str=None,
+    def get_settings(self, semester: str=None, lang: str=None, raw: bool=False,
                      **kwargs) -> RespDict:
         """Get settings.
 
@@ -868,6 +1066,10 @@ class Classification:
         Args:
             semester: Semester identifier.
             lang: Language tag.
+            raw: If True, the body is not decoded and
+                a :py:class:`~.utils.RawResponse` with the undecoded
+                bytes and the headers is returned instead.
+                Defaults to False.
             **kwargs: Anything that :py:func:`get` function
                 from `Requests
                 <http://docs.python-requests.org/en/master/>`__
@@ -884,14 +1086,19 @@ class Classification:
 
         """
 
-        params = {'semester': semester, 'lang': lang}
+        params = {}
+        if semester is not None:
+            params['semester'] = semester
+        if lang is not None:
+            params['lang'] = lang
 
-        resp = self.session.get(f'{self.API_URL}/public'
-                                f'/settings/my',
-                                params=params, **kwargs)
-
-        return get_body_or_raise_error(resp, 200)
+        return self._request('get_settings', 'GET', 200,
+                             f'{self.API_URL}/public'
+                             f'/settings'
+                             f'/my',
+                             params=params, raw=raw, **kwargs)
 
+    @traced
     @refresh_token
     def save_my_settings(self, user_settings_dto: SettingsDtoType=None,
                          **kwargs) -> RespDict:
@@ -921,13 +1128,16 @@ class Classification:
 
         """
 
-        body = make_dict_body(user_settings_dto)
-
-        resp = self.session.put(f'{self.API_URL}/public'
-                                f'/settings/my', json=body, **kwargs)
+        with self._measure('serialize'):
+            body = make_dict_body(user_settings_dto)
 
-        return get_body_or_raise_error(resp, 201)
+        return self._request('save_my_settings', 'PUT', 201,
+                             f'{self.API_URL}/public'
+                             f'/settings'
+                             f'/my',
+                             json=body, **kwargs)
 
+    @traced
     @refresh_token
     def save_student_course_settings(
             self, user_course_settings_dto: CourseSettingsDtoType=None,
@@ -959,20 +1169,26 @@ class Classification:
 
         """
 
-        params = {'semester': semester}
+        params = {}
+        if semester is not None:
+            params['semester'] = semester
 
-        body = make_dict_body(user_course_settings_dto)
+        with self._measure('serialize'):
+            body = make_dict_body(user_course_settings_dto)
 
-        resp = self.session.put(f'{self.API_URL}/public'
-                                f'/settings/my/student/courses',
-                                params=params, json=body, **kwargs)
-
-        return get_body_or_raise_error(resp, 201)
+        return self._request('save_student_course_settings', 'PUT', 201,
+                             f'{self.API_URL}/public'
+                             f'/settings'
+                             f'/my'
+                             f'/student'
+                             f'/courses',
+                             params=params, json=body, **kwargs)
 
+    @traced
     @refresh_token
     def save_teacher_course_settings(
             self, user_course_settings_dto: CourseSettingsDtoType=None,
-            semester: str=None, **kwargs):
+            semester: str=None, **kwargs) -> RespDict:
         """Save teacher course settings.
 
         See `Classification portal API documentation
@@ -1000,23 +1216,26 @@ class Classification:
 
         """
 
-        params = {'semester': semester}
-
-        body = make_dict_body(user_course_settings_dto)
+        params = {}
+        if semester is not None:
+            params['semester'] = semester
 
-        resp = self.session.put(f'{self.API_URL}/public'
-                                f'/settings/my/teacher/courses',
-                                params=params, json=body, **kwargs)
+        with self._measure('serialize'):
+            body = make_dict_body(user_course_settings_dto)
 
-        return get_body_or_raise_error(resp, 201)
+        return self._request('save_teacher_course_settings', 'PUT', 201,
+                             f'{self.API_URL}/public'
+                             f'/settings'
+                             f'/my'
+                             f'/teacher'
+                             f'/courses',
+                             params=params, json=body, **kwargs)
 
-    # -----------------------------------------------
-    # ------ STUDENT CLASSIFICATION CONTROLLER ------
-    # -----------------------------------------------
+    @traced
     @refresh_token
     def find_student_group_classifications(self, course_code: str,
                                            group_code: str='ALL',
-                                           semester: str=None,
+                                           semester: str=None, raw: bool=False,
                                            **kwargs) -> RespDict:
         """Find student group classifications.
 
@@ -1028,6 +1247,10 @@ class Classification:
             course_code: The code of the course.
             group_code: The code of the group.
             semester: Semester identifier.
+            raw: If True, the body is not decoded and
+                a :py:class:`~.utils.RawResponse` with the undecoded
+                bytes and the headers is returned instead.
+                Defaults to False.
             **kwargs: Anything that :py:func:`get` function
                 from `Requests
                 <http://docs.python-requests.org/en/master/>`__
@@ -1044,36 +1267,48 @@ class Classification:
 
         """
 
-        params = {'semester': semester}
-
-        resp = self.session.get(f'{self.API_URL}/public'
-                                f'/courses/{course_code}'
-                                f'/group/{group_code}'
-                                f'/student-classifications',
-                                params=params, **kwargs)
+        params = {}
+        if semester is not None:
+            params['semester'] = semester
 
-        return get_body_or_raise_error(resp, 200)
+        return self._request('find_student_group_classifications', 'GET', 200,
+                             f'{self.API_URL}/public'
+                             f'/courses/{course_code}'
+                             f'/group/{group_code}'
+                             f'/student-classifications',
+                             params=params, raw=raw, **kwargs)
 
-    def find_student_group_classifications_simple_s2t(
-            self, course_code: str, group_code: str='ALL',
-            semester: str=None, **kwargs) -> RespDict:
-        """Find student group classifications with a simplified response.
+    @traced
+    @refresh_token
+    def find_student_classifications_for_definitions(self, course_code: str,
+                                                     identifier: str,
+                                                     group_code: str='ALL',
+                                                     semester: str=None,
+                                                     raw: bool=False,
+                                                     **kwargs) -> RespDict:
+        """Find student classification for definitions.
 
-        See :ref:`simplified_operations` section as well as
-        :py:meth:`~.find_student_group_classifications` method.
+        See `Classification portal API documentation
+        <https://rozvoj.fit.cvut.cz/evolution-dev/
+        classification/api/v1/private/documentation>`__.
 
         Args:
             course_code: The code of the course.
+            identifier: Classification identifier.
             group_code: The code of the group.
             semester: Semester identifier.
+            raw: If True, the body is not decoded and
+                a :py:class:`~.utils.RawResponse` with the undecoded
+                bytes and the headers is returned instead.
+                Defaults to False.
             **kwargs: Anything that :py:func:`get` function
                 from `Requests
                 <http://docs.python-requests.org/en/master/>`__
                 library can take except for ``params``.
 
         Returns:
-            On success, it returns the simplified response body
-            or ``None``, if the body is empty.
+            On success, it returns the response body or ``None``,
+            if the body is empty.
 
         Note:
             On failure, this method raises standard `Requests errors
@@ -1082,34 +1317,44 @@ class Classification:
 
         """
 
-        resp_body = self.find_student_group_classifications(
-            course_code, group_code, semester, **kwargs)
+        params = {}
+        if semester is not None:
+            params['semester'] = semester
 
-        if resp_body is not None:
-            return s2t_from_get_response(resp_body)
-        else:
-            return None
+        return self._request('find_student_classifications_for_definitions',
+                             'GET', 200,
+                             f'{self.API_URL}/public'
+                             f'/courses/{course_code}'
+                             f'/group/{group_code}'
+                             f'/student-classifications/{identifier}',
+                             params=params, raw=raw, **kwargs)
 
-    def find_student_group_classifications_simple_t2s(
-            self, course_code: str, group_code: str='ALL',
+    @traced
+    @refresh_token
+    def save_student_classifications(
+            self, course_code: str,
+            student_classifications: StudentClassificationDtoType=None,
             semester: str=None, **kwargs) -> RespDict:
-        """Find student group classifications with a simplified response.
+        """Save student classifications.
 
-        See :ref:`simplified_operations` section as well as
-        :py:meth:`~.find_student_group_classifications` method.
+        See `Classification portal API documentation
+        <https://rozvoj.fit.cvut.cz/evolution-dev/
+        classification/api/v1/private/documentation>`__.
 
         Args:
             course_code: The code of the course.
-            group_code: The code of the group.
+            student_classifications: The body of the request. Can be
+                a list of plain Python dictionaries or of
+                :py:class:`~.entities.StudentClassificationPreviewDto`.
             semester: Semester identifier.
-            **kwargs: Anything that :py:func:`get` function
+            **kwargs: Anything that :py:func:`put` function
                 from `Requests
                 <http://docs.python-requests.org/en/master/>`__
-                library can take except for ``params``.
+                library can take except for ``params`` and ``json``.
 
         Returns:
-            On success, it returns the simplified response body
-            or ``None``, if the body is empty.
+            On success, it returns the response body or ``None``,
+            if the body is empty.
 
         Note:
             On failure, this method raises standard `Requests errors
@@ -1118,19 +1363,26 @@ class Classification:
 
         """
 
-        resp_body = self.find_student_group_classifications(
-            course_code, group_code, semester, **kwargs)
+        params = {}
+        if semester is not None:
+            params['semester'] = semester
 
-        if resp_body is not None:
-            return t2s_from_get_response(resp_body)
-        else:
-            return None
+        with self._measure('serialize'):
+            body = make_dict_bodies(student_classifications)
+
+        return self._request('save_student_classifications', 'PUT', 201,
+                             f'{self.API_URL}/public'
+                             f'/courses/{course_code}'
+                             f'/student-classifications',
+                             params=params, json=body, **kwargs)
 
+    @traced
     @refresh_token
-    def find_student_classifications_for_definitions(
-            self, course_code: str, identifier: str, group_code: str='ALL',
-            semester: str=None, **kwargs) -> RespDict:
-        """Find student classification for definitions.
+    def find_student_classification(self, course_code: str,
+                                    student_username: str, semester: str=None,
+                                    lang: str=None, raw: bool=False,
+                                    **kwargs) -> RespDict:
+        """Find student classifications.
 
         See `Classification portal API documentation
         <https://rozvoj.fit.cvut.cz/evolution-dev/
@@ -1138,9 +1390,13 @@ class Classification:
 
         Args:
             course_code: The code of the course.
-            identifier: Classification identifier.
-            group_code: The code og the group.
+            student_username: The username of the student.
             semester: Semester identifier.
+            lang: Language tag.
+            raw: If True, the body is not decoded and
+                a :py:class:`~.utils.RawResponse` with the undecoded
+                bytes and the headers is returned instead.
+                Defaults to False.
             **kwargs: Anything that :py:func:`get` function
                 from `Requests
                 <http://docs.python-requests.org/en/master/>`__
@@ -1157,22 +1413,24 @@ class Classification:
 
         """
 
-        params = {'semester': semester}
-
-        resp = self.session.get(f'{self.API_URL}/public'
-                                f'/courses/{course_code}'
-                                f'/group/{group_code}'
-                                f'/student-classifications/{identifier}',
-                                params=params, **kwargs)
+        params = {}
+        if semester is not None:
+            params['semester'] = semester
+        if lang is not None:
+            params['lang'] = lang
 
-        return get_body_or_raise_error(resp, 200)
+        return self._request('find_student_classification', 'GET', 200,
+                             f'{self.API_URL}/public'
+                             f'/courses/{course_code}'
+                             f'/student-classifications/{student_username}',
+                             params=params, raw=raw, **kwargs)
 
+    @traced
     @refresh_token
-    def save_student_classifications(
-            self, course_code: str,
-            student_classifications: StudentClassificationDtoType=None,
-            semester: str=None, **kwargs) -> RespDict:
-        """Save student classifications.
+    def get_course_groups(self, course_code: str, semester: str=None,
+                          lang: str=None, raw: bool=False,
+                          **kwargs) -> RespDict:
+        """Get course groups.
 
         See `Classification portal API documentation
         <https://rozvoj.fit.cvut.cz/evolution-dev/
@@ -1180,14 +1438,16 @@ class Classification:
 
         Args:
             course_code: The code of the course.
-            student_classifications: The body of the request. Can be
-                a list of plain Python dictionaries or of
-                :py:class:`~.entities.StudentClassificationPreviewDto`.
             semester: Semester identifier.
-            **kwargs: Anything that :py:func:`put` function
+            lang: Language tag.
+            raw: If True, the body is not decoded and
+                a :py:class:`~.utils.RawResponse` with the undecoded
+                bytes and the headers is returned instead.
+                Defaults to False.
+            **kwargs: Anything that :py:func:`get` function
                 from `Requests
                 <http://docs.python-requests.org/en/master/>`__
-                library can take except for ``params`` and ``json``.
+                library can take except for ``params``.
 
         Returns:
             On success, it returns the response body or ``None``,
@@ -1200,43 +1460,57 @@ class Classification:
 
         """
 
-        params = {'semester': semester}
+        params = {}
+        if semester is not None:
+            params['semester'] = semester
+        if lang is not None:
+            params['lang'] = lang
 
-        if student_classifications is not None:
-            body = [make_dict_body(s) for s in student_classifications]
-        else:
-            body = list()
+        return self._request('get_course_groups', 'GET', 200,
+                             f'{self.API_URL}/public'
+                             f'/course/{course_code}'
+                             f'/student-groups',
+                             params=params, raw=raw, **kwargs)
+    # --- End of generated methods ---
 
-        resp = self.session.put(f'{self.API_URL}/public'
-                                f'/courses/{course_code}'
-                                f'/student-classifications',
-                                params=params, json=body, **kwargs)
+    # Methods built on top of them follow.
 
-        return get_body_or_raise_error(resp, 201)
-
-    def save_student_classifications_simple_s2t(
-            self, course_code: str,
-            student_to_tasks: StudentsToTasksType=None,
-            semester: str=None, **kwargs) -> RespDict:
-        """A simplified solution to save students' classifications.
+    # -----------------------------------------------
+    # ------------ EXPRESSION CONTROLLER ------------
+    # -----------------------------------------------
+    @traced
+    def validate_course_expressions(self, course_code: str,
+                                    semester: str=None, lang: str=None,
+                                    batch_size: int=100, max_workers: int=8,
+                                    **kwargs) -> RespDict:
+        """Validates expressions of all calculated classifications.
 
-        See :ref:`simplified_operations` section as well as
-        :py:meth:`~.save_student_classifications` method.
+        Definitions are fetched with
+        :py:meth:`~.find_classifications_for_course`. Every distinct
+        expression is analysed only once: the expressions are packed into
+        as few :py:meth:`~.evaluate_all` calls as ``batch_size`` allows,
+        and the ones the server did not answer in bulk are checked
+        one by one with :py:meth:`~.try_validity`. Both kinds of calls
+        run concurrently.
 
         Args:
             course_code: The code of the course.
-            student_to_tasks: The body of the request.
-                See :ref:`simplified_operations` section
-                for the format.
             semester: Semester identifier.
-            **kwargs: Anything that :py:func:`put` function
-                from `Requests
+            lang: Language tag.
+            batch_size: The maximal number of expressions sent
+                in one :py:meth:`~.evaluate_all` call. ``None`` means
+                everything is sent at once. Defaults to 100.
+            max_workers: The maximal number of concurrent requests.
+                Defaults to 8.
+            **kwargs: Anything that :py:func:`get` and :py:func:`post`
+                functions from `Requests
                 <http://docs.python-requests.org/en/master/>`__
                 library can take except for ``params`` and ``json``.
 
         Returns:
-            On success, it returns the response body or ``None``,
-            if the body is empty.
+            A dictionary mapping classification identifiers to the result
+            of the analysis of their expressions or ``None``,
+            if there are no calculated classifications.
 
         Note:
             On failure, this method raises standard `Requests errors
@@ -1245,33 +1519,90 @@ class Classification:
 
         """
 
-        dtos = save_request_from_s2t(student_to_tasks)
-        return self.save_student_classifications(course_code, dtos,
-                                                 semester, **kwargs)
+        definitions = self.find_classifications_for_course(
+            course_code, semester, lang, **kwargs) or list()
 
-    def save_student_classifications_simple_t2s(
-            self, course_code: str,
-            task_to_students: TasksToStudentsType=None,
+        value_types = {d['identifier']: d.get('valueType')
+                       for d in definitions if 'identifier' in d}
+
+        # Identical expressions are analysed once; the first identifier
+        # using an expression is the key it is sent under
+        keys_by_expression = dict()
+        identifiers_by_key = dict()
+        for definition in definitions:
+            expression = definition.get('expression')
+            if not definition.get('calculated') or not expression:
+                continue
+            key = keys_by_expression.setdefault(expression,
+                                                definition['identifier'])
+            identifiers_by_key.setdefault(key, list()) \
+                .append(definition['identifier'])
+
+        expressions = {k: e for e, k in keys_by_expression.items()}
+
+        if not expressions:
+            return None
+
+        keys = list(expressions)
+        step = batch_size or len(keys)
+        batches = [keys[i:i + step] for i in range(0, len(keys), step)]
+
+        results = dict()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(
+                contextvars.copy_context().run, self.evaluate_all,
+                ExpressionParseAllRequestDto(
+                    expressions={k: expressions[k] for k in batch},
+                    variable_value_types=value_types),
+                **kwargs) for batch in batches]
+
+            for future in futures:
+                body = future.result()
+                if isinstance(body, dict):
+                    results.update((k, v) for k, v in body.items()
+                                   if k in expressions)
+
+            leftovers = [k for k in keys if k not in results]
+            futures = {k: executor.submit(
+                contextvars.copy_context().run, self.try_validity,
+                ExpressionParseRequestDto(
+                    expected_result_type=value_types.get(k),
+                    expression=expressions[k],
+                    variable_value_types=value_types),
+                **kwargs) for k in leftovers}
+
+            for key, future in futures.items():
+                results[key] = future.result()
+
+        return {identifier: results[key]
+                for key, identifiers in identifiers_by_key.items()
+                for identifier in identifiers}
+
+    # -----------------------------------------------
+    # ------ STUDENT CLASSIFICATION CONTROLLER ------
+    # -----------------------------------------------
+    @traced
+    def find_student_group_classifications_simple_s2t(
+            self, course_code: str, group_code: str='ALL',
             semester: str=None, **kwargs) -> RespDict:
-        """A simplified solution to save students' classifications.
+        """Find student group classifications with a simplified response.
 
         See :ref:`simplified_operations` section as well as
-        :py:meth:`~.save_student_classifications` method.
+        :py:meth:`~.find_student_group_classifications` method.
 
         Args:
             course_code: The code of the course.
-            task_to_students: The body of the request.
-                See :ref:`simplified_operations` section
-                for the format.
+            group_code: The code of the group.
             semester: Semester identifier.
-            **kwargs: Anything that :py:func:`put` function
+            **kwargs: Anything that :py:func:`get` function
                 from `Requests
                 <http://docs.python-requests.org/en/master/>`__
-                library can take except for ``params`` and ``json``.
+                library can take except for ``params``.
 
         Returns:
-            On success, it returns the response body or ``None``,
-            if the body is empty.
+            On success, it returns the simplified response body
+            or ``None``, if the body is empty.
 
         Note:
             On failure, this method raises standard `Requests errors
@@ -1280,34 +1611,45 @@ class Classification:
 
         """
 
-        dtos = save_request_from_t2s(task_to_students)
-        return self.save_student_classifications(course_code, dtos,
-                                                 semester, **kwargs)
+        resp_body = self.find_student_group_classifications(
+            course_code, group_code, semester, **kwargs)
 
-    @refresh_token
-    def find_student_classification(self, course_code: str,
-                                    student_username: str,
-                                    semester: str=None, lang: str=None,
-                                    **kwargs) -> RespDict:
-        """Find student classifications.
+        if resp_body is not None:
+            # Coalesced callers share the response, so it must be copied
+            with self._measure('convert'):
+                return s2t_from_get_response(
+                    resp_body, copy=self.single_flight is not None)
+        else:
+            return None
 
-        See `Classification portal API documentation
-        <https://rozvoj.fit.cvut.cz/evolution-dev/
-        classification/api/v1/private/documentation>`__.
+    @traced
+    def find_student_group_classifications_simple_t2s(
+            self, course_code: str, group_code: str='ALL',
+            semester: str=None, lazy: bool=False, **kwargs) -> RespDict:
+        """Find student group classifications with a simplified response.
+
+        See :ref:`simplified_operations` section as well as
+        :py:meth:`~.find_student_group_classifications` method.
 
         Args:
             course_code: The code of the course.
-            student_username: The username of the student.
+            group_code: The code of the group.
             semester: Semester identifier.
-            lang: Language tag.
+            lazy: If True, the result is a read-only
+                :py:class:`~.payloadconverters.TransposedView`
+                of the response that builds the grades of a task only
+                when they are first accessed. Use it when you need only
+                a few tasks; call its
+                :py:meth:`~.payloadconverters.TransposedView.materialize`
+                method to get a plain dictionary. Defaults to False.
             **kwargs: Anything that :py:func:`get` function
                 from `Requests
                 <http://docs.python-requests.org/en/master/>`__
                 library can take except for ``params``.
 
         Returns:
-            On success, it returns the response body or ``None``,
-            if the body is empty.
+            On success, it returns the simplified response body
+            or ``None``, if the body is empty.
 
         Note:
             On failure, this method raises standard `Requests errors
@@ -1316,37 +1658,38 @@ class Classification:
 
         """
 
-        params = {'semester': semester, 'lang': lang}
-
-        resp = self.session.get(f'{self.API_URL}/public'
-                                f'/courses/{course_code}'
-                                f'/student-classifications'
-                                f'/{student_username}',
-                                params=params, **kwargs)
+        resp_body = self.find_student_group_classifications(
+            course_code, group_code, semester, **kwargs)
 
-        return get_body_or_raise_error(resp, 200)
+        if resp_body is not None:
+            with self._measure('convert'):
+                if lazy:
+                    return TransposedView(s2t_from_get_response(
+                        resp_body, copy=self.single_flight is not None))
+                return t2s_from_get_response(resp_body)
+        else:
+            return None
 
-    # -----------------------------------------------
-    # ---------- STUDENT GROUP CONTROLLER -----------
-    # -----------------------------------------------
-    @refresh_token
-    def get_course_groups(self, course_code: str,
-                          semester: str=None, lang: str=None,
-                          **kwargs) -> RespDict:
-        """Get course groups.
+    @traced
+    def save_student_classifications_simple_s2t(
+            self, course_code: str,
+            student_to_tasks: StudentsToTasksType=None,
+            semester: str=None, **kwargs) -> RespDict:
+        """A simplified solution to save students' classifications.
 
-        See `Classification portal API documentation
-        <https://rozvoj.fit.cvut.cz/evolution-dev/
-        classification/api/v1/private/documentation>`__.
+        See :ref:`simplified_operations` section as well as
+        :py:meth:`~.save_student_classifications` method.
 
         Args:
             course_code: The code of the course.
+            student_to_tasks: The body of the request.
+                See :ref:`simplified_operations` section
+                for the format.
             semester: Semester identifier.
-            lang: Language tag.
-            **kwargs: Anything that :py:func:`get` function
+            **kwargs: Anything that :py:func:`put` function
                 from `Requests
                 <http://docs.python-requests.org/en/master/>`__
-                library can take except for ``params``.
+                library can take except for ``params`` and ``json``.
 
         Returns:
             On success, it returns the response body or ``None``,
@@ -1359,11 +1702,183 @@ class Classification:
 
         """
 
-        params = {'semester': semester, 'lang': lang}
+        with self._measure('convert'):
+            dtos = save_request_from_s2t(student_to_tasks, as_dicts=True)
+        return self.save_student_classifications(course_code, dtos,
+                                                 semester, **kwargs)
 
-        resp = self.session.get(f'{self.API_URL}/public'
-                                f'/course/{course_code}'
-                                f'/student-groups',
-                                params=params, **kwargs)
+    @traced
+    def save_student_classifications_simple_t2s(
+            self, course_code: str,
+            task_to_students: TasksToStudentsType=None,
+            semester: str=None, **kwargs) -> RespDict:
+        """A simplified solution to save students' classifications.
+
+        See :ref:`simplified_operations` section as well as
+        :py:meth:`~.save_student_classifications` method.
+
+        Args:
+            course_code: The code of the course.
+            task_to_students: The body of the request.
+                See :ref:`simplified_operations` section
+                for the format.
+            semester: Semester identifier.
+            **kwargs: Anything that :py:func:`put` function
+                from `Requests
+                <http://docs.python-requests.org/en/master/>`__
+                library can take except for ``params`` and ``json``.
 
-        return get_body_or_raise_error(resp, 200)
+        Returns:
+            On success, it returns the response body or ``None``,
+            if the body is empty.
+
+        Note:
+            On failure, this method raises standard `Requests errors
+            <http://docs.python-requests.org/en/master/
+            _modules/requests/exceptions/>`__.
+
+        """
+
+        with self._measure('convert'):
+            dtos = save_request_from_t2s(task_to_students, as_dicts=True)
+        return self.save_student_classifications(course_code, dtos,
+                                                 semester, **kwargs)
+
+    # -----------------------------------------------
+    # -------------- HELPER FUNCTIONS ---------------
+    # -----------------------------------------------
+    def _request(self, endpoint, method, exp_code, url, raw=False,
+                 **kwargs):
+        def send():
+            return self._send(endpoint, method, exp_code, url, raw,
+                              **kwargs)
+
+        if method != 'GET' or self.single_flight is None:
+            return send()
+
+        key = self.single_flight.make_key(method, url, kwargs.get('params'),
+                                          raw)
+        return self.single_flight.do(
+            key, send, lambda: self._count('coalesced_requests', endpoint))
+
+    def _send(self, endpoint, method, exp_code, url, raw, **kwargs):
+        group = _GROUP_BY_ENDPOINT[endpoint]
+
+        def transmit():
+            if not self.tracer.enabled:
+                return measured()
+
+            with self.tracer.start_span(f'HTTP {method}', {
+                    'endpoint': endpoint, 'http.method': method,
+                    'http.url': url}) as span:
+                resp = measured()
+                span.set_attribute('http.status_code', resp.status_code)
+                return resp
+
+        def measured():
+            metrics = self.instrumentation
+            if metrics is None:
+                return self.session.request(method, url, **kwargs)
+
+            metrics.request_started(endpoint, method, url, kwargs)
+            start = time.perf_counter()
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except Exception as e:
+                metrics.request_finished(endpoint, method, url, None,
+                                         time.perf_counter() - start, e)
+                raise
+            metrics.request_finished(endpoint, method, url, resp,
+                                     time.perf_counter() - start)
+            return resp
+
+        def attempt():
+            breaker = self.circuit_breaker
+            if breaker is not None:
+                breaker.allow(group)
+            if self.rate_limiter is not None:
+                try:
+                    self.rate_limiter.acquire(group)
+                except BaseException:
+                    if breaker is not None:
+                        breaker.release(group)
+                    raise
+            if breaker is None:
+                return transmit()
+            return breaker.measure(group, transmit)
+
+        def on_retry(attempt_number, delay):
+            self._count('retries', endpoint)
+
+        def send():
+            if self.retry_policy is None:
+                return attempt()
+            return self.retry_policy.run(method, attempt, on_retry)
+
+        compressed = False
+        if self.compression is not None:
+            plain = kwargs
+            with self._measure('compress'):
+                kwargs, compressed = self.compression.prepare(method, kwargs)
+            if compressed:
+                self._count('compressed_requests', endpoint)
+
+        kwargs = encoded_json_as_data(kwargs)
+        resp = send()
+
+        if compressed and resp.status_code == 415:
+            # The server does not accept compressed bodies,
+            # the closures above send the plain ones from now on
+            # (with the same headers otherwise)
+            self.compression.reject()
+            self._count('compression_fallbacks', endpoint)
+            kwargs, _ = self.compression.prepare(method, plain)
+            kwargs = encoded_json_as_data(kwargs)
+            resp = send()
+
+        if raw:
+            return get_raw_body_or_raise_error(resp, exp_code)
+
+        with self._measure('decode'):
+            return get_body_or_raise_error(resp, exp_code)
+
+    def _cached_expression_call(self, endpoint, body, send):
+        if self.expression_cache is None:
+            return send()
+
+        key = self.expression_cache.make_key(endpoint, body)
+        result = self.expression_cache.get(key)
+        if result is MISS:
+            self._count('cache_misses', endpoint)
+            result = send()
+            self.expression_cache.put(key, result)
+        else:
+            self._count('cache_hits', endpoint)
+
+        return result
+
+    def _measure(self, stage):
+        if not self.tracer.enabled:
+            if self.instrumentation is None:
+                return NULL_MEASUREMENT
+            return self.instrumentation.measure(stage)
+        return self._traced_stage(stage)
+
+    @contextmanager
+    def _traced_stage(self, stage):
+        with self.tracer.start_span(stage):
+            if self.instrumentation is None:
+                yield
+            else:
+                with self.instrumentation.measure(stage):
+                    yield
+
+    def _count(self, counter, endpoint=''):
+        if self.instrumentation is not None:
+            self.instrumentation.increment(counter, endpoint)
+
+
+_GROUP_BY_ENDPOINT = {endpoint: group
+                      for group, endpoints
+                      in Classification.ENDPOINT_GROUPS.items()
+                      for endpoint in endpoints}
@@ -1,7 +1,26 @@
+import inspect
 from classification.classification import Classification
+from classification.endpoints import ENDPOINTS, wrap_arguments
 from classification.exceptions import MissingParameterError
 
 
+# Parameters the proxy can store and whether they are required
+STORED_PARAMS = {'course_code': True, 'group_code': True,
+                 'semester': False, 'lang': False}
+
+# Client methods built on top of the endpoints, wrapped as well
+COMPOSITE_METHODS = ('validate_course_expressions',
+                     'find_student_group_classifications_simple_s2t',
+                     'find_student_group_classifications_simple_t2s',
+                     'save_student_classifications_simple_s2t',
+                     'save_student_classifications_simple_t2s')
+
+# Parameters named differently in the proxy, by method
+_ALIASES = {'try_validity': {'expression_dto': 'expression'}}
+
+_EMPTY = inspect.Parameter.empty
+
+
 class ClassificationParamsProxy:
     """This proxy class can store some parameters for API calls.
 
@@ -49,11 +68,18 @@ class ClassificationParamsProxy:
                  callback_host='localhost', callback_port=8080,
                  force_new_token=False, session=None,
                  course_code=None, semester=None,
-                 group_code=None, lang=None):
+                 group_code=None, lang=None, expression_cache=None,
+                 single_flight=None, retry_policy=None, rate_limiter=None,
+                 circuit_breaker=None, instrumentation=None, tracer=None,
+                 compression=None, transport=None):
 
         self.classification = Classification(client_id, client_secret,
                                              callback_host, callback_port,
-                                             force_new_token, session)
+                                             force_new_token, session,
+                                             expression_cache, single_flight,
+                                             retry_policy, rate_limiter,
+                                             circuit_breaker, instrumentation,
+                                             tracer, compression, transport)
         self.course_code = course_code
         self.semester = semester
         self.group_code = group_code or 'ALL'
@@ -68,9 +94,8 @@ class ClassificationParamsProxy:
     def drop_session(self):
         self.classification.drop_session()
 
-    # -----------------------------------------------
-    # ---------- CLASSIFICATION CONTROLLER ----------
-    # -----------------------------------------------
+    # Wrappers of all the API methods of the client
+    # --- Generated by classification.codegen, do not edit ---
     def delete_classification(self, classification_id, course_code=None,
                               semester=None, **kwargs):
 
@@ -78,19 +103,19 @@ class ClassificationParamsProxy:
         semester = self._get_param(semester, 'semester', False)
 
         return self.classification \
-            .delete_classification(course_code, classification_id,
-                                   semester, **kwargs)
+            .delete_classification(course_code, classification_id, semester,
+                                   **kwargs)
 
-    def find_classifications_for_course(self, course_code=None,
-                                        semester=None, lang=None, **kwargs):
+    def find_classifications_for_course(self, course_code=None, semester=None,
+                                        lang=None, raw=False, **kwargs):
 
         course_code = self._get_param(course_code, 'course_code', True)
         semester = self._get_param(semester, 'semester', False)
         lang = self._get_param(lang, 'lang', False)
 
         return self.classification \
-            .find_classifications_for_course(course_code, semester,
-                                             lang, **kwargs)
+            .find_classifications_for_course(course_code, semester, lang, raw,
+                                             **kwargs)
 
     def save_classification(self, course_code=None, classification_dto=None,
                             **kwargs):
@@ -107,25 +132,23 @@ class ClassificationParamsProxy:
         semester = self._get_param(semester, 'semester', False)
 
         return self.classification \
-            .change_order_of_classifications(course_code, indexes,
-                                             semester, **kwargs)
+            .change_order_of_classifications(course_code, indexes, semester,
+                                             **kwargs)
 
-    def find_classification(self, identifier, course_code=None,
-                            semester=None, lang=None, **kwargs):
+    def find_classification(self, identifier, course_code=None, semester=None,
+                            lang=None, raw=False, **kwargs):
 
         course_code = self._get_param(course_code, 'course_code', True)
         semester = self._get_param(semester, 'semester', False)
         lang = self._get_param(lang, 'lang', False)
 
         return self.classification \
-            .find_classification(course_code, identifier,
-                                 semester, lang, **kwargs)
+            .find_classification(course_code, identifier, semester, lang, raw,
+                                 **kwargs)
 
     def clone_classification_definitions(self, target_semester,
-                                         target_course_code,
-                                         source_semester,
-                                         source_course_code,
-                                         remove_existing,
+                                         target_course_code, source_semester,
+                                         source_course_code, remove_existing,
                                          **kwargs):
 
         return self.classification \
@@ -133,18 +156,14 @@ class ClassificationParamsProxy:
                                               target_course_code,
                                               source_semester,
                                               source_course_code,
-                                              remove_existing,
-                                              **kwargs)
+                                              remove_existing, **kwargs)
 
-    # -----------------------------------------------
-    # -------------- EDITOR CONTROLLER --------------
-    # -----------------------------------------------
-    def get_editors(self, course_code=None, **kwargs):
+    def get_editors(self, course_code=None, raw=False, **kwargs):
 
         course_code = self._get_param(course_code, 'course_code', True)
 
         return self.classification \
-            .get_editors(course_code, **kwargs)
+            .get_editors(course_code, raw, **kwargs)
 
     def delete_editor(self, username, course_code=None, **kwargs):
 
@@ -160,9 +179,6 @@ class ClassificationParamsProxy:
         return self.classification \
             .add_editor(course_code, username, **kwargs)
 
-    # -----------------------------------------------
-    # ------------ EXPRESSION CONTROLLER ------------
-    # -----------------------------------------------
     def evaluate_all(self, expressions_dto=None, **kwargs):
 
         return self.classification \
@@ -173,29 +189,27 @@ class ClassificationParamsProxy:
         return self.classification \
             .try_validity(expression, **kwargs)
 
-    def get_functions(self, **kwargs):
+    def get_functions(self, raw=False, **kwargs):
 
         return self.classification \
-            .get_functions(**kwargs)
+            .get_functions(raw, **kwargs)
 
-    # -----------------------------------------------
-    # ----------- NOTIFICATION CONTROLLER -----------
-    # -----------------------------------------------
-    def get_all_notifications(self, username, count=None, page=None,
-                              lang=None, **kwargs):
+    def get_all_notifications(self, username, count=None, page=None, lang=None,
+                              raw=False, **kwargs):
 
         lang = self._get_param(lang, 'lang', False)
 
         return self.classification \
-            .get_all_notifications(username, count, page, lang, **kwargs)
+            .get_all_notifications(username, count, page, lang, raw, **kwargs)
 
     def get_unread_notifications(self, username, count=None, page=None,
-                                 lang=None, **kwargs):
+                                 lang=None, raw=False, **kwargs):
 
         lang = self._get_param(lang, 'lang', False)
 
         return self.classification \
-            .get_unread_notifications(username, count, page, lang, **kwargs)
+            .get_unread_notifications(username, count, page, lang, raw,
+                                      **kwargs)
 
     def unread_all_notifications(self, username, **kwargs):
 
@@ -217,16 +231,13 @@ class ClassificationParamsProxy:
         return self.classification \
             .read_notification(username, id, **kwargs)
 
-    # -----------------------------------------------
-    # ------------- SETTINGS CONTROLLER -------------
-    # -----------------------------------------------
-    def get_settings(self, semester=None, lang=None, **kwargs):
+    def get_settings(self, semester=None, lang=None, raw=False, **kwargs):
 
         semester = self._get_param(semester, 'semester', False)
         lang = self._get_param(lang, 'lang', False)
 
         return self.classification \
-            .get_settings(semester, lang, **kwargs)
+            .get_settings(semester, lang, raw, **kwargs)
 
     def save_my_settings(self, user_settings_dto=None, **kwargs):
 
@@ -239,8 +250,8 @@ class ClassificationParamsProxy:
         semester = self._get_param(semester, 'semester', False)
 
         return self.classification \
-            .save_student_course_settings(user_course_settings_dto,
-                                          semester, **kwargs)
+            .save_student_course_settings(user_course_settings_dto, semester,
+                                          **kwargs)
 
     def save_teacher_course_settings(self, user_course_settings_dto=None,
                                      semester=None, **kwargs):
@@ -248,15 +259,12 @@ class ClassificationParamsProxy:
         semester = self._get_param(semester, 'semester', False)
 
         return self.classification \
-            .save_teacher_course_settings(user_course_settings_dto,
-                                          semester, **kwargs)
+            .save_teacher_course_settings(user_course_settings_dto, semester,
+                                          **kwargs)
 
-    # -----------------------------------------------
-    # ------ STUDENT CLASSIFICATION CONTROLLER ------
-    # -----------------------------------------------
     def find_student_group_classifications(self, course_code=None,
-                                           group_code=None,
-                                           semester=None, **kwargs):
+                                           group_code=None, semester=None,
+                                           raw=False, **kwargs):
 
         course_code = self._get_param(course_code, 'course_code', True)
         group_code = self._get_param(group_code, 'group_code', True)
@@ -264,60 +272,96 @@ class ClassificationParamsProxy:
 
         return self.classification \
             .find_student_group_classifications(course_code, group_code,
-                                                semester, **kwargs)
+                                                semester, raw, **kwargs)
 
-    def find_student_group_classifications_simple_s2t(
-            self, course_code=None, group_code=None,
-            semester=None, **kwargs):
+    def find_student_classifications_for_definitions(self, identifier,
+                                                     course_code=None,
+                                                     group_code=None,
+                                                     semester=None, raw=False,
+                                                     **kwargs):
 
         course_code = self._get_param(course_code, 'course_code', True)
         group_code = self._get_param(group_code, 'group_code', True)
         semester = self._get_param(semester, 'semester', False)
 
         return self.classification \
-            .find_student_group_classifications_simple_s2t(
-                course_code, group_code,
-                semester, **kwargs)
+            .find_student_classifications_for_definitions(course_code,
+                                                          identifier,
+                                                          group_code, semester,
+                                                          raw, **kwargs)
 
-    def find_student_group_classifications_simple_t2s(
-            self, course_code, group_code=None,
-            semester=None, **kwargs):
+    def save_student_classifications(self, course_code=None,
+                                     student_classifications=None,
+                                     semester=None, **kwargs):
 
         course_code = self._get_param(course_code, 'course_code', True)
-        group_code = self._get_param(group_code, 'group_code', True)
         semester = self._get_param(semester, 'semester', False)
 
         return self.classification \
-            .find_student_group_classifications_simple_t2s(
-                course_code, group_code,
-                semester, **kwargs)
+            .save_student_classifications(course_code, student_classifications,
+                                          semester, **kwargs)
 
-    def find_student_classifications_for_definitions(self, identifier,
-                                                     course_code=None,
-                                                     group_code=None,
-                                                     semester=None, **kwargs):
+    def find_student_classification(self, student_username, course_code=None,
+                                    semester=None, lang=None, raw=False,
+                                    **kwargs):
+
+        course_code = self._get_param(course_code, 'course_code', True)
+        semester = self._get_param(semester, 'semester', False)
+        lang = self._get_param(lang, 'lang', False)
+
+        return self.classification \
+            .find_student_classification(course_code, student_username,
+                                         semester, lang, raw, **kwargs)
+
+    def get_course_groups(self, course_code=None, semester=None, lang=None,
+                          raw=False, **kwargs):
+
+        course_code = self._get_param(course_code, 'course_code', True)
+        semester = self._get_param(semester, 'semester', False)
+        lang = self._get_param(lang, 'lang', False)
+
+        return self.classification \
+            .get_course_groups(course_code, semester, lang, raw, **kwargs)
+
+    def validate_course_expressions(self, course_code=None, semester=None,
+                                    lang=None, batch_size=100, max_workers=8,
+                                    **kwargs):
+
+        course_code = self._get_param(course_code, 'course_code', True)
+        semester = self._get_param(semester, 'semester', False)
+        lang = self._get_param(lang, 'lang', False)
+
+        return self.classification \
+            .validate_course_expressions(course_code, semester, lang,
+                                         batch_size, max_workers, **kwargs)
+
+    def find_student_group_classifications_simple_s2t(self, course_code=None,
+                                                      group_code=None,
+                                                      semester=None, **kwargs):
 
         course_code = self._get_param(course_code, 'course_code', True)
         group_code = self._get_param(group_code, 'group_code', True)
         semester = self._get_param(semester, 'semester', False)
 
         return self.classification \
-            .find_student_classifications_for_definitions(course_code,
-                                                          identifier,
-                                                          group_code,
-                                                          semester, **kwargs)
+            .find_student_group_classifications_simple_s2t(course_code,
+                                                           group_code,
+                                                           semester, **kwargs)
 
-    def save_student_classifications(self, course_code=None,
-                                     student_classifications=None,
-                                     semester=None, **kwargs):
+    def find_student_group_classifications_simple_t2s(self, course_code=None,
+                                                      group_code=None,
+                                                      semester=None,
+                                                      lazy=False, **kwargs):
 
         course_code = self._get_param(course_code, 'course_code', True)
+        group_code = self._get_param(group_code, 'group_code', True)
         semester = self._get_param(semester, 'semester', False)
 
         return self.classification \
-            .save_student_classifications(course_code,
-                                          student_classifications,
-                                          semester, **kwargs)
+            .find_student_group_classifications_simple_t2s(course_code,
+                                                           group_code,
+                                                           semester, lazy,
+                                                           **kwargs)
 
     def save_student_classifications_simple_s2t(self, course_code=None,
                                                 student_to_tasks=None,
@@ -342,30 +386,7 @@ class ClassificationParamsProxy:
             .save_student_classifications_simple_t2s(course_code,
                                                      task_to_students,
                                                      semester, **kwargs)
-
-    def find_student_classification(self, student_username, course_code=None,
-                                    semester=None, lang=None, **kwargs):
-
-        course_code = self._get_param(course_code, 'course_code', True)
-        semester = self._get_param(semester, 'semester', False)
-        lang = self._get_param(lang, 'lang', False)
-
-        return self.classification \
-            .find_student_classification(course_code, student_username,
-                                         semester, lang, **kwargs)
-
-    # -----------------------------------------------
-    # ---------- STUDENT GROUP CONTROLLER -----------
-    # -----------------------------------------------
-    def get_course_groups(self, course_code=None,
-                          semester=None, lang=None, **kwargs):
-
-        course_code = self._get_param(course_code, 'course_code', True)
-        semester = self._get_param(semester, 'semester', False)
-        lang = self._get_param(lang, 'lang', False)
-
-        return self.classification \
-            .get_course_groups(course_code, semester, lang, **kwargs)
+    # --- End of generated methods ---
 
     # -----------------------------------------------
     # -------------- HELPER FUNCTIONS ---------------
@@ -375,3 +396,80 @@ class ClassificationParamsProxy:
         if required and result is None:
             raise MissingParameterError(self.PARAM_ERROR + var_name)
         return result
+
+
+def proxy_method_source(name, aliases=None):
+    """Returns the source of the wrapper of a client method for the proxy.
+
+    Parameters listed in :py:data:`STORED_PARAMS` default to ``None``
+    and are taken from the proxy when they are not supplied. Required
+    parameters that cannot be stored come first, the rest keeps
+    the order of the client method. The wrappers are checked in
+    to this module by running ``python -m classification.codegen``.
+
+    Args:
+        name: The name of the method of
+            :py:class:`~.classification.Classification`.
+        aliases: A dictionary renaming parameters of the client
+            method in the wrapper.
+
+    Returns:
+        The method indented for the body of
+        :py:class:`ClassificationParamsProxy`.
+
+    """
+
+    aliases = aliases or {}
+    params = _client_params(name)
+
+    def required(param):
+        param_name, default = param
+        return param_name not in STORED_PARAMS and default is _EMPTY
+
+    arguments = ['self']
+    for param in sorted(params, key=lambda p: not required(p)):
+        param_name, default = param
+        alias = aliases.get(param_name, param_name)
+        if required(param):
+            arguments.append(alias)
+        elif param_name in STORED_PARAMS:
+            arguments.append(f'{alias}=None')
+        else:
+            arguments.append(f'{alias}={default!r}')
+    arguments.append('**kwargs')
+
+    lines = wrap_arguments(f'    def {name}(', arguments, '):', ' ' * 12)
+    lines.append('')
+    stored = [p for p, _ in params if p in STORED_PARAMS]
+    for param_name in stored:
+        lines.append(f'        {param_name} = self._get_param('
+                     f'{param_name}, {param_name!r}, '
+                     f'{STORED_PARAMS[param_name]})')
+    if stored:
+        lines.append('')
+    passed = [aliases.get(p, p) for p, _ in params] + ['**kwargs']
+    lines.append('        return self.classification \\')
+    lines += wrap_arguments(f'            .{name}(', passed, ')', ' ' * 16)
+    return '\n'.join(lines) + '\n'
+
+
+def proxy_methods_source():
+    """Returns the source of the wrappers of all the client methods."""
+
+    return '\n'.join(proxy_method_source(name, _ALIASES.get(name))
+                     for name in tuple(ENDPOINTS) + COMPOSITE_METHODS)
+
+
+def _client_params(name):
+    # The names and defaults of the arguments of a client method,
+    # from the table for endpoints so that both classes can be
+    # regenerated at once
+    if name in ENDPOINTS:
+        endpoint = ENDPOINTS[name]
+        params = [(p.name, _EMPTY if p.required else p.default)
+                  for p in endpoint.params]
+        return params + [('raw', False)] if endpoint.raw else params
+    return [(p.name, p.default) for p in
+            inspect.signature(getattr(Classification, name))
+            .parameters.values()
+            if p.name != 'self' and p.kind != p.VAR_KEYWORD]
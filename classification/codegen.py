@@ -0,0 +1,63 @@
+"""Renders the API methods described in :py:mod:`classification.endpoints`
+into the client and the proxy.
+
+The methods are checked in, so that they have a source
+(for tracebacks, :py:func:`inspect.getsource`, IDEs and type checkers)
+like any other code. After changing the table, regenerate them with::
+
+    python -m classification.codegen
+
+"""
+
+from typing import Dict
+from classification import classification, classificationproxy
+from classification.endpoints import methods_source
+
+
+GENERATED_BEGIN = ('    # --- Generated by classification.codegen, '
+                   'do not edit ---\n')
+"""The line starting the generated methods in a class body."""
+
+GENERATED_END = '    # --- End of generated methods ---\n'
+"""The line ending the generated methods in a class body."""
+
+
+def generated_sources() -> Dict[str, str]:
+    """Returns the generated methods by the path of the module they
+    belong to."""
+
+    return {classification.__file__: methods_source(),
+            classificationproxy.__file__:
+                classificationproxy.proxy_methods_source()}
+
+
+def splice_generated(text: str, source: str) -> str:
+    """Replaces the generated methods in the text of a module.
+
+    Args:
+        text: The text of the module.
+        source: The new methods.
+
+    Returns:
+        The text with ``source`` between :py:data:`GENERATED_BEGIN`
+        and :py:data:`GENERATED_END`.
+
+    Raises:
+        ValueError: If the module does not contain the markers.
+
+    """
+
+    begin = text.find(GENERATED_BEGIN)
+    end = text.find(GENERATED_END, begin)
+    if begin < 0 or end < 0:
+        raise ValueError('The markers of the generated methods are missing')
+    begin += len(GENERATED_BEGIN)
+    return text[:begin] + source + text[end:]
+
+
+if __name__ == '__main__':
+    for _path, _source in generated_sources().items():
+        with open(_path) as _file:
+            _text = _file.read()
+        with open(_path, 'w') as _file:
+            _file.write(splice_generated(_text, _source))
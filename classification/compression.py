@@ -0,0 +1,122 @@
+import json
+import zlib
+from dataclasses import dataclass
+from typing import FrozenSet
+
+
+# The window bits of zlib for the HTTP content codings
+_WBITS = {'gzip': 16 + zlib.MAX_WBITS, 'deflate': zlib.MAX_WBITS}
+
+
+@dataclass
+class Compression:
+    """Describes how request bodies are compressed.
+
+    JSON bodies of ``methods`` larger than ``threshold`` bytes are sent
+    compressed with ``Content-Encoding`` set to ``encoding``. Grades are
+    very repetitive, so a large save request shrinks about ten times.
+    Smaller bodies are sent as they are, since compressing them saves
+    less than it costs.
+
+    Not every server accepts compressed requests. When the server
+    responds with ``415 Unsupported Media Type``, the request is sent
+    again uncompressed and compression is turned off
+    (:py:attr:`supported` becomes False) for all the following requests.
+
+    Every request also asks for a compressed response with
+    ``accept_encoding``, unless the caller sets ``Accept-Encoding``
+    itself. Responses are decompressed by Requests chunk by chunk
+    as they are read.
+
+    Attributes:
+        threshold (int): The minimal size (in bytes) of a body
+            to be compressed.
+        encoding (str): Either ``'gzip'`` or ``'deflate'``.
+        level (int): The compression level (1 is the fastest,
+            9 the smallest).
+        accept_encoding (str): The value of ``Accept-Encoding`` header.
+            ``None`` leaves the header to the session.
+        methods (FrozenSet[str]): HTTP methods whose bodies are
+            compressed.
+        supported (bool): Whether the server accepts compressed
+            requests (as far as we know).
+
+    """
+
+    threshold: int = 16 * 1024
+    encoding: str = 'gzip'
+    level: int = 6
+    accept_encoding: str = 'gzip, deflate'
+    methods: FrozenSet[str] = frozenset({'PUT', 'POST'})
+    supported: bool = True
+
+    def __post_init__(self):
+        if self.encoding not in _WBITS:
+            raise ValueError(f'Unsupported encoding "{self.encoding}", '
+                             f'use one of: {", ".join(_WBITS)}')
+
+    def compress(self, data: bytes) -> bytes:
+        """Compresses the data with :py:attr:`encoding`."""
+
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED,
+                                      _WBITS[self.encoding])
+        return compressor.compress(data) + compressor.flush()
+
+    def prepare(self, method, kwargs):
+        """Adds compression to keyword arguments of a request.
+
+        Args:
+            method: The HTTP method of the request.
+            kwargs: Keyword arguments for :py:func:`requests.request`.
+                They are not changed.
+
+        Returns:
+            A tuple of the new keyword arguments and a flag telling
+            whether the body was compressed. A JSON body checked
+            for its size is passed on encoded as ``data``, compressed
+            or not.
+
+        """
+
+        headers = kwargs.get('headers') or {}
+        prepared = kwargs
+        if self.accept_encoding is not None \
+                and not _has_header(headers, 'Accept-Encoding'):
+            headers = dict(headers, **{'Accept-Encoding':
+                                       self.accept_encoding})
+            prepared = dict(kwargs, headers=headers)
+
+        body = kwargs.get('json')
+        if not self.supported or body is None \
+                or method.upper() not in self.methods:
+            return prepared, False
+
+        if isinstance(body, bytes):
+            data = body  # already encoded
+        else:
+            data = json.dumps(body, allow_nan=False).encode('utf-8')
+
+        if len(data) < self.threshold:
+            # Sent as it is, without encoding it once more
+            if not _has_header(headers, 'Content-Type'):
+                headers = dict(headers, **{'Content-Type':
+                                           'application/json'})
+            prepared = dict(prepared, data=data, headers=headers)
+            compressed = False
+        else:
+            prepared = dict(prepared, data=self.compress(data), headers=dict(
+                headers, **{'Content-Type': 'application/json',
+                            'Content-Encoding': self.encoding}))
+            compressed = True
+        del prepared['json']
+        return prepared, compressed
+
+    def reject(self):
+        """Turns compression off after the server refused it."""
+
+        self.supported = False
+
+
+def _has_header(headers, name):
+    name = name.lower()
+    return any(key.lower() == name for key in headers)
@@ -0,0 +1,152 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+
+@dataclass
+class EditorChanges:
+    """Differences between the current and the desired editors.
+
+    Attributes:
+        add (List[str]): Usernames to be added as editors.
+        delete (List[str]): Usernames to be removed from editors.
+        failed (Dict[str, Exception]): Errors of the changes that
+            could not be applied, by username (filled in by
+            :py:meth:`EditorReconciler.reconcile`).
+
+    """
+
+    add: List[str] = field(default_factory=list)
+    delete: List[str] = field(default_factory=list)
+    failed: Dict[str, Exception] = field(default_factory=dict)
+
+    def __bool__(self):
+        return bool(self.add or self.delete)
+
+
+class EditorReconciler:
+    """Brings editors of many courses to the desired state.
+
+    Instead of calling
+    :py:meth:`~.classification.Classification.add_editor`
+    and
+    :py:meth:`~.classification.Classification.delete_editor`
+    for every editor of every course, give the reconciler the editors
+    each course should have. It reads the current editors of all
+    the courses concurrently, computes the differences and makes only
+    the calls needed, at most ``max_workers`` at a time.
+
+    Attributes:
+        client: The :py:class:`~.classification.Classification` client
+            (or its proxy).
+        max_workers (int): The maximal number of concurrent requests.
+        remove_extra (bool): Whether editors missing from the desired
+            set are deleted. If False, editors are only added.
+        protected (FrozenSet[str]): Usernames never deleted
+            (e.g. the account running the synchronization).
+
+    """
+
+    def __init__(self, client, max_workers: int=8,
+                 remove_extra: bool=True, protected=()):
+        self.client = client
+        self.max_workers = max_workers
+        self.remove_extra = remove_extra
+        self.protected = frozenset(protected)
+
+    def diff(self, desired: dict, **kwargs) -> Dict[str, EditorChanges]:
+        """Computes the changes needed, without applying them.
+
+        Args:
+            desired: A dictionary mapping course codes to iterables
+                of usernames that should be editors of the course.
+            **kwargs: Anything that :py:func:`get` function
+                from `Requests
+                <http://docs.python-requests.org/en/master/>`__
+                library can take.
+
+        Returns:
+            A dictionary mapping course codes to their
+            :py:class:`EditorChanges`.
+
+        Note:
+            On failure, this method raises standard `Requests errors
+            <http://docs.python-requests.org/en/master/
+            _modules/requests/exceptions/>`__.
+
+        """
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return self._diff(executor, desired, **kwargs)
+
+    def reconcile(self, desired: dict, dry_run: bool=False,
+                  **kwargs) -> Dict[str, EditorChanges]:
+        """Applies the changes needed to reach the desired editors.
+
+        A failed change does not stop the others; its error is stored
+        in :py:attr:`EditorChanges.failed` of its course.
+
+        Args:
+            desired: See :py:meth:`diff`.
+            dry_run: If True, only the changes are computed.
+            **kwargs: Anything that :py:func:`get`, :py:func:`put`
+                and :py:func:`delete` functions from `Requests
+                <http://docs.python-requests.org/en/master/>`__
+                library can take.
+
+        Returns:
+            A dictionary mapping course codes to their
+            :py:class:`EditorChanges`.
+
+        Note:
+            If the current editors cannot be read, this method raises
+            standard `Requests errors
+            <http://docs.python-requests.org/en/master/
+            _modules/requests/exceptions/>`__.
+
+        """
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            changes = self._diff(executor, desired, **kwargs)
+            if dry_run:
+                return changes
+
+            calls = [(course, username, executor.submit(
+                         contextvars.copy_context().run, method,
+                         course_code=course, username=username, **kwargs))
+                     for course, diff in changes.items()
+                     for method, usernames in
+                     ((self.client.add_editor, diff.add),
+                      (self.client.delete_editor, diff.delete))
+                     for username in usernames]
+
+            for course, username, future in calls:
+                try:
+                    future.result()
+                except Exception as e:
+                    changes[course].failed[username] = e
+
+        return changes
+
+    def _diff(self, executor, desired, **kwargs):
+        current = {course: executor.submit(
+                       contextvars.copy_context().run,
+                       self.client.get_editors, course_code=course, **kwargs)
+                   for course in desired}
+
+        changes = dict()
+        for course, usernames in desired.items():
+            wanted = set(usernames)
+            existing = {_username(e) for e in current[course].result() or ()}
+            delete = existing - wanted - self.protected \
+                if self.remove_extra else set()
+            changes[course] = EditorChanges(sorted(wanted - existing),
+                                            sorted(delete))
+        return changes
+
+
+def _username(editor):
+    if isinstance(editor, dict):
+        return editor.get('username')
+    return editor
@@ -0,0 +1,574 @@
+import string
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from classification.types import RespDict, ClassificationDtoType, \
+    ParseAllDtoType, ParseDtoType, SettingsDtoType, \
+    CourseSettingsDtoType, StudentClassificationDtoType
+
+
+REQUIRED = object()
+"""The default of parameters that have to be supplied."""
+
+API_DOCUMENTATION = ('See `Classification portal API documentation\n'
+                     '<https://rozvoj.fit.cvut.cz/evolution-dev/\n'
+                     'classification/api/v1/private/documentation>`__.')
+
+
+@dataclass(frozen=True)
+class Param:
+    """A parameter of an API method.
+
+    Attributes:
+        name (str): The name of the argument of the method.
+        doc (str): Its description (lines are separated by ``\\n``).
+        annotation: Its type annotation.
+        default: Its default value or :py:data:`REQUIRED`.
+        kind (str): Where the value goes: ``'path'`` (a segment
+            of the route), ``'query'`` (the query string)
+            or ``'body'`` (the JSON body).
+        key (str): The name of the query string parameter.
+        serialize (str): How the body is made from the value:
+            ``'dto'`` (one entity or dictionary),
+            ``'dtos'`` (a list of them or an already encoded
+            :py:class:`~.utils.EncodedJson`) or ``'plain'``
+            (sent as it is).
+
+    """
+
+    name: str
+    doc: str
+    annotation: Any = str
+    default: Any = REQUIRED
+    kind: str = 'path'
+    key: Optional[str] = None
+    serialize: Optional[str] = None
+
+    @property
+    def required(self):
+        return self.default is REQUIRED
+
+
+def path(name, doc, annotation=str, default=REQUIRED):
+    """Describes a segment of the route."""
+
+    return Param(name, doc, annotation, default)
+
+
+def query(name, doc, annotation=str, default=None, key=None):
+    """Describes a query string parameter (``key`` defaults to ``name``)."""
+
+    return Param(name, doc, annotation, default, 'query', key or name)
+
+
+def body(name, doc, annotation, default=None, serialize='dto'):
+    """Describes the JSON body."""
+
+    return Param(name, doc, annotation, default, 'body',
+                 serialize=serialize)
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """A declarative description of one API method.
+
+    Attributes:
+        name (str): The name of the method.
+        group (str): The endpoint group (the controller of the API).
+        verb (str): The HTTP method.
+        route (str): The path after ``API_URL`` with the path parameters
+            in braces, e.g. ``'/public/courses/{course_code}/editors'``.
+        status (int): The status code expected on success.
+        summary (str): The first line of the documentation.
+        params (Tuple[Param]): The parameters in the order
+            of the signature.
+        cached (bool): Whether the results are memoized
+            in the expression cache of the client.
+
+    """
+
+    name: str
+    group: str
+    verb: str
+    route: str
+    status: int
+    summary: str
+    params: Tuple[Param, ...] = ()
+    cached: bool = False
+
+    def __post_init__(self):
+        fields = {f for _, f, _, _ in string.Formatter().parse(self.route)
+                  if f is not None}
+        declared = {p.name for p in self.params if p.kind == 'path'}
+        if fields != declared:
+            raise ValueError(f'The route of "{self.name}" does not match '
+                             f'its path parameters')
+
+    @property
+    def query(self):
+        """The parameters sent in the query string."""
+
+        return tuple(p for p in self.params if p.kind == 'query')
+
+    @property
+    def body(self):
+        """The parameter sent as the body or ``None``."""
+
+        return next((p for p in self.params if p.kind == 'body'), None)
+
+    @property
+    def raw(self):
+        """Whether the method can return the undecoded body."""
+
+        return self.verb == 'GET'
+
+
+COURSE = path('course_code', 'The code of the course.')
+SEMESTER = query('semester', 'Semester identifier.')
+LANG = query('lang', 'Language tag.')
+USERNAME = path('username', 'The name of the user.')
+NOTIFICATION = path('id', 'The identifier of the notification.', int)
+EDITOR = path('username', 'Username of the editor.')
+IDENTIFIER = path('identifier', 'Classification identifier.')
+
+
+def _endpoints(*endpoints):
+    return {e.name: e for e in endpoints}
+
+
+ENDPOINTS: Dict[str, Endpoint] = _endpoints(
+    # -----------------------------------------------
+    # ---------- CLASSIFICATION CONTROLLER ----------
+    # -----------------------------------------------
+    Endpoint('delete_classification', 'classification', 'DELETE',
+             '/public/courses/{course_code}/classifications', 204,
+             'Deletes classification.',
+             (COURSE,
+              query('classification_id', 'Classification identifier.',
+                    default=REQUIRED, key='classification-identifier'),
+              SEMESTER)),
+    Endpoint('find_classifications_for_course', 'classification', 'GET',
+             '/public/courses/{course_code}/classifications', 200,
+             'Finds classification for the given course.',
+             (COURSE, SEMESTER, LANG)),
+    Endpoint('save_classification', 'classification', 'POST',
+             '/public/courses/{course_code}/classifications', 201,
+             'Saves classification for the given course.',
+             (COURSE,
+              body('classification_dto',
+                   'The body for the request. Can be\n'
+                   'a plain Python dictionary or a\n'
+                   ':py:class:`~.entities.ClassificationDto`.',
+                   ClassificationDtoType))),
+    Endpoint('change_order_of_classifications', 'classification', 'PUT',
+             '/public/courses/{course_code}/classifications/order', 201,
+             'Changes the order of classifications.',
+             (COURSE,
+              body('indexes', 'The body for the request. Should be\n'
+                              'a plain Python dictionary.',
+                   dict, default=REQUIRED, serialize='plain'),
+              SEMESTER)),
+    Endpoint('find_classification', 'classification', 'GET',
+             '/public/courses/{course_code}/classifications/{identifier}',
+             200, 'Finds classification by identifier.',
+             (COURSE, IDENTIFIER, SEMESTER, LANG)),
+    Endpoint('clone_classification_definitions', 'classification', 'PUT',
+             '/public/courses/{source_course_code}'
+             '/classifications/clones/{target_course_code}', 201,
+             'Clones the definitions of the classification.',
+             (query('target_semester', 'Target semester code.',
+                    default=REQUIRED, key='target-semester'),
+              path('target_course_code', 'Target course code.'),
+              query('source_semester', 'Source semester code.',
+                    default=REQUIRED, key='source-semester'),
+              path('source_course_code', 'Source course code.'),
+              query('remove_existing', 'Remove existing definitions.',
+                    bool, default=REQUIRED, key='remove-existing'))),
+
+    # -----------------------------------------------
+    # -------------- EDITOR CONTROLLER --------------
+    # -----------------------------------------------
+    Endpoint('get_editors', 'editor', 'GET',
+             '/public/courses/{course_code}/editors', 200,
+             'Get editors.', (COURSE,)),
+    Endpoint('delete_editor', 'editor', 'DELETE',
+             '/public/courses/{course_code}/editors/{username}', 204,
+             'Delete given editor.', (COURSE, EDITOR)),
+    Endpoint('add_editor', 'editor', 'PUT',
+             '/public/courses/{course_code}/editors/{username}', 201,
+             'Add a new editor.', (COURSE, EDITOR)),
+
+    # -----------------------------------------------
+    # ------------ EXPRESSION CONTROLLER ------------
+    # -----------------------------------------------
+    Endpoint('evaluate_all', 'expression', 'POST',
+             '/public/course-expressions/analyses', 201,
+             'Evaluate all expressions.',
+             (body('expressions_dto',
+                   'The body for the request. Can be\n'
+                   'a plain Python dictionary or a\n'
+                   ':py:class:`~.entities.ExpressionParseAllRequestDto`.',
+                   ParseAllDtoType),),
+             cached=True),
+    Endpoint('try_validity', 'expression', 'POST',
+             '/public/expressions/analyses', 201,
+             'Try validity of an expression.',
+             (body('expression_dto',
+                   'The body for the request. Can be\n'
+                   'a plain Python dictionary or a\n'
+                   ':py:class:`~.entities.ExpressionParseRequestDto`.',
+                   ParseDtoType),),
+             cached=True),
+    Endpoint('get_functions', 'expression', 'GET',
+             '/public/expressions/functions', 200,
+             'Get all functions.'),
+
+    # -----------------------------------------------
+    # ----------- NOTIFICATION CONTROLLER -----------
+    # -----------------------------------------------
+    Endpoint('get_all_notifications', 'notification', 'GET',
+             '/public/notifications/{username}/all', 200,
+             'Get all notifications.',
+             (USERNAME, query('count', 'Count.', int),
+              query('page', 'Page.', int), LANG)),
+    Endpoint('get_unread_notifications', 'notification', 'GET',
+             '/public/notifications/{username}/new', 200,
+             'Get all unread notifications.',
+             (USERNAME, query('count', 'Count.', int),
+              query('page', 'Page.', int), LANG)),
+    Endpoint('unread_all_notifications', 'notification', 'DELETE',
+             '/public/notifications/{username}/read', 204,
+             'Mark all notifications unread.', (USERNAME,)),
+    Endpoint('read_all_notifications', 'notification', 'PUT',
+             '/public/notifications/{username}/read', 201,
+             'Mark all notifications read.', (USERNAME,)),
+    Endpoint('unread_notification', 'notification', 'DELETE',
+             '/public/notifications/{username}/read/{id}', 204,
+             'Mark a single notification as unread.',
+             (USERNAME, NOTIFICATION)),
+    Endpoint('read_notification', 'notification', 'PUT',
+             '/public/notifications/{username}/read/{id}', 201,
+             'Mark a single notification as read.',
+             (USERNAME, NOTIFICATION)),
+
+    # -----------------------------------------------
+    # ------------- SETTINGS CONTROLLER -------------
+    # -----------------------------------------------
+    Endpoint('get_settings', 'settings', 'GET',
+             '/public/settings/my', 200,
+             'Get settings.', (SEMESTER, LANG)),
+    Endpoint('save_my_settings', 'settings', 'PUT',
+             '/public/settings/my', 201,
+             'Save my settings.',
+             (body('user_settings_dto',
+                   'The body of the request. Can be\n'
+                   'a plain Python dictionary or a\n'
+                   ':py:class:`~.entities.UserSettingsDto`.',
+                   SettingsDtoType),)),
+    Endpoint('save_student_course_settings', 'settings', 'PUT',
+             '/public/settings/my/student/courses', 201,
+             'Save student course settings.',
+             (body('user_course_settings_dto',
+                   'The body of the request. Can be\n'
+                   'a plain Python dictionary or a\n'
+                   ':py:class:`~.entities.UserCourseSettingsDto`.',
+                   CourseSettingsDtoType),
+              SEMESTER)),
+    Endpoint('save_teacher_course_settings', 'settings', 'PUT',
+             '/public/settings/my/teacher/courses', 201,
+             'Save teacher course settings.',
+             (body('user_course_settings_dto',
+                   'The body of the request. Can be\n'
+                   'a plain Python dictionary or a\n'
+                   ':py:class:`~.entities.UserCourseSettingsDto`.',
+                   CourseSettingsDtoType),
+              SEMESTER)),
+
+    # -----------------------------------------------
+    # ------ STUDENT CLASSIFICATION CONTROLLER ------
+    # -----------------------------------------------
+    Endpoint('find_student_group_classifications', 'student_classification',
+             'GET', '/public/courses/{course_code}/group/{group_code}'
+                    '/student-classifications', 200,
+             'Find student group classifications.',
+             (COURSE, path('group_code', 'The code of the group.',
+                           default='ALL'),
+              SEMESTER)),
+    Endpoint('find_student_classifications_for_definitions',
+             'student_classification', 'GET',
+             '/public/courses/{course_code}/group/{group_code}'
+             '/student-classifications/{identifier}', 200,
+             'Find student classification for definitions.',
+             (COURSE, IDENTIFIER,
+              path('group_code', 'The code of the group.', default='ALL'),
+              SEMESTER)),
+    Endpoint('save_student_classifications', 'student_classification', 'PUT',
+             '/public/courses/{course_code}/student-classifications', 201,
+             'Save student classifications.',
+             (COURSE,
+              body('student_classifications',
+                   'The body of the request. Can be\n'
+                   'a list of plain Python dictionaries or of\n'
+                   ':py:class:`~.entities.StudentClassificationPreviewDto`.',
+                   StudentClassificationDtoType, serialize='dtos'),
+              SEMESTER)),
+    Endpoint('find_student_classification', 'student_classification', 'GET',
+             '/public/courses/{course_code}'
+             '/student-classifications/{student_username}', 200,
+             'Find student classifications.',
+             (COURSE, path('student_username', 'The username of the student.'),
+              SEMESTER, LANG)),
+
+    # -----------------------------------------------
+    # ---------- STUDENT GROUP CONTROLLER -----------
+    # -----------------------------------------------
+    Endpoint('get_course_groups', 'student_group', 'GET',
+             '/public/course/{course_code}/student-groups', 200,
+             'Get course groups.', (COURSE, SEMESTER, LANG)),
+)
+
+
+def endpoint_groups(endpoints=None):
+    """Returns the names of the endpoints grouped by their group."""
+
+    groups = dict()
+    for endpoint in (endpoints or ENDPOINTS).values():
+        groups.setdefault(endpoint.group, list()).append(endpoint.name)
+    return {group: tuple(names) for group, names in groups.items()}
+
+
+_LINE_LENGTH = 79
+
+_TYPE_NAMES = {'RespDict': RespDict,
+               'ClassificationDtoType': ClassificationDtoType,
+               'ParseAllDtoType': ParseAllDtoType,
+               'ParseDtoType': ParseDtoType,
+               'SettingsDtoType': SettingsDtoType,
+               'CourseSettingsDtoType': CourseSettingsDtoType,
+               'StudentClassificationDtoType': StudentClassificationDtoType}
+
+
+def method_source(endpoint: Endpoint) -> str:
+    """Returns the source of the method of the client calling the endpoint.
+
+    The methods are not built at runtime: their source is rendered
+    from the table and checked in to
+    :py:mod:`classification.classification` by running
+    ``python -m classification.codegen``. A call does exactly what
+    a handwritten method would: the URL is one f-string, the query
+    string parameters that are ``None`` are not put into ``params``
+    at all and nothing is looked up in the table.
+
+    Args:
+        endpoint: The description of the endpoint.
+
+    Returns:
+        The decorated method indented for the body of
+        :py:class:`~.classification.Classification`.
+
+    """
+
+    arguments = ['self']
+    for param in endpoint.params:
+        argument = f'{param.name}: {_annotation(param.annotation)}'
+        if not param.required:
+            argument += f'={param.default!r}'
+        arguments.append(argument)
+    if endpoint.raw:
+        arguments.append('raw: bool=False')
+    arguments.append('**kwargs')
+
+    lines = ['    @traced', '    @refresh_token']
+    lines += wrap_arguments(f'    def {endpoint.name}(', arguments,
+                            ') -> RespDict:', ' ' * 12)
+    lines += _indent(_docstring(endpoint), 8)
+    options = list()
+
+    if endpoint.query:
+        required = [f'{p.key!r}: {p.name}' for p in endpoint.query
+                    if p.required]
+        lines.append('')
+        if required:
+            lines += wrap_arguments('        params = {', required, '}',
+                                    ' ' * 12)
+        else:
+            lines.append('        params = {}')
+        for param in endpoint.query:
+            if not param.required:
+                lines.append(f'        if {param.name} is not None:')
+                lines.append(f'            params[{param.key!r}] = '
+                             f'{param.name}')
+        options.append('params=params')
+
+    payload = endpoint.body
+    if payload is not None:
+        if payload.serialize == 'plain':
+            options.append(f'json={payload.name}')
+        else:
+            make = 'make_dict_bodies' if payload.serialize == 'dtos' \
+                else 'make_dict_body'
+            lines.append('')
+            lines.append("        with self._measure('serialize'):")
+            lines.append(f'            body = {make}({payload.name})')
+            options.append('json=body')
+
+    if endpoint.raw:
+        options.append('raw=raw')
+    options.append('**kwargs')
+
+    url = '\n'.join(_fstring(piece) for piece in _route_pieces(endpoint))
+    arguments = [repr(endpoint.name), repr(endpoint.verb),
+                 str(endpoint.status), url] + options
+
+    lines.append('')
+    if endpoint.cached:
+        lines.append('        def send():')
+        lines += wrap_arguments('            return self._request(',
+                                arguments, ')', ' ' * 16)
+        lines.append('')
+        lines.append(f'        return self._cached_expression_call('
+                     f'{endpoint.name!r}, body, send)')
+    else:
+        lines += wrap_arguments('        return self._request(',
+                                arguments, ')', ' ' * 12)
+
+    return '\n'.join(lines) + '\n'
+
+
+def methods_source(endpoints: Dict[str, Endpoint]=None) -> str:
+    """Returns the source of the methods of all the endpoints.
+
+    Args:
+        endpoints: The table, :py:data:`ENDPOINTS` by default.
+
+    """
+
+    return '\n'.join(method_source(e)
+                     for e in (endpoints or ENDPOINTS).values())
+
+
+def _annotation(annotation):
+    if isinstance(annotation, type):
+        return annotation.__name__
+    for name, value in _TYPE_NAMES.items():
+        if value == annotation:
+            return name
+    raise ValueError(f'Unknown annotation: {annotation!r}')
+
+
+def _route_pieces(endpoint):
+    # '/public/courses/{course_code}/editors' is split into
+    # '{self.API_URL}/public', '/courses/{course_code}', '/editors'
+    segments = endpoint.route.strip('/').split('/')
+    pieces = ['{self.API_URL}/' + segments[0]]
+    for segment in segments[1:]:
+        if segment.startswith('{') and not pieces[-1].endswith('}'):
+            pieces[-1] += '/' + segment
+        else:
+            pieces.append('/' + segment)
+    return pieces
+
+
+def _fstring(piece):
+    return f"f'{piece}'"
+
+
+def _indent(docstring, width):
+    lines = docstring.split('\n')
+    indent = ' ' * width
+    return [f'{indent}"""{lines[0]}'] + \
+        [f'{indent}{line}' if line else '' for line in lines[1:]] + \
+        [f'{indent}"""']
+
+
+def _docstring(endpoint):
+    args = [_describe(p.name, p.doc) for p in endpoint.params]
+
+    if endpoint.raw:
+        args.append(_describe('raw', 'If True, the body is not decoded and\n'
+                                     'a :py:class:`~.utils.RawResponse` '
+                                     'with the undecoded\n'
+                                     'bytes and the headers is returned '
+                                     'instead.\n'
+                                     'Defaults to False.'))
+
+    excluded = [f'``{option}``' for option, used in
+                (('params', endpoint.query), ('json', endpoint.body))
+                if used]
+    can_take = 'library can take'
+    if excluded:
+        can_take += ' except for ' + ' and '.join(excluded)
+    args.append(_describe('**kwargs',
+                          f'Anything that :py:func:`{endpoint.verb.lower()}` '
+                          f'function\n'
+                          f'from `Requests\n'
+                          f'<http://docs.python-requests.org/en/master/>`__\n'
+                          f'{can_take}.'))
+
+    return '\n'.join([
+        endpoint.summary, '', API_DOCUMENTATION, '',
+        'Args:', *args, '',
+        'Returns:',
+        '    On success, it returns the response body or ``None``,',
+        '    if the body is empty.', '',
+        'Note:',
+        '    On failure, this method raises standard `Requests errors',
+        '    <http://docs.python-requests.org/en/master/',
+        '    _modules/requests/exceptions/>`__.', ''])
+
+
+def _describe(name, doc):
+    first, *rest = doc.split('\n')
+    return '\n'.join([f'    {name}: {first}'] + [f'        {r}' for r in rest])
+
+
+def wrap_arguments(opening: str, items: List[str], closing: str,
+                   hanging: str) -> List[str]:
+    """Lays out a list of arguments like the handwritten code does.
+
+    The items are aligned with the opening parenthesis or, when that
+    does not fit on the lines, put on lines with a hanging indent.
+    Items spanning more lines (implicitly concatenated strings)
+    stand on their own lines.
+
+    Args:
+        opening: The text before the first item, e.g. ``'    def f('``.
+        items: The items.
+        closing: The text after the last item, e.g. ``'):'``.
+        hanging: The indentation of the hanging lines.
+
+    Returns:
+        The lines.
+
+    """
+
+    lines = _pack(opening, ' ' * len(opening), items, closing)
+    if all(len(line) <= _LINE_LENGTH for line in lines):
+        return lines
+    return [opening.rstrip()] + _pack(hanging, hanging, items, closing)
+
+
+def _pack(start, indent, items, closing):
+    lines = list()
+    current, empty = start, True
+    for number, item in enumerate(items, start=1):
+        suffix = closing if number == len(items) else ','
+        *pieces, last = item.split('\n')
+        if pieces:
+            if not empty:
+                lines.append(current)
+                current = indent
+            for piece in pieces:
+                lines.append(current + piece)
+                current = indent
+            lines.append(current + last + suffix)
+            current, empty = indent, True
+        elif empty:
+            current, empty = current + item + suffix, False
+        elif len(current) + len(item) + len(suffix) + 1 <= _LINE_LENGTH:
+            current += ' ' + item + suffix
+        else:
+            lines.append(current)
+            current = indent + item + suffix
+    if not empty:
+        lines.append(current)
+    return lines
@@ -28,3 +28,43 @@ class MissingParameterError(Exception):
 
     """
     pass
+
+
+class CircuitOpenError(Exception):
+    """Error related to the circuit breaker.
+
+    Raised instead of sending a request when the circuit breaker
+    of its endpoint group is open, i.e. the portal seems to be down.
+    Catch it to fall back (for example, to cached data) immediately
+    instead of waiting for the request to time out.
+
+    Attributes:
+        group (str): The endpoint group whose circuit is open.
+        retry_in (float): How many seconds remain until the breaker
+            lets a probing request through.
+
+    """
+
+    def __init__(self, group, retry_in):
+        super().__init__(f'The circuit of "{group}" endpoints is open, '
+                         f'retry in {retry_in:.1f} s')
+        self.group = group
+        self.retry_in = retry_in
+
+
+class ColumnMappingError(Exception):
+    """Error related to importing grade sheets.
+
+    Raised when a column of the sheet cannot be mapped
+    to a classification of the course because it does not exist
+    or it is calculated (before anything is saved), or when a cell
+    does not match the value type of its classification.
+
+    Attributes:
+        problems (List[str]): Descriptions of all the problems found.
+
+    """
+
+    def __init__(self, problems):
+        super().__init__('; '.join(problems))
+        self.problems = list(problems)
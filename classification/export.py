@@ -0,0 +1,279 @@
+import contextvars
+import csv
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+FORMATS = ('csv', 'parquet', 'arrow')
+
+# Columns of the exported tables with their types
+TABLES = {
+    'definitions': (('course', 'str'), ('semester', 'str'),
+                    ('identifier', 'str'), ('value_type', 'str'),
+                    ('classification_type', 'str'), ('calculated', 'bool'),
+                    ('expression', 'str'), ('mandatory', 'bool'),
+                    ('hidden', 'bool'), ('minimum', 'float'),
+                    ('maximum', 'float'), ('position', 'int')),
+    'groups': (('course', 'str'), ('semester', 'str'),
+               ('code', 'str'), ('name', 'str')),
+    'members': (('course', 'str'), ('semester', 'str'),
+                ('group_code', 'str'), ('username', 'str')),
+    'grades': (('course', 'str'), ('semester', 'str'),
+               ('username', 'str'), ('identifier', 'str'),
+               ('value', 'str'), ('number', 'float')),
+}
+
+
+class CourseExporter:
+    """Dumps whole courses into CSV, Parquet or Arrow files.
+
+    Every exported course is downloaded with
+    :py:meth:`~.classification.Classification.find_classifications_for_course`,
+    :py:meth:`~.classification.Classification.get_course_groups`
+    and
+    :py:meth:`~.classification.Classification.find_student_group_classifications`.
+    Several courses are downloaded in parallel, but only one writer
+    appends their rows to the output files in batches of ``batch_size``
+    rows. A new course is downloaded only after the rows of a finished
+    one have been written, so at most ``max_workers`` courses are held
+    in memory, however slow the writer is.
+
+    The output directory gets one file per table:
+
+    - ``definitions`` – one row per classification definition,
+    - ``groups`` – one row per group of a course,
+    - ``members`` – one row per student of a group
+      (only if ``members`` is enabled),
+    - ``grades`` – one row per grade; ``value`` holds the grade encoded
+      as JSON (so that numbers, booleans and strings can share a column)
+      and ``number`` holds numeric grades as a float.
+
+    The Parquet and Arrow formats need
+    `pyarrow <https://arrow.apache.org/docs/python/>`__,
+    which is not a dependency of this library.
+
+    Attributes:
+        client: The :py:class:`~.classification.Classification` client
+            (or its proxy) used to download the data.
+        format (str): One of ``'csv'``, ``'parquet'`` and ``'arrow'``.
+        batch_size (int): The number of rows written at once.
+        max_workers (int): The maximal number of courses downloaded
+            at the same time.
+        members (bool): Whether members of every group are exported
+            (it takes one more request per group).
+
+    """
+
+    def __init__(self, client, format: str='csv', batch_size: int=10000,
+                 max_workers: int=4, members: bool=False):
+        if format not in FORMATS:
+            raise ValueError(f'Unknown format "{format}", '
+                             f'use one of {", ".join(FORMATS)}')
+        if format != 'csv':
+            _import_pyarrow()
+
+        self.client = client
+        self.format = format
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.members = members
+
+    def export(self, course_codes, directory: str, semester: str=None,
+               **kwargs) -> dict:
+        """Exports the given courses of a semester.
+
+        Args:
+            course_codes: Codes of the courses.
+            directory: Where the files are written (it is created
+                if needed). Existing files are overwritten.
+            semester: Semester identifier.
+            **kwargs: Anything that :py:func:`get` function
+                from `Requests
+                <http://docs.python-requests.org/en/master/>`__
+                library can take except for ``params``.
+
+        Returns:
+            A dictionary mapping the tables to paths of their files
+            and the numbers of written rows, e.g.
+            ``{'grades': ('out/grades.csv', 12345), ...}``.
+
+        Note:
+            On failure, this method raises standard `Requests errors
+            <http://docs.python-requests.org/en/master/
+            _modules/requests/exceptions/>`__. The files written
+            so far are left incomplete.
+
+        """
+
+        os.makedirs(directory, exist_ok=True)
+
+        tables = [t for t in TABLES if self.members or t != 'members']
+        writers = {t: _WRITERS[self.format](
+            os.path.join(directory, f'{t}.{self.format}'), TABLES[t],
+            self.batch_size) for t in tables}
+
+        def write(done):
+            for future in done:
+                for table, rows in future.result():
+                    writers[table].write(rows)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) \
+                    as executor:
+                pending = set()
+                for code in course_codes:
+                    if len(pending) >= self.max_workers:
+                        done, pending = wait(pending,
+                                             return_when=FIRST_COMPLETED)
+                        write(done)
+                    pending.add(executor.submit(
+                        contextvars.copy_context().run, self._download,
+                        code, semester, **kwargs))
+                while pending:
+                    done, pending = wait(pending,
+                                         return_when=FIRST_COMPLETED)
+                    write(done)
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        return {t: (w.path, w.rows) for t, w in writers.items()}
+
+    def _download(self, course_code, semester, **kwargs):
+        client = self.client
+        semester_code = semester or ''
+
+        definitions = client.find_classifications_for_course(
+            course_code, semester, **kwargs) or list()
+        groups = client.get_course_groups(
+            course_code, semester, **kwargs) or list()
+        records = client.find_student_group_classifications(
+            course_code, 'ALL', semester, **kwargs) or list()
+
+        result = [
+            ('definitions', [
+                (course_code, semester_code, d['identifier'],
+                 d.get('valueType'), d.get('classificationType'),
+                 d.get('calculated'), d.get('expression'),
+                 d.get('mandatory'), d.get('hidden'),
+                 d.get('minimumRequiredValue'), d.get('maximumValue'),
+                 position)
+                for position, d in enumerate(definitions)]),
+            ('groups', [(course_code, semester_code, g['code'],
+                         g.get('name')) for g in groups]),
+            ('grades', _grade_rows(course_code, semester_code, records)),
+        ]
+
+        if self.members:
+            result.append(('members', [
+                (course_code, semester_code, g['code'], r['username'])
+                for g in groups
+                for r in client.find_student_group_classifications(
+                    course_code, g['code'], semester, **kwargs) or list()]))
+
+        return result
+
+
+def _grade_rows(course_code, semester_code, records):
+    for record in records:
+        username = record['username']
+        for identifier, value in \
+                (record.get('classificationMap') or {}).items():
+            number = float(value) if isinstance(value, (int, float)) \
+                and not isinstance(value, bool) else None
+            yield (course_code, semester_code, username, identifier,
+                   json.dumps(value), number)
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError('Exporting to Parquet and Arrow requires pyarrow, '
+                          'install it with "pip install pyarrow"') from None
+    return pyarrow
+
+
+class _Writer:
+    """Collects rows and writes them in batches."""
+
+    def __init__(self, path, columns, batch_size):
+        self.path = path
+        self.columns = columns
+        self.batch_size = batch_size
+        self.rows = 0
+        self._batch = list()
+
+    def write(self, rows):
+        for row in rows:
+            self._batch.append(row)
+            if len(self._batch) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        if self._batch:
+            self._write_batch(self._batch)
+            self.rows += len(self._batch)
+            self._batch = list()
+
+    def close(self):
+        self.flush()
+        self._close()
+
+
+class _CsvWriter(_Writer):
+
+    def __init__(self, path, columns, batch_size):
+        super().__init__(path, columns, batch_size)
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._csv = csv.writer(self._file)
+        self._csv.writerow([name for name, _ in columns])
+
+    def _write_batch(self, batch):
+        self._csv.writerows(batch)
+
+    def _close(self):
+        self._file.close()
+
+
+class _ArrowWriter(_Writer):
+
+    def __init__(self, path, columns, batch_size):
+        super().__init__(path, columns, batch_size)
+        pa = self._pa = _import_pyarrow()
+        types = {'str': pa.string(), 'bool': pa.bool_(),
+                 'float': pa.float64(), 'int': pa.int64()}
+        self._schema = pa.schema([(name, types[t]) for name, t in columns])
+        self._writer = self._open()
+
+    def _open(self):
+        return self._pa.ipc.new_file(self.path, self._schema)
+
+    def _write_batch(self, batch):
+        self._writer.write_batch(self._record_batch(batch))
+
+    def _record_batch(self, batch):
+        return self._pa.RecordBatch.from_arrays(
+            [self._pa.array(column, type=field.type)
+             for column, field in zip(zip(*batch), self._schema)],
+            schema=self._schema)
+
+    def _close(self):
+        self._writer.close()
+
+
+class _ParquetWriter(_ArrowWriter):
+
+    def _open(self):
+        return self._pa.parquet.ParquetWriter(self.path, self._schema)
+
+    def _write_batch(self, batch):
+        # Every batch becomes a row group of the file
+        self._writer.write_table(self._pa.Table.from_batches(
+            [self._record_batch(batch)]))
+
+
+_WRITERS = {'csv': _CsvWriter, 'arrow': _ArrowWriter,
+            'parquet': _ParquetWriter}
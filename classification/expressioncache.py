@@ -0,0 +1,109 @@
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+MISS = object()
+"""Sentinel returned by :py:meth:`ExpressionCache.get` on a cache miss."""
+
+
+class ExpressionCache:
+    """A content-addressed LRU cache for expression analysis results.
+
+    Results of :py:meth:`~.classification.Classification.try_validity`
+    and :py:meth:`~.classification.Classification.evaluate_all` depend
+    only on the request body, so the body itself (normalized with sorted
+    keys) is used as the key. Entries expire after ``ttl`` seconds and
+    the least recently used entry is evicted once ``maxsize`` is reached.
+
+    The cache is thread-safe and can be shared between several clients.
+
+    Attributes:
+        maxsize (int): The maximal number of stored results.
+        ttl (float): How long (in seconds) a result stays valid.
+            ``None`` means results never expire.
+
+    """
+
+    def __init__(self, maxsize: int=1024, ttl: float=300.0, clock=None):
+        """Creates a new empty cache.
+
+        Args:
+            maxsize: The maximal number of stored results.
+                Defaults to 1024.
+            ttl: How long (in seconds) a result stays valid.
+                Defaults to 300 seconds.
+            clock: A function returning the current time in seconds.
+                Defaults to :py:func:`time.monotonic`.
+
+        """
+
+        if maxsize < 1:
+            raise ValueError('maxsize must be a positive number')
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock or time.monotonic
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(endpoint, body):
+        """Builds a cache key from the endpoint name and the request body.
+
+        Args:
+            endpoint: The name of the API method, for example
+                ``'try_validity'``.
+            body: The request body as a plain Python dictionary
+                (see :py:meth:`~.entities.ExpressionParseRequestDto.to_dict`).
+
+        Returns:
+            A hex digest identifying the request.
+
+        """
+
+        normalized = json.dumps([endpoint, body], sort_keys=True,
+                                separators=(',', ':'), default=str)
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    def get(self, key, default=MISS):
+        """Returns a copy of the stored result or ``default`` if missing."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+
+        return copy.deepcopy(value)
+
+    def put(self, key, value):
+        """Stores a copy of the result, evicting the oldest entries."""
+
+        expires_at = None if self.ttl is None else self._clock() + self.ttl
+        value = copy.deepcopy(value)
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Removes all stored results."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
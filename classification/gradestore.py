@@ -0,0 +1,423 @@
+import contextvars
+import heapq
+import threading
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from classification.utils import make_dict_body
+from classification.payloadconverters import save_request_from_s2t, \
+    save_request_from_t2s
+
+
+class GradeStore:
+    """An in-memory copy of a course with indexes over its grades.
+
+    The store is populated from
+    :py:meth:`~.classification.Classification.find_student_group_classifications`
+    (and the definitions and groups of the course) and keeps the grades
+    indexed by student, by task, by group and, for numeric grades,
+    by value. Questions like "who is below the minimum of a mandatory
+    task" are answered from the indexes, without scanning every
+    ``classificationMap``.
+
+    Grades should be changed through the ``save_*`` methods of the store.
+    They send the request with the client and, once it succeeds,
+    update all the indexes. Calculated classifications are recomputed
+    by the portal, so their values for the students whose grades were
+    saved are downloaded again.
+
+    The object is thread-safe.
+
+    Attributes:
+        client: The :py:class:`~.classification.Classification` client
+            (or its proxy) used to load and save the grades.
+        course_code (str): The code of the course.
+        semester (str): Semester identifier.
+        definitions (Dict[str, dict]): Classification definitions
+            by their identifiers.
+
+    """
+
+    def __init__(self, client=None, course_code: str=None,
+                 semester: str=None):
+        self.client = client
+        self.course_code = course_code
+        self.semester = semester
+        self.definitions = dict()
+        self._by_student = dict()
+        self._by_task = dict()
+        self._groups = dict()
+        self._keys = dict()
+        self._entries = dict()
+        self._lock = threading.RLock()
+
+    def load(self, groups: bool=True, max_workers: int=4, **kwargs):
+        """Downloads the course and rebuilds all the indexes.
+
+        Args:
+            groups: Whether to download the members of every group
+                (one request per group). Defaults to True.
+            max_workers: The maximal number of concurrent requests.
+                Defaults to 4.
+            **kwargs: Anything that :py:func:`get` function
+                from `Requests
+                <http://docs.python-requests.org/en/master/>`__
+                library can take except for ``params``.
+
+        Returns:
+            The store itself.
+
+        Note:
+            On failure, this method raises standard `Requests errors
+            <http://docs.python-requests.org/en/master/
+            _modules/requests/exceptions/>`__.
+
+        """
+
+        client = self.client
+        course, semester = self.course_code, self.semester
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            def submit(fun, *args):
+                return executor.submit(contextvars.copy_context().run,
+                                       fun, *args, **kwargs)
+
+            definitions = submit(client.find_classifications_for_course,
+                                 course, semester)
+            course_groups = submit(client.get_course_groups,
+                                   course, semester)
+            records = submit(client.find_student_group_classifications,
+                             course, 'ALL', semester)
+
+            members = dict()
+            if groups:
+                members = {g['code']: submit(
+                    client.find_student_group_classifications,
+                    course, g['code'], semester)
+                    for g in course_groups.result() or list()}
+
+            with self._lock:
+                self.clear()
+                self.set_definitions(definitions.result() or list())
+                self.add_records(records.result() or list())
+                for code, future in members.items():
+                    self.add_group(code, (r['username'] for r
+                                          in future.result() or list()))
+
+        return self
+
+    def clear(self):
+        """Forgets everything stored."""
+
+        with self._lock:
+            self.definitions = dict()
+            self._by_student.clear()
+            self._by_task.clear()
+            self._groups.clear()
+            self._keys.clear()
+            self._entries.clear()
+
+    def set_definitions(self, definitions):
+        """Stores definitions of the course (as the portal returns them)."""
+
+        with self._lock:
+            self.definitions = {d['identifier']: d for d in definitions}
+
+    def add_records(self, records):
+        """Indexes records returned by ``find_student_group_classifications``.
+
+        Grades of students stored before are replaced. The value indexes
+        of every task are rebuilt at once (the new values are sorted
+        and merged with the stored ones), so loading a large course
+        takes O(n log n) rather than inserting the grades one by one.
+
+        """
+
+        # The last record of a student wins
+        latest = {record['username']: record for record in records}
+
+        with self._lock:
+            added = dict()  # identifier -> [(value, username)]
+            replaced = dict()  # identifier -> {username}
+
+            for username, record in latest.items():
+                for identifier, old in \
+                        self._by_student.get(username, {}).items():
+                    self._by_task[identifier].pop(username, None)
+                    if _is_number(old):
+                        replaced.setdefault(identifier, set()).add(username)
+
+                grades = dict(record.get('classificationMap') or {})
+                self._by_student[username] = grades
+                for identifier, value in grades.items():
+                    self._by_task.setdefault(identifier, dict())[username] = \
+                        value
+                    if _is_number(value):
+                        added.setdefault(identifier, list()) \
+                            .append((value, username))
+
+            for identifier in replaced.keys() | added.keys():
+                entries = self._entries.get(identifier, list())
+                gone = replaced.get(identifier)
+                if gone:
+                    entries = [e for e in entries if e[1] not in gone]
+                entries = list(heapq.merge(
+                    entries, sorted(added.get(identifier, ()))))
+                self._entries[identifier] = entries
+                self._keys[identifier] = [value for value, _ in entries]
+
+    def add_group(self, group_code, usernames):
+        """Stores the members of a group."""
+
+        with self._lock:
+            self._groups[group_code] = set(usernames)
+
+    # -----------------------------------------------
+    # ------------------- QUERIES -------------------
+    # -----------------------------------------------
+    def students(self):
+        """Returns usernames of all the stored students."""
+
+        with self._lock:
+            return list(self._by_student)
+
+    def student(self, username: str) -> dict:
+        """Returns grades of a student as ``{identifier: value}``."""
+
+        with self._lock:
+            return dict(self._by_student.get(username, ()))
+
+    def task(self, identifier: str) -> dict:
+        """Returns grades of a task as ``{username: value}``."""
+
+        with self._lock:
+            return dict(self._by_task.get(identifier, ()))
+
+    def group(self, group_code: str='ALL') -> dict:
+        """Returns grades of a group in the s2t format.
+
+        See :ref:`simplified_operations`.
+
+        """
+
+        with self._lock:
+            usernames = self._by_student if group_code == 'ALL' \
+                else self._groups.get(group_code, ())
+            return {u: dict(self._by_student.get(u, ())) for u in usernames}
+
+    def groups_of(self, username: str) -> list:
+        """Returns codes of the groups a student belongs to."""
+
+        with self._lock:
+            return sorted(code for code, members in self._groups.items()
+                          if username in members)
+
+    def range(self, identifier: str, minimum: float=None,
+              maximum: float=None, exclusive_maximum: bool=False) -> dict:
+        """Returns numeric grades of a task within the given bounds.
+
+        Args:
+            identifier: Classification identifier.
+            minimum: The lowest value included. ``None`` means
+                no lower bound.
+            maximum: The highest value. ``None`` means no upper bound.
+            exclusive_maximum: Whether ``maximum`` itself is excluded.
+
+        Returns:
+            The matching grades as ``{username: value}``
+            ordered by value.
+
+        """
+
+        with self._lock:
+            keys = self._keys.get(identifier, ())
+            entries = self._entries.get(identifier, ())
+            start = 0 if minimum is None else bisect_left(keys, minimum)
+            if maximum is None:
+                end = len(keys)
+            elif exclusive_maximum:
+                end = bisect_left(keys, maximum)
+            else:
+                end = bisect_right(keys, maximum)
+            return {username: value
+                    for value, username in entries[start:end]}
+
+    def below_minimum(self, mandatory_only: bool=True,
+                      include_missing: bool=False) -> dict:
+        """Finds students below ``minimumRequiredValue`` of some task.
+
+        Args:
+            mandatory_only: Whether only mandatory classifications
+                are checked. Defaults to True.
+            include_missing: Whether a student without any value
+                of the task counts as being below the minimum.
+                Defaults to False.
+
+        Returns:
+            A dictionary mapping usernames to sorted lists of identifiers
+            of the failed tasks.
+
+        """
+
+        result = dict()
+
+        with self._lock:
+            for identifier, definition in self.definitions.items():
+                minimum = definition.get('minimumRequiredValue')
+                if minimum is None or \
+                        (mandatory_only and not definition.get('mandatory')):
+                    continue
+
+                entries = self._entries.get(identifier, ())
+                end = bisect_left(self._keys.get(identifier, ()), minimum)
+                for _, username in entries[:end]:
+                    result.setdefault(username, list()).append(identifier)
+
+                if include_missing:
+                    graded = self._by_task.get(identifier, {})
+                    for username in self._by_student:
+                        if graded.get(username) is None:
+                            result.setdefault(username, list()) \
+                                .append(identifier)
+
+        for identifiers in result.values():
+            identifiers.sort()
+        return result
+
+    # -----------------------------------------------
+    # ------------------- UPDATES -------------------
+    # -----------------------------------------------
+    def save_student_classifications(self, student_classifications,
+                                     refresh_calculated: bool=True,
+                                     **kwargs):
+        """Saves grades with the client and updates the indexes.
+
+        Args:
+            student_classifications: A list of plain Python dictionaries
+                or of :py:class:`~.entities.StudentClassificationPreviewDto`.
+            refresh_calculated: Whether the values of calculated
+                classifications of the affected students are downloaded
+                again after the save (with one request for the whole
+                course). Defaults to True. Turn it off only if the store
+                is not asked about calculated classifications.
+            **kwargs: Passed to
+                :py:meth:`~.classification.Classification.save_student_classifications`
+                (and to the request downloading the calculated values).
+
+        Returns:
+            The response body.
+
+        Note:
+            On failure, this method raises standard `Requests errors
+            <http://docs.python-requests.org/en/master/
+            _modules/requests/exceptions/>`__. If the save fails,
+            the indexes are left untouched. If only downloading
+            the calculated values fails, they are removed from the store
+            for the affected students, so that no stale value is used.
+
+        """
+
+        student_classifications = list(student_classifications)
+        resp = self.client.save_student_classifications(
+            self.course_code, student_classifications, self.semester,
+            **kwargs)
+
+        usernames = set()
+        with self._lock:
+            for item in student_classifications:
+                body = make_dict_body(item)
+                usernames.add(body['studentUsername'])
+                self._set(body['studentUsername'],
+                          body['classificationIdentifier'],
+                          body.get('value'))
+
+        if refresh_calculated:
+            self._refresh_calculated(usernames, **kwargs)
+
+        return resp
+
+    def save_student_classifications_simple_s2t(self, student_to_tasks,
+                                                **kwargs):
+        """Like :py:meth:`save_student_classifications` with the s2t format.
+
+        See :ref:`simplified_operations`.
+
+        """
+
+        return self.save_student_classifications(
+            save_request_from_s2t(student_to_tasks), **kwargs)
+
+    def save_student_classifications_simple_t2s(self, task_to_students,
+                                                **kwargs):
+        """Like :py:meth:`save_student_classifications` with the t2s format.
+
+        See :ref:`simplified_operations`.
+
+        """
+
+        return self.save_student_classifications(
+            save_request_from_t2s(task_to_students), **kwargs)
+
+    # -----------------------------------------------
+    # -------------- HELPER FUNCTIONS ---------------
+    # -----------------------------------------------
+    def _refresh_calculated(self, usernames, **kwargs):
+        with self._lock:
+            calculated = [identifier for identifier, definition
+                          in self.definitions.items()
+                          if definition.get('calculated')]
+        if not calculated or not usernames:
+            return
+
+        try:
+            records = self.client.find_student_group_classifications(
+                self.course_code, 'ALL', self.semester, **kwargs) or list()
+        except Exception:
+            with self._lock:
+                for username in usernames:
+                    for identifier in calculated:
+                        self._set(username, identifier, None, remove=True)
+            raise
+
+        with self._lock:
+            for record in records:
+                username = record['username']
+                if username not in usernames:
+                    continue
+                grades = record.get('classificationMap') or {}
+                for identifier in calculated:
+                    if identifier in grades:
+                        self._set(username, identifier, grades[identifier])
+                    else:
+                        self._set(username, identifier, None, remove=True)
+
+    def _set(self, username, identifier, value, remove=False):
+        grades = self._by_student.setdefault(username, dict())
+        column = self._by_task.setdefault(identifier, dict())
+
+        if identifier in grades:
+            old = grades[identifier]
+            if _is_number(old):
+                keys = self._keys[identifier]
+                entries = self._entries[identifier]
+                index = bisect_left(entries, (old, username))
+                del keys[index]
+                del entries[index]
+
+        if remove:
+            grades.pop(identifier, None)
+            column.pop(username, None)
+            return
+
+        grades[identifier] = value
+        column[username] = value
+
+        if _is_number(value):
+            keys = self._keys.setdefault(identifier, list())
+            entries = self._entries.setdefault(identifier, list())
+            index = bisect_left(entries, (value, username))
+            keys.insert(index, value)
+            entries.insert(index, (value, username))
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
@@ -0,0 +1,273 @@
+import contextvars
+import csv
+import itertools
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from classification.entities import StudentClassificationPreviewDto
+from classification.exceptions import ColumnMappingError
+
+
+_TRUE = {'true', 'yes', 'y', '1', 'ano', 'a'}
+_FALSE = {'false', 'no', 'n', '0', 'ne'}
+
+
+class GradeImporter:
+    """Streams large grade sheets into the portal.
+
+    A sheet has one row per student: a column with the username and
+    columns with grades. The columns are mapped to classification
+    identifiers and validated against
+    :py:meth:`~.classification.Classification.find_classifications_for_course`
+    before anything is sent. Rows are then read lazily, converted
+    to :py:class:`~.entities.StudentClassificationPreviewDto` one by one
+    and saved with
+    :py:meth:`~.classification.Classification.save_student_classifications`
+    in chunks of ``chunk_size`` grades, ``max_workers`` chunks at a time.
+    Reading stops while all the workers are busy, so the whole sheet
+    is never held in memory.
+
+    Cells are converted according to the value type of their
+    classification. Numbers may use a decimal comma (as spreadsheets
+    in the Czech locale export them) and booleans may be written
+    as ``true``/``false``, ``yes``/``no`` or ``1``/``0``. Empty cells
+    are skipped.
+
+    Attributes:
+        client: The :py:class:`~.classification.Classification` client
+            (or its proxy) used to save the grades.
+        course_code (str): The code of the course.
+        semester (str): Semester identifier.
+        username_column (str): The column with usernames.
+        columns (Dict[str, str]): Maps columns of the sheet
+            to classification identifiers. ``None`` means that every
+            column (except the username one) is named after
+            its classification.
+        chunk_size (int): The number of grades saved in one request.
+        max_workers (int): The maximal number of concurrent requests.
+        progress (Callable[[dict], None]): If set, it is called with
+            the statistics (see :py:meth:`import_rows`) after every
+            saved chunk.
+
+    """
+
+    def __init__(self, client, course_code: str, semester: str=None,
+                 username_column: str='username', columns: dict=None,
+                 chunk_size: int=1000, max_workers: int=4, progress=None):
+        self.client = client
+        self.course_code = course_code
+        self.semester = semester
+        self.username_column = username_column
+        self.columns = columns
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.progress = progress
+
+    def import_csv(self, path: str, delimiter: str=',',
+                   encoding: str='utf-8-sig', **kwargs) -> dict:
+        """Imports a CSV file.
+
+        Args:
+            path: The path to the file.
+            delimiter: The delimiter of the cells, e.g. ``';'``
+                for CSV files exported from spreadsheets
+                in the Czech locale.
+            encoding: The encoding of the file. The default one
+                also skips the byte order mark written by spreadsheets.
+            **kwargs: Passed to :py:meth:`import_rows`.
+
+        Returns:
+            See :py:meth:`import_rows`.
+
+        """
+
+        with open(path, newline='', encoding=encoding) as f:
+            reader = csv.DictReader(f, delimiter=delimiter)
+            return self.import_rows(reader, reader.fieldnames, **kwargs)
+
+    def import_parquet(self, path: str, batch_size: int=10000,
+                       **kwargs) -> dict:
+        """Imports a Parquet file, reading it in row batches.
+
+        It needs `pyarrow <https://arrow.apache.org/docs/python/>`__,
+        which is not a dependency of this library.
+
+        Args:
+            path: The path to the file.
+            batch_size: The number of rows read at once.
+            **kwargs: Passed to :py:meth:`import_rows`.
+
+        Returns:
+            See :py:meth:`import_rows`.
+
+        """
+
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError('Importing Parquet files requires pyarrow, '
+                              'install it with "pip install pyarrow"') \
+                from None
+
+        sheet = pyarrow.parquet.ParquetFile(path)
+        rows = (row for batch in sheet.iter_batches(batch_size=batch_size)
+                for row in batch.to_pylist())
+        return self.import_rows(rows, sheet.schema_arrow.names, **kwargs)
+
+    def import_rows(self, rows, header, **kwargs) -> dict:
+        """Imports rows given as dictionaries.
+
+        Args:
+            rows: An iterable of dictionaries mapping columns to cells.
+            header: Names of all the columns.
+            **kwargs: Anything that :py:func:`get` and :py:func:`put`
+                functions from `Requests
+                <http://docs.python-requests.org/en/master/>`__
+                library can take except for ``params`` and ``json``.
+
+        Returns:
+            A dictionary with the numbers of read ``'rows'``,
+            saved ``'grades'`` and ``'chunks'``.
+
+        Raises:
+            ColumnMappingError: If a column cannot be mapped
+                or a cell cannot be converted. Chunks saved before
+                a bad cell was found stay saved.
+
+        Note:
+            On failure, this method raises standard `Requests errors
+            <http://docs.python-requests.org/en/master/
+            _modules/requests/exceptions/>`__.
+
+        """
+
+        mapping = self.validate(header, **kwargs)
+        stats = {'rows': 0, 'grades': 0, 'chunks': 0}
+        dtos = self._dtos(rows, mapping, stats)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = set()
+            try:
+                while True:
+                    chunk = list(itertools.islice(dtos, self.chunk_size))
+                    if not chunk:
+                        break
+                    if len(pending) >= self.max_workers:
+                        done, pending = wait(pending,
+                                             return_when=FIRST_COMPLETED)
+                        self._finish(done, stats)
+                    pending.add(executor.submit(
+                        contextvars.copy_context().run, self._save,
+                        chunk, **kwargs))
+            finally:
+                done, _ = wait(pending)
+            self._finish(done, stats)
+
+        return stats
+
+    def validate(self, header, **kwargs) -> dict:
+        """Maps columns of the sheet to classifications.
+
+        Args:
+            header: Names of all the columns.
+            **kwargs: Anything that :py:func:`get` function
+                from `Requests
+                <http://docs.python-requests.org/en/master/>`__
+                library can take except for ``params``.
+
+        Returns:
+            A dictionary mapping the columns to the definitions
+            of their classifications.
+
+        Raises:
+            ColumnMappingError: If a column cannot be mapped.
+
+        """
+
+        header = list(header or ())
+        definitions = {d['identifier']: d for d in
+                       self.client.find_classifications_for_course(
+                           self.course_code, self.semester, **kwargs)
+                       or list()}
+
+        if self.columns is None:
+            columns = {c: c for c in header if c != self.username_column}
+        else:
+            columns = dict(self.columns)
+
+        problems = list()
+        if self.username_column not in header:
+            problems.append(f'The username column "{self.username_column}" '
+                            f'is missing')
+
+        mapping = dict()
+        for column, identifier in columns.items():
+            definition = definitions.get(identifier)
+            if column not in header:
+                problems.append(f'The column "{column}" is missing')
+            elif definition is None:
+                problems.append(f'The column "{column}" does not match '
+                                f'any classification')
+            elif definition.get('calculated'):
+                problems.append(f'The column "{column}" matches '
+                                f'a calculated classification')
+            else:
+                mapping[column] = definition
+
+        if problems:
+            raise ColumnMappingError(problems)
+
+        return mapping
+
+    def _dtos(self, rows, mapping, stats):
+        for row in rows:
+            stats['rows'] += 1
+            username = row[self.username_column]
+            if not username:
+                continue
+            for column, definition in mapping.items():
+                cell = row.get(column)
+                if cell is None or cell == '':
+                    continue
+                try:
+                    value = _convert(cell, definition.get('valueType'))
+                except ValueError:
+                    raise ColumnMappingError([
+                        f'Row {stats["rows"]}, column "{column}": '
+                        f'{cell!r} is not a valid '
+                        f'{definition.get("valueType")} value']) from None
+                yield StudentClassificationPreviewDto(
+                    classification_identifier=definition['identifier'],
+                    student_username=username,
+                    value=value)
+
+    def _save(self, chunk, **kwargs):
+        self.client.save_student_classifications(
+            self.course_code, chunk, self.semester, **kwargs)
+        return len(chunk)
+
+    def _finish(self, futures, stats):
+        for future in futures:
+            stats['grades'] += future.result()
+            stats['chunks'] += 1
+            if self.progress is not None:
+                self.progress(dict(stats))
+
+
+def _convert(cell, value_type):
+    if value_type == 'NUMBER':
+        if isinstance(cell, bool):
+            raise ValueError(cell)
+        if isinstance(cell, (int, float)):
+            return cell
+        return float(cell.strip().replace(',', '.'))
+
+    if value_type == 'BOOLEAN':
+        if isinstance(cell, bool):
+            return cell
+        text = str(cell).strip().lower()
+        if text in _TRUE:
+            return True
+        if text in _FALSE:
+            return False
+        raise ValueError(cell)
+
+    return cell if isinstance(cell, str) else str(cell)
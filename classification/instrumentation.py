@@ -0,0 +1,277 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0)
+
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144,
+                1048576, 4194304, 16777216, 67108864)
+
+
+class Histogram:
+    """A cumulative histogram in the manner of Prometheus.
+
+    Attributes:
+        buckets (Tuple[float]): Upper bounds of the buckets
+            (the implicit ``+Inf`` bucket is not included).
+        count (int): The number of observed values.
+        sum (float): The sum of observed values.
+
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Adds a value to the histogram."""
+
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """Returns pairs of upper bounds and cumulative counts."""
+
+        result = list()
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),),
+                                self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def snapshot(self):
+        """Returns the histogram as a plain dictionary."""
+
+        return {'buckets': {_format_bound(b): c
+                            for b, c in self.cumulative()},
+                'count': self.count,
+                'sum': self.sum}
+
+
+class _NullMeasurement:
+    """A context manager doing nothing, used when metrics are off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_MEASUREMENT = _NullMeasurement()
+
+
+class Instrumentation:
+    """Collects metrics about API calls and lets you hook into them.
+
+    Once passed to :py:class:`~.classification.Classification`, it is
+    notified about every HTTP request (including retried attempts) and
+    records:
+
+    - a latency histogram and a response size histogram per endpoint
+      (i.e. per method of the client),
+    - the number of responses per endpoint and status code,
+    - counters of retries, token refreshes, cache hits and misses
+      and coalesced requests,
+    - time spent in processing stages: ``'serialize'`` (building request
+      bodies), ``'convert'`` (the simplified formats)
+      and ``'decode'`` (parsing JSON responses).
+
+    The metrics can be exported with :py:meth:`snapshot` as a plain
+    dictionary or with :py:meth:`to_prometheus` in the Prometheus
+    text format.
+
+    Hooks registered with :py:meth:`add_pre_request_hook` are called
+    as ``hook(endpoint, method, url, kwargs)`` right before a request
+    is sent, and hooks registered with :py:meth:`add_post_request_hook`
+    as ``hook(endpoint, method, url, response, duration, error)`` after
+    it finished (``response`` is ``None`` if it failed with ``error``).
+
+    The object is thread-safe.
+
+    Attributes:
+        namespace (str): The prefix of Prometheus metric names.
+
+    """
+
+    def __init__(self, namespace: str='classification',
+                 latency_buckets=LATENCY_BUCKETS,
+                 size_buckets=SIZE_BUCKETS):
+        self.namespace = namespace
+        self._latency_buckets = latency_buckets
+        self._size_buckets = size_buckets
+        self._pre_hooks = list()
+        self._post_hooks = list()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forgets all the collected metrics (but not the hooks)."""
+
+        with self._lock:
+            self._latencies = dict()
+            self._sizes = dict()
+            self._responses = dict()
+            self._counters = dict()
+            self._stages = dict()
+
+    def add_pre_request_hook(self, hook):
+        """Registers a function called before every HTTP request."""
+
+        self._pre_hooks.append(hook)
+
+    def add_post_request_hook(self, hook):
+        """Registers a function called after every HTTP request."""
+
+        self._post_hooks.append(hook)
+
+    def request_started(self, endpoint, method, url, kwargs):
+        """Called by the client before it sends a request."""
+
+        for hook in self._pre_hooks:
+            hook(endpoint, method, url, kwargs)
+
+    def request_finished(self, endpoint, method, url, response,
+                         duration, error=None):
+        """Called by the client once a request finished."""
+
+        status = 'error' if response is None else str(response.status_code)
+
+        with self._lock:
+            self._histogram(self._latencies, endpoint,
+                            self._latency_buckets).observe(duration)
+            if response is not None:
+                self._histogram(self._sizes, endpoint, self._size_buckets) \
+                    .observe(_response_size(response))
+            key = (endpoint, status)
+            self._responses[key] = self._responses.get(key, 0) + 1
+
+        for hook in self._post_hooks:
+            hook(endpoint, method, url, response, duration, error)
+
+    def increment(self, counter: str, endpoint: str='', amount: int=1):
+        """Increments a counter, for example ``'retries'``."""
+
+        with self._lock:
+            key = (counter, endpoint)
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    @contextmanager
+    def measure(self, stage: str):
+        """Measures the time spent in the ``with`` block."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self._histogram(self._stages, stage,
+                                self._latency_buckets).observe(duration)
+
+    def snapshot(self):
+        """Returns all the metrics as a plain dictionary.
+
+        Returns:
+            A dictionary with keys ``'endpoints'`` (latency and size
+            histograms and response counts by status per endpoint),
+            ``'counters'`` (per counter and endpoint; an empty string
+            stands for counters without endpoint) and ``'stages'``
+            (duration histograms per stage).
+
+        """
+
+        with self._lock:
+            endpoints = dict()
+            for endpoint, histogram in self._latencies.items():
+                endpoints[endpoint] = {'latency': histogram.snapshot(),
+                                       'size': None,
+                                       'responses': dict()}
+            for endpoint, histogram in self._sizes.items():
+                endpoints[endpoint]['size'] = histogram.snapshot()
+            for (endpoint, status), count in self._responses.items():
+                endpoints[endpoint]['responses'][status] = count
+
+            counters = dict()
+            for (counter, endpoint), value in self._counters.items():
+                counters.setdefault(counter, dict())[endpoint] = value
+
+            stages = {stage: histogram.snapshot()
+                      for stage, histogram in self._stages.items()}
+
+        return {'endpoints': endpoints,
+                'counters': counters,
+                'stages': stages}
+
+    def to_prometheus(self):
+        """Returns all the metrics in the Prometheus text format."""
+
+        ns = self.namespace
+        lines = list()
+
+        with self._lock:
+            _histogram_lines(lines, f'{ns}_request_duration_seconds',
+                             'Duration of HTTP requests.',
+                             'endpoint', self._latencies)
+            _histogram_lines(lines, f'{ns}_response_size_bytes',
+                             'Size of HTTP response bodies.',
+                             'endpoint', self._sizes)
+
+            lines.append(f'# HELP {ns}_responses_total '
+                         f'Finished HTTP requests by status.')
+            lines.append(f'# TYPE {ns}_responses_total counter')
+            for (endpoint, status), count in sorted(self._responses.items()):
+                lines.append(f'{ns}_responses_total{{endpoint="{endpoint}",'
+                             f'status="{status}"}} {count}')
+
+            for counter in sorted({c for c, _ in self._counters}):
+                name = f'{ns}_{counter}_total'
+                lines.append(f'# HELP {name} Number of {counter}.')
+                lines.append(f'# TYPE {name} counter')
+                for (c, endpoint), value in sorted(self._counters.items()):
+                    if c != counter:
+                        continue
+                    labels = f'{{endpoint="{endpoint}"}}' if endpoint else ''
+                    lines.append(f'{name}{labels} {value}')
+
+            _histogram_lines(lines, f'{ns}_stage_duration_seconds',
+                             'Time spent in processing stages.',
+                             'stage', self._stages)
+
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _histogram(histograms, key, buckets):
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(buckets)
+        return histogram
+
+
+def _response_size(response):
+    length = response.headers.get('Content-Length')
+    if length is not None and length.isdigit():
+        return int(length)
+    return len(response.content or b'')
+
+
+def _format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+def _histogram_lines(lines, name, help, label, histograms):
+    lines.append(f'# HELP {name} {help}')
+    lines.append(f'# TYPE {name} histogram')
+    for key, histogram in sorted(histograms.items()):
+        for bound, count in histogram.cumulative():
+            lines.append(f'{name}_bucket{{{label}="{key}",'
+                         f'le="{_format_bound(bound)}"}} {count}')
+        lines.append(f'{name}_sum{{{label}="{key}"}} {histogram.sum}')
+        lines.append(f'{name}_count{{{label}="{key}"}} {histogram.count}')
@@ -0,0 +1,234 @@
+import json
+import os
+import threading
+import uuid
+from classification.payloadconverters import save_request_from_s2t, \
+    save_request_from_t2s
+from classification.utils import make_dict_body
+
+
+class GradeJournal:
+    """An append-only log making bulk uploads of grades resumable.
+
+    Every chunk of grades is written to the journal (a JSON Lines file)
+    before it is sent, and marked as committed once the portal has
+    saved it. If the upload is interrupted (the program crashes,
+    the network goes down...), :py:meth:`replay` sends again only
+    the chunks that were not committed::
+
+        journal = GradeJournal('uploads.jsonl')
+        journal.replay(client)  # finish what the last run did not
+        journal.save_s2t(client, 'MI-PYT', grades)
+
+    Saving grades is idempotent, so sending a chunk that was saved
+    but not committed (the program stopped right after the request)
+    does no harm. Chunks are sent one after another and replayed
+    in the same order, so a later value of a grade always wins.
+
+    The journal only grows; call :py:meth:`compact` to drop
+    the committed chunks.
+
+    Attributes:
+        path (str): The path to the journal file.
+        chunk_size (int): The number of grades sent in one request.
+        fsync (bool): Whether every record is flushed to the disk
+            before going on. Turning it off is faster, but records
+            written just before a power failure can be lost.
+
+    """
+
+    def __init__(self, path: str, chunk_size: int=1000, fsync: bool=True):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._file = None
+
+    def save(self, client, course_code: str, student_classifications,
+             semester: str=None, **kwargs) -> dict:
+        """Saves grades through the journal.
+
+        Args:
+            client: The :py:class:`~.classification.Classification`
+                client (or its proxy).
+            course_code: The code of the course.
+            student_classifications: A list of plain Python dictionaries
+                or of :py:class:`~.entities.StudentClassificationPreviewDto`.
+            semester: Semester identifier.
+            **kwargs: Anything that :py:func:`put` function
+                from `Requests
+                <http://docs.python-requests.org/en/master/>`__
+                library can take except for ``params`` and ``json``.
+
+        Returns:
+            A dictionary with the numbers of sent ``'chunks'``
+            and ``'grades'``.
+
+        Note:
+            On failure, this method raises standard `Requests errors
+            <http://docs.python-requests.org/en/master/
+            _modules/requests/exceptions/>`__. The chunk that failed
+            and the following ones stay in the journal
+            for :py:meth:`replay`.
+
+        """
+
+        body = [make_dict_body(s) for s in student_classifications]
+        chunks = [body[i:i + self.chunk_size]
+                  for i in range(0, len(body), self.chunk_size)]
+
+        # All the chunks are recorded first, so that a crash in the middle
+        # leaves the rest of the upload in the journal as well
+        records = [self._append({'op': 'write', 'id': uuid.uuid4().hex,
+                                 'course_code': course_code,
+                                 'semester': semester, 'body': chunk})
+                   for chunk in chunks]
+
+        for record in records:
+            self._send(client, record, **kwargs)
+
+        return {'chunks': len(records), 'grades': len(body)}
+
+    def save_s2t(self, client, course_code: str, student_to_tasks,
+                 semester: str=None, **kwargs) -> dict:
+        """Saves grades in the s2t format through the journal.
+
+        See :py:meth:`save`.
+
+        """
+
+        return self.save(client, course_code,
+                         save_request_from_s2t(student_to_tasks,
+                                               as_dicts=True),
+                         semester, **kwargs)
+
+    def save_t2s(self, client, course_code: str, task_to_students,
+                 semester: str=None, **kwargs) -> dict:
+        """Saves grades in the t2s format through the journal.
+
+        See :py:meth:`save`.
+
+        """
+
+        return self.save(client, course_code,
+                         save_request_from_t2s(task_to_students,
+                                               as_dicts=True),
+                         semester, **kwargs)
+
+    def pending(self) -> list:
+        """Returns the chunks that have not been committed.
+
+        Returns:
+            A list of dictionaries with keys ``'id'``, ``'course_code'``,
+            ``'semester'`` and ``'body'`` in the order they were written.
+
+        """
+
+        writes = dict()
+        if not os.path.exists(self.path):
+            return list()
+
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # The last record of a crashed run can be incomplete,
+                    # its chunk has not been sent then
+                    continue
+                if record['op'] == 'write':
+                    writes[record['id']] = record
+                elif record['op'] == 'commit':
+                    writes.pop(record['id'], None)
+
+        return [{k: v for k, v in r.items() if k != 'op'}
+                for r in writes.values()]
+
+    def replay(self, client, **kwargs) -> dict:
+        """Sends the chunks that have not been committed.
+
+        Args:
+            client: The :py:class:`~.classification.Classification`
+                client (or its proxy).
+            **kwargs: See :py:meth:`save`.
+
+        Returns:
+            A dictionary with the numbers of sent ``'chunks'``
+            and ``'grades'``.
+
+        Note:
+            On failure, this method raises standard `Requests errors
+            <http://docs.python-requests.org/en/master/
+            _modules/requests/exceptions/>`__.
+
+        """
+
+        stats = {'chunks': 0, 'grades': 0}
+        for record in self.pending():
+            self._send(client, record, **kwargs)
+            stats['chunks'] += 1
+            stats['grades'] += len(record['body'])
+        return stats
+
+    def compact(self) -> None:
+        """Rewrites the journal keeping only the uncommitted chunks."""
+
+        with self._lock:
+            self._close_file()
+            pending = self.pending()
+            temporary = f'{self.path}.tmp'
+            with open(temporary, 'w', encoding='utf-8') as f:
+                for record in pending:
+                    f.write(_line(dict(record, op='write')))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, self.path)
+
+    def close(self) -> None:
+        """Closes the journal file."""
+
+        with self._lock:
+            self._close_file()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _send(self, client, record, **kwargs):
+        client.save_student_classifications(
+            record['course_code'], record['body'], record['semester'],
+            **kwargs)
+        self._append({'op': 'commit', 'id': record['id']})
+
+    def _append(self, record):
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+                if not _ends_with_newline(self.path):
+                    # Do not append to an incomplete record of a crashed run
+                    self._file.write('\n')
+            self._file.write(_line(record))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        return record
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _line(record):
+    return json.dumps(record, separators=(',', ':')) + '\n'
+
+
+def _ends_with_newline(path):
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
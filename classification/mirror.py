@@ -0,0 +1,476 @@
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS definitions ('
+    'course TEXT NOT NULL, semester TEXT NOT NULL, '
+    'identifier TEXT NOT NULL, value_type TEXT, '
+    'calculated INTEGER, mandatory INTEGER, hidden INTEGER, '
+    'minimum REAL, maximum REAL, position INTEGER, body TEXT NOT NULL, '
+    'PRIMARY KEY (course, semester, identifier))',
+
+    'CREATE TABLE IF NOT EXISTS groups ('
+    'course TEXT NOT NULL, semester TEXT NOT NULL, '
+    'code TEXT NOT NULL, name TEXT, '
+    'PRIMARY KEY (course, semester, code))',
+
+    'CREATE TABLE IF NOT EXISTS group_members ('
+    'course TEXT NOT NULL, semester TEXT NOT NULL, '
+    'group_code TEXT NOT NULL, username TEXT NOT NULL, '
+    'PRIMARY KEY (course, semester, group_code, username))',
+
+    'CREATE TABLE IF NOT EXISTS students ('
+    'course TEXT NOT NULL, semester TEXT NOT NULL, '
+    'username TEXT NOT NULL, first_name TEXT, last_name TEXT, '
+    'email TEXT, PRIMARY KEY (course, semester, username))',
+
+    'CREATE TABLE IF NOT EXISTS grades ('
+    'course TEXT NOT NULL, semester TEXT NOT NULL, '
+    'username TEXT NOT NULL, identifier TEXT NOT NULL, '
+    'value TEXT, number REAL, '
+    'PRIMARY KEY (course, semester, username, identifier))',
+
+    'CREATE INDEX IF NOT EXISTS grades_by_task '
+    'ON grades (course, semester, identifier, number)',
+
+    'CREATE INDEX IF NOT EXISTS members_by_student '
+    'ON group_members (course, semester, username)',
+
+    'CREATE TABLE IF NOT EXISTS syncs ('
+    'course TEXT NOT NULL, semester TEXT NOT NULL, '
+    'scope TEXT NOT NULL, fingerprint TEXT NOT NULL, '
+    'synced REAL NOT NULL, '
+    'PRIMARY KEY (course, semester, scope))',
+)
+
+
+class GradeMirror:
+    """A local SQLite copy of courses, kept in sync with the portal.
+
+    The mirror stores classification definitions
+    (:py:meth:`~.classification.Classification.find_classifications_for_course`),
+    course groups
+    (:py:meth:`~.classification.Classification.get_course_groups`),
+    their members and the grades of all students
+    (:py:meth:`~.classification.Classification.find_student_group_classifications`).
+    Reports can then query the indexed local copy instead of asking
+    the portal again and again.
+
+    Synchronization is incremental: every downloaded part of a course
+    (definitions, groups, members of each group and grades) is
+    fingerprinted and written only when it changed since the last sync,
+    and only the grades that differ are inserted, updated or deleted.
+    With ``max_age``, courses synced recently enough are not downloaded
+    at all.
+
+    Courses are distinguished by their code and semester; ``None``
+    semester (the current one) is stored as an empty string.
+
+    The mirror can be used from several threads (each of them gets its own
+    connection) and several processes can share one database file.
+
+    Attributes:
+        client: The :py:class:`~.classification.Classification` client
+            (or its proxy) used to download the data.
+        path (str): The path to the database file.
+
+    """
+
+    def __init__(self, client, path: str, clock=None):
+        """Opens (and creates, if needed) a mirror database.
+
+        Args:
+            client: The client used to download the data.
+            path: The path to the database file.
+            clock: A function returning the current UNIX time,
+                used to decide whether a course is fresh enough.
+                Defaults to :py:func:`time.time`.
+
+        """
+
+        self.client = client
+        self.path = path
+        self._clock = clock or time.time
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._transaction() as db:
+            for statement in _SCHEMA:
+                db.execute(statement)
+
+    # -----------------------------------------------
+    # ------------------- SYNCING -------------------
+    # -----------------------------------------------
+    def sync(self, course_code: str, semester: str=None,
+             groups: bool=True, max_age: float=None,
+             max_workers: int=4, **kwargs) -> dict:
+        """Downloads a course and applies the changes to the mirror.
+
+        Args:
+            course_code: The code of the course.
+            semester: Semester identifier.
+            groups: Whether to download the members of every group
+                as well (one request per group). Defaults to True.
+            max_age: If the course was synced less than ``max_age``
+                seconds ago, nothing is downloaded. ``None`` means
+                the course is always downloaded.
+            max_workers: The maximal number of concurrent requests.
+                Defaults to 4.
+            **kwargs: Anything that :py:func:`get` function
+                from `Requests
+                <http://docs.python-requests.org/en/master/>`__
+                library can take except for ``params``.
+
+        Returns:
+            A dictionary with the number of ``'inserted'``, ``'updated'``
+            and ``'deleted'`` grades, the list of ``'changed'`` parts
+            of the course and whether it was ``'skipped'`` as fresh.
+
+        Note:
+            On failure, this method raises standard `Requests errors
+            <http://docs.python-requests.org/en/master/
+            _modules/requests/exceptions/>`__. Nothing is written
+            in that case.
+
+        """
+
+        stats = {'skipped': False, 'changed': list(),
+                 'inserted': 0, 'updated': 0, 'deleted': 0}
+
+        if max_age is not None:
+            synced = self.synced_at(course_code, semester)
+            if synced is not None and self._clock() - synced < max_age:
+                stats['skipped'] = True
+                return stats
+
+        client = self.client
+        fetched = dict()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            def submit(fun, *args):
+                return executor.submit(contextvars.copy_context().run,
+                                       fun, *args, **kwargs)
+
+            definitions = submit(client.find_classifications_for_course,
+                                 course_code, semester)
+            course_groups = submit(client.get_course_groups,
+                                   course_code, semester)
+            students = submit(client.find_student_group_classifications,
+                              course_code, 'ALL', semester)
+
+            fetched['definitions'] = definitions.result() or list()
+            fetched['groups'] = course_groups.result() or list()
+
+            members = dict()
+            if groups:
+                members = {g['code']: submit(
+                    client.find_student_group_classifications,
+                    course_code, g['code'], semester)
+                    for g in fetched['groups']}
+
+            fetched['grades'] = students.result() or list()
+            for code, future in members.items():
+                fetched[f'group:{code}'] = sorted(
+                    r['username'] for r in future.result() or list())
+
+        semester = semester or ''
+        now = self._clock()
+
+        with self._transaction() as db:
+            for scope, data in fetched.items():
+                fingerprint = _fingerprint(data)
+                row = db.execute('SELECT fingerprint FROM syncs '
+                                 'WHERE course = ? AND semester = ? '
+                                 'AND scope = ?',
+                                 (course_code, semester, scope)).fetchone()
+                if row is None or row[0] != fingerprint:
+                    stats['changed'].append(scope)
+                    self._apply(db, course_code, semester, scope, data,
+                                stats)
+                db.execute('INSERT OR REPLACE INTO syncs VALUES '
+                           '(?, ?, ?, ?, ?)',
+                           (course_code, semester, scope, fingerprint, now))
+
+            if groups:
+                # Members of groups that no longer exist
+                stale = [s for s, in db.execute(
+                    'SELECT scope FROM syncs WHERE course = ? '
+                    'AND semester = ? AND scope LIKE \'group:%\'',
+                    (course_code, semester)) if s not in fetched]
+                for scope in stale:
+                    stats['changed'].append(scope)
+                    self._apply(db, course_code, semester, scope, list(),
+                                stats)
+                    db.execute('DELETE FROM syncs WHERE course = ? '
+                               'AND semester = ? AND scope = ?',
+                               (course_code, semester, scope))
+
+        return stats
+
+    def sync_many(self, course_codes, semester: str=None,
+                  max_workers: int=4, **kwargs) -> dict:
+        """Syncs several courses in parallel.
+
+        Args:
+            course_codes: Codes of the courses.
+            semester: Semester identifier.
+            max_workers: The maximal number of courses synced
+                at the same time. Defaults to 4.
+            **kwargs: Passed to :py:meth:`sync`.
+
+        Returns:
+            A dictionary mapping course codes to the results
+            of :py:meth:`sync`.
+
+        """
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {code: executor.submit(
+                contextvars.copy_context().run, self.sync,
+                code, semester, **kwargs) for code in course_codes}
+            return {code: future.result()
+                    for code, future in futures.items()}
+
+    def synced_at(self, course_code: str, semester: str=None):
+        """Returns the UNIX time of the last sync or ``None``."""
+
+        row = self._connection().execute(
+            'SELECT synced FROM syncs WHERE course = ? '
+            'AND semester = ? AND scope = \'grades\'',
+            (course_code, semester or '')).fetchone()
+        return None if row is None else row[0]
+
+    # -----------------------------------------------
+    # ------------------- QUERIES -------------------
+    # -----------------------------------------------
+    def definitions(self, course_code: str, semester: str=None) -> list:
+        """Returns the stored definitions in the order of the portal."""
+
+        return [json.loads(body) for body, in self._connection().execute(
+            'SELECT body FROM definitions WHERE course = ? '
+            'AND semester = ? ORDER BY position',
+            (course_code, semester or ''))]
+
+    def groups(self, course_code: str, semester: str=None) -> list:
+        """Returns the stored groups as ``{'code', 'name'}`` dicts."""
+
+        return [{'code': code, 'name': name}
+                for code, name in self._connection().execute(
+                    'SELECT code, name FROM groups WHERE course = ? '
+                    'AND semester = ? ORDER BY code',
+                    (course_code, semester or ''))]
+
+    def student(self, course_code: str, username: str,
+                semester: str=None) -> dict:
+        """Returns grades of a student as ``{identifier: value}``."""
+
+        return {identifier: json.loads(value)
+                for identifier, value in self._connection().execute(
+                    'SELECT identifier, value FROM grades WHERE course = ? '
+                    'AND semester = ? AND username = ?',
+                    (course_code, semester or '', username))}
+
+    def task(self, course_code: str, identifier: str,
+             semester: str=None) -> dict:
+        """Returns grades of a task as ``{username: value}``."""
+
+        return {username: json.loads(value)
+                for username, value in self._connection().execute(
+                    'SELECT username, value FROM grades WHERE course = ? '
+                    'AND semester = ? AND identifier = ?',
+                    (course_code, semester or '', identifier))}
+
+    def group(self, course_code: str, group_code: str='ALL',
+              semester: str=None) -> dict:
+        """Returns grades of a group in the s2t format.
+
+        See :ref:`simplified_operations`. Students without any grade
+        are included with an empty dictionary.
+
+        """
+
+        return self.s2t(course_code, semester, group_code=group_code)
+
+    def s2t(self, course_code: str, semester: str=None,
+            group_code: str='ALL', identifier: str=None,
+            minimum: float=None, maximum: float=None) -> dict:
+        """Returns the grades matching all the given filters.
+
+        Args:
+            course_code: The code of the course.
+            semester: Semester identifier.
+            group_code: Only students of this group are included.
+            identifier: Only grades of this classification are included.
+            minimum: Only numeric grades at least this high
+                are included.
+            maximum: Only numeric grades at most this high are included.
+
+        Returns:
+            The matching grades in the s2t format.
+
+        """
+
+        query = ('SELECT g.username, g.identifier, g.value FROM grades g '
+                 'WHERE g.course = ? AND g.semester = ?')
+        args = [course_code, semester or '']
+
+        if group_code != 'ALL':
+            query += (' AND g.username IN (SELECT username '
+                      'FROM group_members WHERE course = g.course '
+                      'AND semester = g.semester AND group_code = ?)')
+            args.append(group_code)
+        if identifier is not None:
+            query += ' AND g.identifier = ?'
+            args.append(identifier)
+        if minimum is not None:
+            query += ' AND g.number >= ?'
+            args.append(minimum)
+        if maximum is not None:
+            query += ' AND g.number <= ?'
+            args.append(maximum)
+
+        db = self._connection()
+        result = dict()
+
+        if identifier is None and minimum is None and maximum is None:
+            # Include students without grades, as the portal does
+            for username, in self._usernames(db, course_code,
+                                             semester or '', group_code):
+                result[username] = dict()
+
+        for username, task, value in db.execute(query, args):
+            result.setdefault(username, dict())[task] = json.loads(value)
+
+        return result
+
+    def close(self) -> None:
+        """Closes the connection of the calling thread."""
+
+        db = getattr(self._local, 'db', None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    # -----------------------------------------------
+    # -------------- HELPER FUNCTIONS ---------------
+    # -----------------------------------------------
+    def _connection(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30,
+                                 isolation_level=None)
+            self._local.db = db
+        return db
+
+    @contextmanager
+    def _transaction(self):
+        db = self._connection()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            yield db
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        db.execute('COMMIT')
+
+    @staticmethod
+    def _usernames(db, course, semester, group_code):
+        if group_code == 'ALL':
+            return db.execute('SELECT username FROM students '
+                              'WHERE course = ? AND semester = ?',
+                              (course, semester))
+        return db.execute('SELECT username FROM group_members '
+                          'WHERE course = ? AND semester = ? '
+                          'AND group_code = ?', (course, semester, group_code))
+
+    def _apply(self, db, course, semester, scope, data, stats):
+        key = (course, semester)
+
+        if scope == 'definitions':
+            db.execute('DELETE FROM definitions WHERE course = ? '
+                       'AND semester = ?', key)
+            db.executemany(
+                'INSERT INTO definitions VALUES '
+                '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [key + (d['identifier'], d.get('valueType'),
+                        d.get('calculated'), d.get('mandatory'),
+                        d.get('hidden'), d.get('minimumRequiredValue'),
+                        d.get('maximumValue'), position,
+                        json.dumps(d))
+                 for position, d in enumerate(data)])
+
+        elif scope == 'groups':
+            db.execute('DELETE FROM groups WHERE course = ? '
+                       'AND semester = ?', key)
+            db.executemany('INSERT INTO groups VALUES (?, ?, ?, ?)',
+                           [key + (g['code'], g.get('name')) for g in data])
+
+        elif scope.startswith('group:'):
+            code = scope[len('group:'):]
+            db.execute('DELETE FROM group_members WHERE course = ? '
+                       'AND semester = ? AND group_code = ?', key + (code,))
+            db.executemany('INSERT INTO group_members VALUES (?, ?, ?, ?)',
+                           [key + (code, u) for u in data])
+
+        else:
+            self._apply_grades(db, key, data, stats)
+
+    @staticmethod
+    def _apply_grades(db, key, records, stats):
+        stored = {(u, i): v for u, i, v in db.execute(
+            'SELECT username, identifier, value FROM grades '
+            'WHERE course = ? AND semester = ?', key)}
+
+        upserts = list()
+        seen = set()
+        for record in records:
+            username = record['username']
+            for identifier, value in \
+                    (record.get('classificationMap') or {}).items():
+                cell = (username, identifier)
+                seen.add(cell)
+                encoded = json.dumps(value)
+                old = stored.get(cell)
+                if old == encoded:
+                    continue
+                stats['inserted' if old is None else 'updated'] += 1
+                upserts.append(key + cell + (encoded, _number(value)))
+
+        deleted = [key + cell for cell in stored if cell not in seen]
+        stats['deleted'] += len(deleted)
+
+        db.executemany('INSERT OR REPLACE INTO grades VALUES '
+                       '(?, ?, ?, ?, ?, ?)', upserts)
+        db.executemany('DELETE FROM grades WHERE course = ? '
+                       'AND semester = ? AND username = ? '
+                       'AND identifier = ?', deleted)
+
+        db.execute('DELETE FROM students WHERE course = ? '
+                   'AND semester = ?', key)
+        db.executemany('INSERT OR REPLACE INTO students '
+                       'VALUES (?, ?, ?, ?, ?, ?)',
+                       [key + (r['username'], r.get('firstName'),
+                               r.get('lastName'), r.get('email'))
+                        for r in records])
+
+
+def _fingerprint(data):
+    encoded = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def _number(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return None
@@ -0,0 +1,354 @@
+import contextvars
+import inspect
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+from requests import Session
+from requests.exceptions import ConnectionError, HTTPError, Timeout
+from classification.endpoints import ENDPOINTS
+from classification.exceptions import CircuitOpenError
+from classification.retrying import RetryPolicy
+
+
+# Options of Requests the client methods pass on through **kwargs
+# (params and json are built by the methods themselves)
+_REQUEST_OPTIONS = frozenset(inspect.signature(Session.request).parameters) \
+    - {'self', 'method', 'url', 'params', 'json'}
+
+# HTTP methods of the composite client methods (the least safe one
+# for a method sending requests of several kinds)
+_COMPOSITE_VERBS = {
+    'validate_course_expressions': 'POST',
+    'find_student_group_classifications_simple_s2t': 'GET',
+    'find_student_group_classifications_simple_t2s': 'GET',
+    'save_student_classifications_simple_s2t': 'PUT',
+    'save_student_classifications_simple_t2s': 'PUT',
+}
+
+
+@dataclass
+class Step:
+    """One call of a client method in a :py:class:`Plan`.
+
+    Attributes:
+        name (str): A unique name of the step, e.g. ``'clone:MI-PYT'``.
+        method (str): The name of the method of
+            :py:class:`~.classification.Classification` to call.
+        args (tuple): Positional arguments of the method.
+        kwargs (dict): Keyword arguments of the method.
+        requires (Tuple[str]): Names of the steps that have to finish
+            successfully before this one starts.
+
+    """
+
+    name: str
+    method: str
+    args: tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    requires: Tuple[str, ...] = ()
+
+
+class Plan:
+    """A declarative description of a job over many courses.
+
+    Steps can be added one by one with :py:meth:`add`, loaded from
+    plain data (e.g. a JSON file) with :py:meth:`from_dict` or repeated
+    for many courses with :py:meth:`for_courses`.
+
+    Attributes:
+        steps (Dict[str, Step]): The steps by their names.
+
+    """
+
+    def __init__(self, steps=()):
+        self.steps = dict()
+        for step in steps:
+            self._add_step(step)
+
+    def add(self, name: str, method: str, *args,
+            requires=(), **kwargs) -> Step:
+        """Adds a step calling ``method(*args, **kwargs)``."""
+
+        return self._add_step(Step(name, method, args, kwargs,
+                                   tuple(requires)))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Plan':
+        """Creates a plan from plain data.
+
+        Args:
+            data: A dictionary with the key ``'steps'``, a list
+                of dictionaries with keys ``'name'``, ``'method'``
+                and optionally ``'args'``, ``'kwargs'`` and
+                ``'requires'``.
+
+        """
+
+        return cls(Step(s['name'], s['method'], tuple(s.get('args', ())),
+                        dict(s.get('kwargs', {})),
+                        tuple(s.get('requires', ())))
+                   for s in data['steps'])
+
+    @classmethod
+    def for_courses(cls, course_codes, template) -> 'Plan':
+        """Repeats a template of steps for every course.
+
+        Every string in the template (names, arguments and requirements)
+        is formatted with ``course`` set to the course code, so that
+        the steps of each course depend on each other only::
+
+            Plan.for_courses(['MI-PYT', 'BI-PYT'], [
+                {'name': 'clone:{course}',
+                 'method': 'clone_classification_definitions',
+                 'args': ['B192', '{course}', 'B191', '{course}', False]},
+                {'name': 'editor:{course}', 'method': 'add_editor',
+                 'args': ['{course}', 'novakjan'],
+                 'requires': ['clone:{course}']},
+            ])
+
+        Args:
+            course_codes: Codes of the courses.
+            template: A list of step dictionaries
+                (see :py:meth:`from_dict`).
+
+        """
+
+        return cls.from_dict({'steps': [
+            _format(step, course) for course in course_codes
+            for step in template]})
+
+    def order(self) -> List[Step]:
+        """Returns the steps sorted so that requirements come first.
+
+        Raises:
+            ValueError: If a step requires an unknown step
+                or the requirements form a cycle.
+
+        """
+
+        for step in self.steps.values():
+            for requirement in step.requires:
+                if requirement not in self.steps:
+                    raise ValueError(f'Step "{step.name}" requires unknown '
+                                     f'step "{requirement}"')
+
+        result = list()
+        state = dict()
+
+        def visit(step, path):
+            if state.get(step.name) == 'done':
+                return
+            if state.get(step.name) == 'visiting':
+                cycle = ' -> '.join(path + [step.name])
+                raise ValueError(f'Steps form a cycle: {cycle}')
+            state[step.name] = 'visiting'
+            for requirement in step.requires:
+                visit(self.steps[requirement], path + [step.name])
+            state[step.name] = 'done'
+            result.append(step)
+
+        for step in self.steps.values():
+            visit(step, [])
+
+        return result
+
+    def _add_step(self, step):
+        if step.name in self.steps:
+            raise ValueError(f'Duplicate step "{step.name}"')
+        self.steps[step.name] = step
+        return step
+
+
+@dataclass
+class RunResult:
+    """The outcome of :py:meth:`Orchestrator.run`.
+
+    Attributes:
+        done (Dict[str, Any]): Results of the successful steps
+            (including the ones finished by a previous run).
+        failed (Dict[str, BaseException]): Errors of the failed steps.
+        skipped (List[str]): Steps not run because a step they require
+            failed.
+
+    """
+
+    done: Dict[str, Any] = field(default_factory=dict)
+    failed: Dict[str, BaseException] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Whether all the steps succeeded."""
+
+        return not self.failed and not self.skipped
+
+
+class Orchestrator:
+    """Runs a :py:class:`Plan` with bounded parallelism.
+
+    Steps run as soon as all the steps they require have finished,
+    at most ``max_workers`` of them at a time. A failed step is retried
+    according to ``retry_policy`` if it failed with a connection error,
+    a timeout, an open circuit or an HTTP status the policy considers
+    transient. Steps sending POST requests (which are not idempotent)
+    are retried only if the policy allows it (``retry_post``), except
+    after an open circuit, when nothing has been sent. If it still fails, the steps that require it are skipped
+    and the rest of the plan goes on.
+
+    With ``checkpoint``, every finished step is recorded in a JSON file.
+    When the run is interrupted and started again with the same file,
+    the finished steps are not run again.
+
+    Attributes:
+        client: The :py:class:`~.classification.Classification` client
+            (or its proxy) whose methods the steps call.
+        max_workers (int): The maximal number of steps running at once.
+        retry_policy (~.retrying.RetryPolicy): How failed steps are
+            retried. ``None`` disables retrying.
+        checkpoint (str): The path to the checkpoint file or ``None``.
+
+    """
+
+    def __init__(self, client, max_workers: int=8,
+                 retry_policy: RetryPolicy=None, checkpoint: str=None):
+        self.client = client
+        self.max_workers = max_workers
+        self.retry_policy = retry_policy
+        self.checkpoint = checkpoint
+
+    def run(self, plan: Plan) -> RunResult:
+        """Runs all the steps of the plan that have not finished yet.
+
+        Before anything is sent, the arguments of every step are checked
+        against the signature of its method, so that a mistake in the plan
+        does not stop the run halfway.
+
+        Returns:
+            A :py:class:`RunResult`.
+
+        Raises:
+            ValueError: If the plan is not valid (see :py:meth:`Plan.order`)
+                or a step calls an unknown method or with arguments
+                the method does not take.
+
+        """
+
+        steps = plan.order()
+        for step in steps:
+            self._check_step(step)
+        result = RunResult(done=self._load_checkpoint())
+        waiting = [s for s in steps if s.name not in result.done]
+        running = dict()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while waiting or running:
+                for step in list(waiting):
+                    if any(r in result.failed or r in result.skipped
+                           for r in step.requires):
+                        waiting.remove(step)
+                        result.skipped.append(step.name)
+                    elif all(r in result.done for r in step.requires) \
+                            and len(running) < self.max_workers:
+                        waiting.remove(step)
+                        running[executor.submit(
+                            contextvars.copy_context().run,
+                            self._run_step, step)] = step
+
+                if not running:
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    step = running.pop(future)
+                    try:
+                        result.done[step.name] = future.result()
+                    except Exception as e:
+                        result.failed[step.name] = e
+                    else:
+                        self._save_checkpoint(result.done)
+
+        return result
+
+    def _check_step(self, step):
+        method = getattr(self.client, step.method, None)
+        if not callable(method):
+            raise ValueError(f'Step "{step.name}" calls unknown method '
+                             f'"{step.method}"')
+
+        signature = inspect.signature(method)
+        try:
+            bound = signature.bind(*step.args, **step.kwargs)
+        except TypeError as e:
+            raise ValueError(f'Step "{step.name}" cannot call '
+                             f'{step.method}: {e}') from None
+
+        for name, parameter in signature.parameters.items():
+            if parameter.kind != parameter.VAR_KEYWORD:
+                continue
+            unknown = set(bound.arguments.get(name, ())) - _REQUEST_OPTIONS
+            if unknown:
+                raise ValueError(f'Step "{step.name}" cannot call '
+                                 f'{step.method}: unexpected keyword '
+                                 f'arguments {", ".join(sorted(unknown))}')
+
+    def _run_step(self, step):
+        method = getattr(self.client, step.method)
+        policy = self.retry_policy
+        attempt = 1
+
+        while True:
+            try:
+                return method(*step.args, **step.kwargs)
+            except (ConnectionError, Timeout, CircuitOpenError,
+                    HTTPError) as e:
+                if policy is None or attempt >= policy.max_attempts \
+                        or not self._transient(e, policy, step.method):
+                    raise
+                policy.sleep(policy.backoff(
+                    attempt, getattr(e, 'retry_in', None)))
+                attempt += 1
+
+    @staticmethod
+    def _transient(error, policy, method):
+        if isinstance(error, CircuitOpenError):
+            return True  # the request has not been sent
+
+        endpoint = ENDPOINTS.get(method)
+        verb = endpoint.verb if endpoint is not None \
+            else _COMPOSITE_VERBS.get(method, 'POST')
+        if not policy.allows_method(verb):
+            return False
+
+        if isinstance(error, HTTPError):
+            response = error.response
+            return response is not None \
+                and response.status_code in policy.retry_statuses
+        return True
+
+    def _load_checkpoint(self):
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return dict()
+        with open(self.checkpoint) as f:
+            return json.load(f)['done']
+
+    def _save_checkpoint(self, done):
+        if self.checkpoint is None:
+            return
+
+        # Written aside and renamed, so that a crash cannot corrupt it
+        temporary = f'{self.checkpoint}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump({'done': done}, f, default=lambda o: None)
+        os.replace(temporary, self.checkpoint)
+
+
+def _format(value, course):
+    if isinstance(value, str):
+        return value.format(course=course)
+    if isinstance(value, dict):
+        return {k: _format(v, course) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_format(v, course) for v in value]
+    return value
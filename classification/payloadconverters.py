@@ -1,42 +1,43 @@
+from collections.abc import Mapping
 from classification.entities import StudentClassificationPreviewDto
 
 
-def save_request_from_s2t(student_to_tasks):
-    result = list()
-    for username, grades in student_to_tasks.items():
-        for task, value in grades.items():
-            elem = StudentClassificationPreviewDto(
+def save_request_from_s2t(student_to_tasks, as_dicts=False):
+    if as_dicts:
+        return [_preview_dict(task, username, value)
+                for username, grades in student_to_tasks.items()
+                for task, value in grades.items()]
+
+    return [StudentClassificationPreviewDto(
                 classification_identifier=task,
                 student_username=username,
-                value=value
-            )
-            result.append(elem)
-    return result
+                value=value)
+            for username, grades in student_to_tasks.items()
+            for task, value in grades.items()]
 
 
-def save_request_from_t2s(task_to_students):
-    result = list()
-    for task, grades in task_to_students.items():
-        for username, value in grades.items():
-            elem = StudentClassificationPreviewDto(
+def save_request_from_t2s(task_to_students, as_dicts=False):
+    if as_dicts:
+        return [_preview_dict(task, username, value)
+                for task, grades in task_to_students.items()
+                for username, value in grades.items()]
+
+    return [StudentClassificationPreviewDto(
                 classification_identifier=task,
                 student_username=username,
-                value=value
-            )
-            result.append(elem)
-    return result
+                value=value)
+            for task, grades in task_to_students.items()
+            for username, value in grades.items()]
 
 
-def s2t_from_get_response(resp_body):
-    result = dict()
-    for record in resp_body:
-        username = record['username']
-        grades = record['classificationMap']
-        result_for_student = dict()
-        for task, grade in grades.items():
-            result_for_student[task] = grade
-        result[username] = result_for_student
-    return result
+def s2t_from_get_response(resp_body, copy=True):
+    if not copy:
+        # The maps of the response are shared with the result
+        return {record['username']: record['classificationMap']
+                for record in resp_body}
+
+    return {record['username']: dict(record['classificationMap'])
+            for record in resp_body}
 
 
 def t2s_from_get_response(resp_body):
@@ -49,3 +50,80 @@ def t2s_from_get_response(resp_body):
                 result[task] = dict()
             result[task][username] = grade
     return result
+
+
+class TransposedView(Mapping):
+    """A read-only transposed view of a nested mapping.
+
+    Given the s2t format (``{username: {task: value}}``), the view
+    behaves like the t2s format (``{task: {username: value}}``)
+    and vice versa. Nothing is computed until it is needed: the set
+    of keys is collected on the first iteration (or ``len``, ``in``)
+    and a column is built on its first access and then kept.
+    Call :py:meth:`materialize` to build all the columns at once.
+
+    The view reflects the underlying mapping as it was when the keys
+    or a column were first needed; do not change the mapping
+    while using the view.
+
+    """
+
+    __slots__ = ('_source', '_columns', '_keys')
+
+    def __init__(self, source):
+        self._source = source
+        self._columns = dict()
+        self._keys = None
+
+    def __getitem__(self, key):
+        column = self._columns.get(key)
+        if column is None:
+            column = {outer: inner[key]
+                      for outer, inner in self._source.items()
+                      if key in inner}
+            if not column:
+                raise KeyError(key)
+            self._columns[key] = column
+        return column
+
+    def __contains__(self, key):
+        return key in self._columns or key in self._key_set()
+
+    def __iter__(self):
+        return iter(self._key_set())
+
+    def __len__(self):
+        return len(self._key_set())
+
+    def materialize(self):
+        """Returns the transposed data as a plain dictionary."""
+
+        if len(self._columns) == len(self._key_set()):
+            return dict(self._columns)
+
+        result = t2s_from_get_response(
+            {'username': outer, 'classificationMap': inner}
+            for outer, inner in self._source.items())
+        self._columns = result
+        return dict(result)
+
+    def __repr__(self):
+        return f'TransposedView({self._source!r})'
+
+    def _key_set(self):
+        if self._keys is None:
+            keys = dict()
+            for inner in self._source.values():
+                keys.update(inner)  # only the keys are used
+            self._keys = keys
+        return self._keys
+
+
+def _preview_dict(task, username, value):
+    # The same as StudentClassificationPreviewDto(...).to_dict()
+    if value is None:
+        return {'classificationIdentifier': task,
+                'studentUsername': username}
+    return {'classificationIdentifier': task,
+            'studentUsername': username,
+            'value': value}
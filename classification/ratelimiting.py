@@ -0,0 +1,188 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+class TokenBucket:
+    """A thread-safe token bucket limiting the rate of requests.
+
+    The bucket holds at most ``capacity`` tokens and is refilled
+    with ``rate`` tokens per second. Every request takes one token;
+    when there are none left, the caller sleeps until its token
+    is available. Callers are served in the order they came, since
+    each of them reserves its token (possibly going into debt)
+    before sleeping.
+
+    Attributes:
+        rate (float): How many tokens are added per second.
+        capacity (float): The maximal number of tokens, i.e.
+            the largest burst of requests allowed.
+
+    """
+
+    def __init__(self, rate: float, capacity: float=None,
+                 clock=None, sleep=None):
+        """Creates a new full bucket.
+
+        Args:
+            rate: How many tokens are added per second.
+            capacity: The maximal number of tokens.
+                Defaults to ``rate`` (i.e. a burst of one second).
+            clock: A function returning the current time in seconds.
+                Defaults to :py:func:`time.monotonic`.
+            sleep: The function used to wait.
+                Defaults to :py:func:`time.sleep`.
+
+        """
+
+        if rate <= 0:
+            raise ValueError('rate must be a positive number')
+
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._clock = clock or time.monotonic
+        self._sleep = sleep or time.sleep
+        self._tokens = self.capacity
+        self._updated = self._clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float=1) -> float:
+        """Takes tokens from the bucket, waiting if needed.
+
+        Returns:
+            The number of seconds the caller waited.
+
+        """
+
+        wait = self._reserve(tokens)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def _refill(self, tokens, updated, now):
+        elapsed = max(0.0, now - updated)
+        return min(self.capacity, tokens + elapsed * self.rate)
+
+    def _reserve(self, tokens):
+        with self._lock:
+            now = self._clock()
+            self._tokens = self._refill(self._tokens, self._updated,
+                                        now) - tokens
+            self._updated = now
+            return max(0.0, -self._tokens / self.rate)
+
+
+class SQLiteTokenBucket(TokenBucket):
+    """A token bucket stored in an SQLite database.
+
+    The state of the bucket is kept in a database file, so that all
+    the processes (and threads) using the same ``path`` and ``name``
+    share one limit. Every reservation is done in its own exclusive
+    transaction.
+
+    Attributes:
+        path (str): The path to the database file.
+        name (str): The name of the bucket in the database.
+
+    """
+
+    def __init__(self, path: str, name: str, rate: float,
+                 capacity: float=None, clock=None, sleep=None):
+        """Opens (and creates, if needed) a shared bucket.
+
+        Args:
+            path: The path to the database file.
+            name: The name of the bucket. Several buckets can be stored
+                in one file.
+            rate: See :py:class:`TokenBucket`.
+            capacity: See :py:class:`TokenBucket`.
+            clock: A function returning the current time in seconds.
+                It must be the same for all the processes, so it defaults
+                to :py:func:`time.time`.
+            sleep: See :py:class:`TokenBucket`.
+
+        """
+
+        super().__init__(rate, capacity, clock or time.time, sleep)
+        self.path = path
+        self.name = name
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._transaction() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS token_buckets ('
+                       'name TEXT PRIMARY KEY, '
+                       'tokens REAL NOT NULL, '
+                       'updated REAL NOT NULL)')
+            db.execute('INSERT OR IGNORE INTO token_buckets '
+                       'VALUES (?, ?, ?)',
+                       (name, self.capacity, self._clock()))
+
+    def _connection(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30,
+                                 isolation_level=None)
+            self._local.db = db
+        return db
+
+    @contextmanager
+    def _transaction(self):
+        db = self._connection()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            yield db
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        db.execute('COMMIT')
+
+    def _reserve(self, tokens):
+        with self._transaction() as db:
+            now = self._clock()
+            stored, updated = db.execute(
+                'SELECT tokens, updated FROM token_buckets WHERE name = ?',
+                (self.name,)).fetchone()
+            left = self._refill(stored, updated, now) - tokens
+            db.execute('UPDATE token_buckets SET tokens = ?, updated = ? '
+                       'WHERE name = ?', (left, max(now, updated), self.name))
+        return max(0.0, -left / self.rate)
+
+
+class RateLimiter:
+    """Assigns token buckets to groups of API endpoints.
+
+    The groups correspond to the controllers of the Classification
+    portal API (and to the sections of
+    :py:class:`~.classification.Classification`): ``'classification'``,
+    ``'editor'``, ``'expression'``, ``'notification'``, ``'settings'``,
+    ``'student_classification'`` and ``'student_group'``.
+
+    Attributes:
+        default (TokenBucket): The bucket used for groups without
+            their own one. ``None`` means they are not limited.
+        groups (Dict[str, TokenBucket]): Buckets for the given groups.
+
+    """
+
+    def __init__(self, default: TokenBucket=None, groups: dict=None):
+        self.default = default
+        self.groups = dict(groups or {})
+
+    def acquire(self, group: str) -> float:
+        """Waits until a request of the given group may be sent.
+
+        Returns:
+            The number of seconds the caller waited.
+
+        """
+
+        bucket = self.groups.get(group, self.default)
+        if bucket is None:
+            return 0.0
+        return bucket.acquire()
@@ -0,0 +1,149 @@
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Callable, FrozenSet
+from requests.exceptions import ConnectionError, Timeout
+
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+
+def parse_retry_after(value, now=None):
+    """Converts the value of ``Retry-After`` header to seconds.
+
+    Args:
+        value: Either a number of seconds or an HTTP date.
+        now: The current UNIX time. Defaults to :py:func:`time.time`.
+
+    Returns:
+        The number of seconds to wait or ``None``,
+        if the value cannot be parsed.
+
+    """
+
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+    if date is None:
+        return None
+
+    now = time.time() if now is None else now
+    return max(0.0, date.timestamp() - now)
+
+
+@dataclass
+class RetryPolicy:
+    """Describes how transient failures of API calls are retried.
+
+    A call is retried when the connection fails, times out or when
+    the server responds with one of ``retry_statuses``. Between
+    the attempts, the client sleeps for an exponentially growing
+    time (``backoff_base * 2 ** (attempt - 1)``, at most ``backoff_cap``)
+    with "full jitter", i.e. a random time between zero and that value.
+    If the server sends a ``Retry-After`` header, the client waits
+    at least that long.
+
+    Only idempotent requests (GET, PUT, DELETE) are retried by default,
+    since repeating a POST could create something twice.
+
+    Attributes:
+        max_attempts (int): The maximal number of attempts
+            (including the first one).
+        backoff_base (float): The delay (in seconds) after
+            the first failed attempt.
+        backoff_cap (float): The maximal delay between attempts.
+        jitter (bool): Whether to randomize the delays.
+        respect_retry_after (bool): Whether to honour
+            the ``Retry-After`` header of the response.
+        retry_statuses (FrozenSet[int]): HTTP status codes
+            considered transient.
+        retry_post (bool): Whether POST requests are retried as well.
+        sleep (Callable[[float], None]): The function used to wait.
+
+    """
+
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_cap: float = 30.0
+    jitter: bool = True
+    respect_retry_after: bool = True
+    retry_statuses: FrozenSet[int] = frozenset({429, 502, 503, 504})
+    retry_post: bool = False
+    sleep: Callable[[float], None] = time.sleep
+
+    def allows_method(self, method):
+        """Checks whether requests with this HTTP method can be retried."""
+
+        method = method.upper()
+        return method in IDEMPOTENT_METHODS \
+            or (method == 'POST' and self.retry_post)
+
+    def backoff(self, attempt, retry_after=None):
+        """Computes the delay after the given (1-based) failed attempt."""
+
+        delay = min(self.backoff_cap,
+                    self.backoff_base * 2 ** (attempt - 1))
+
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        if self.respect_retry_after and retry_after is not None:
+            delay = max(delay, retry_after)
+
+        return delay
+
+    def run(self, method, send, on_retry=None):
+        """Calls ``send`` until it succeeds or attempts run out.
+
+        Args:
+            method: The HTTP method of the request.
+            send: A function without arguments sending the request
+                and returning the response.
+            on_retry: An optional function called with the number
+                of the failed attempt and the delay before every retry.
+
+        Returns:
+            The last response. It can still have a retryable status code
+            if all the attempts were used up.
+
+        Raises:
+            requests.exceptions.ConnectionError: If the last attempt
+                failed to connect.
+            requests.exceptions.Timeout: If the last attempt timed out.
+
+        """
+
+        retryable = self.allows_method(method)
+        attempt = 1
+
+        while True:
+            try:
+                resp = send()
+            except (ConnectionError, Timeout):
+                if not retryable or attempt >= self.max_attempts:
+                    raise
+                delay = self.backoff(attempt)
+            else:
+                if not retryable or attempt >= self.max_attempts \
+                        or resp.status_code not in self.retry_statuses:
+                    return resp
+                retry_after = parse_retry_after(
+                    resp.headers.get('Retry-After'))
+                delay = self.backoff(attempt, retry_after)
+
+            if on_retry is not None:
+                on_retry(attempt, delay)
+
+            self.sleep(delay)
+            attempt += 1
@@ -0,0 +1,96 @@
+import threading
+
+
+class _Call:
+    """A single in-flight call shared by several callers."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces identical concurrent calls into a single one.
+
+    The first caller asking for a given key (the leader) runs the call.
+    Everybody else asking for the same key while it is still in flight
+    waits for it and receives the very same result (or exception).
+    Once the call finishes, the key is forgotten, so this is not a cache:
+    a later call is made again.
+
+    Used by :py:class:`~.classification.Classification` to share
+    identical GET requests made from several threads at once.
+
+    Warning:
+        The result object is shared between all the callers,
+        so it should be treated as read-only.
+
+    Attributes:
+        coalesced (int): How many calls were answered by
+            somebody else's request so far.
+
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = dict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(method, url, params=None, raw=False):
+        """Builds a key from the HTTP method, URL and query parameters.
+
+        Parameters set to ``None`` are ignored, as they are not
+        sent by `Requests <http://docs.python-requests.org/en/master/>`__
+        either. Raw and decoded results of the same request get
+        different keys, since they are different objects.
+
+        """
+
+        items = tuple(sorted((k, str(v)) for k, v in (params or {}).items()
+                             if v is not None))
+        return method.upper(), url, items, bool(raw)
+
+    def do(self, key, fun, on_coalesced=None):
+        """Calls ``fun`` unless a call with the same key is in flight.
+
+        Args:
+            key: A hashable identifier of the call.
+            fun: A function without arguments making the call.
+            on_coalesced: An optional function without arguments called
+                when this call joins the one already in flight.
+
+        Returns:
+            The result of ``fun``, either from this call
+            or from the one already in flight.
+
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if on_coalesced is not None:
+                on_coalesced()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fun()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
@@ -0,0 +1,163 @@
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+_current_span = ContextVar('classification_current_span', default=None)
+_ids = itertools.count(1)
+
+
+class Span:
+    """A single timed operation, possibly nested in another one.
+
+    Attributes:
+        name (str): The name of the operation, for example
+            ``'save_student_classifications_simple_t2s'``
+            or ``'HTTP PUT'``.
+        attributes (Dict[str, Any]): Additional information, for example
+            ``course``, ``group`` and ``semester``.
+        parent (Span): The enclosing span or ``None`` for a root span.
+        span_id (int): A unique identifier of the span.
+        trace_id (int): The identifier of the root span of the trace.
+        start (float): When the span started (see
+            :py:func:`time.perf_counter`).
+        end (float): When the span ended (``None`` while running).
+        error (BaseException): The exception that ended the span, if any.
+
+    """
+
+    def __init__(self, name, attributes=None, parent=None):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+        self.span_id = next(_ids)
+        self.trace_id = parent.trace_id if parent else self.span_id
+        self.start = time.perf_counter()
+        self.end = None
+        self.error = None
+
+    @property
+    def duration(self):
+        """The duration of the span in seconds (``None`` while running)."""
+
+        return None if self.end is None else self.end - self.start
+
+    def set_attribute(self, key, value):
+        """Sets an attribute of the span."""
+
+        self.attributes[key] = value
+
+    def __repr__(self):
+        return f'Span({self.name!r}, {self.attributes!r})'
+
+
+class _NoOpSpan:
+    """A span that records nothing."""
+
+    def set_attribute(self, key, value):
+        pass
+
+
+_NO_OP_SPAN = _NoOpSpan()
+
+
+class NoOpTracer:
+    """A tracer that records nothing; used by default.
+
+    Attributes:
+        enabled (bool): Always ``False``, lets the client skip
+            preparing span attributes.
+
+    """
+
+    enabled = False
+
+    @contextmanager
+    def start_span(self, name, attributes=None):
+        """Starts a span as a context manager yielding the span."""
+
+        yield _NO_OP_SPAN
+
+
+class InMemoryTracer:
+    """A tracer storing finished spans in a list, mostly for tests.
+
+    Spans started inside another span (in the same thread or in a task
+    run with a copied :py:mod:`contextvars` context) become its
+    children.
+
+    Attributes:
+        enabled (bool): Always ``True``.
+        spans (List[Span]): Finished spans in the order they ended.
+
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.spans = list()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def start_span(self, name, attributes=None):
+        """Starts a span as a context manager yielding the span."""
+
+        span = Span(name, attributes, _current_span.get())
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = e
+            raise
+        finally:
+            span.end = time.perf_counter()
+            _current_span.reset(token)
+            with self._lock:
+                self.spans.append(span)
+
+    def children(self, span):
+        """Returns finished spans whose parent is the given span."""
+
+        with self._lock:
+            return [s for s in self.spans if s.parent is span]
+
+    def roots(self):
+        """Returns finished spans without a parent."""
+
+        with self._lock:
+            return [s for s in self.spans if s.parent is None]
+
+    def clear(self):
+        """Forgets all the finished spans."""
+
+        with self._lock:
+            self.spans.clear()
+
+
+class OpenTelemetryTracer:
+    """Forwards spans to an `OpenTelemetry <https://opentelemetry.io>`__
+    tracer.
+
+    OpenTelemetry is not a dependency of this library; create the tracer
+    yourself (for example with ``opentelemetry.trace.get_tracer``)
+    and wrap it.
+
+    Attributes:
+        enabled (bool): Always ``True``.
+        tracer: The wrapped OpenTelemetry tracer.
+
+    """
+
+    enabled = True
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    def start_span(self, name, attributes=None):
+        """Starts a span as a context manager yielding the span."""
+
+        return self.tracer.start_as_current_span(
+            name, attributes={k: v for k, v in (attributes or {}).items()
+                              if v is not None})
@@ -0,0 +1,250 @@
+import json
+import time
+from abc import ABC, abstractmethod
+from urllib.parse import urlencode
+import urllib3
+from oauthlib.oauth2 import TokenExpiredError, InsecureTransportError
+from oauthlib.oauth2.rfc6749.utils import is_secure_transport
+from requests.exceptions import HTTPError, ConnectionError, \
+    ConnectTimeout, ReadTimeout
+from requests_oauthlib import OAuth2Session
+
+
+class Transport(ABC):
+    """The interface through which the client makes HTTP requests.
+
+    :py:class:`~.classification.Classification` uses its ``session``
+    only through these members, so anything implementing them can take
+    its place. By default, it is a
+    :py:class:`requests_oauthlib.OAuth2Session`, which already has them
+    (and is registered as a virtual subclass).
+
+    Attributes:
+        token (dict): The OAuth 2 token.
+
+    """
+
+    token = None
+
+    @abstractmethod
+    def request(self, method: str, url: str, **kwargs):
+        """Sends a request with the access token.
+
+        Args:
+            method: The HTTP method.
+            url: The URL.
+            **kwargs: Options of :py:func:`requests.request`
+                (at least ``params``, ``json``, ``data``, ``headers``
+                and ``timeout``).
+
+        Returns:
+            A response with ``status_code``, ``headers``, ``content``,
+            ``json()`` and ``raise_for_status()``
+            like :py:class:`requests.Response`.
+
+        Raises:
+            oauthlib.oauth2.TokenExpiredError: If the access token
+                has expired.
+
+        """
+
+    @abstractmethod
+    def refresh_token(self, token_url: str, refresh_token: str=None,
+                      auth=None) -> dict:
+        """Gets a new token and returns it."""
+
+    def close(self) -> None:
+        """Releases the connections."""
+
+
+Transport.register(OAuth2Session)
+
+
+class Urllib3Response:
+    """A response of :py:class:`Urllib3Transport`.
+
+    It has the members of :py:class:`requests.Response`
+    the client uses.
+
+    Attributes:
+        status_code (int): The HTTP status code.
+        headers (Mapping[str, str]): Case-insensitive headers.
+        content (bytes): The decoded (decompressed) body.
+        reason (str): The reason phrase.
+        url (str): The URL of the request.
+
+    """
+
+    __slots__ = ('status_code', 'headers', 'content', 'reason', 'url')
+
+    def __init__(self, status_code, headers, content, reason, url):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.reason = reason
+        self.url = url
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if 400 <= self.status_code < 600:
+            kind = 'Client' if self.status_code < 500 else 'Server'
+            raise HTTPError(f'{self.status_code} {kind} Error: '
+                            f'{self.reason} for url: {self.url}',
+                            response=self)
+
+
+class Urllib3Transport(Transport):
+    """A lean transport sending requests straight through urllib3.
+
+    :py:class:`requests_oauthlib.OAuth2Session` runs every request
+    through hooks, cookie handling, the authentication machinery
+    of oauthlib and the adapters of Requests. This transport only adds
+    the ``Authorization`` header and sends the request with a pooled
+    :py:class:`urllib3.PoolManager`, which saves a noticeable part
+    of the time of every call against a fast server. Like Requests,
+    it asks for compressed responses and decompresses them.
+
+    The token is still managed by the ``OAuth2Session`` used to log
+    in: refreshing it works the same way, and an expired token raises
+    :py:exc:`oauthlib.oauth2.TokenExpiredError`, so the client
+    refreshes it as before. Errors are reported with the exceptions
+    of Requests (:py:exc:`~requests.exceptions.ConnectionError`,
+    :py:exc:`~requests.exceptions.Timeout` and
+    :py:exc:`~requests.exceptions.HTTPError`), so retrying
+    and the circuit breaker work unchanged.
+
+    Only the options ``params``, ``json``, ``data``, ``headers``
+    and ``timeout`` of the requests are supported.
+
+    Use it by passing :py:meth:`from_session` to the client::
+
+        client = Classification(client_id, client_secret,
+                                transport=Urllib3Transport.from_session)
+
+    Attributes:
+        session (requests_oauthlib.OAuth2Session): The session owning
+            the token.
+        pool (urllib3.PoolManager): The connection pool.
+        timeout (float): The default timeout of requests (in seconds).
+
+    """
+
+    def __init__(self, session, maxsize: int=10, timeout: float=None,
+                 **pool_kwargs):
+        """Creates the connection pool.
+
+        Args:
+            session: See :py:attr:`session`.
+            maxsize: The number of connections kept per host
+                (at least the number of threads making requests).
+            timeout: See :py:attr:`timeout`.
+            **pool_kwargs: Passed to :py:class:`urllib3.PoolManager`.
+
+        """
+
+        self.session = session
+        self.timeout = timeout
+        self.pool = urllib3.PoolManager(maxsize=maxsize, **pool_kwargs)
+        self._retries = urllib3.Retry(total=None, connect=0, read=0,
+                                      status=0, other=0, redirect=30,
+                                      raise_on_redirect=False)
+
+    @classmethod
+    def from_session(cls, session, **kwargs) -> 'Urllib3Transport':
+        """Creates the transport for a logged in session.
+
+        Args:
+            session: The :py:class:`requests_oauthlib.OAuth2Session`.
+            **kwargs: See :py:meth:`__init__`.
+
+        """
+
+        return cls(session, **kwargs)
+
+    @property
+    def token(self):
+        return self.session.token
+
+    @token.setter
+    def token(self, value):
+        self.session.token = value
+
+    def request(self, method, url, params=None, json=None, data=None,
+                headers=None, timeout=None, **kwargs):
+        if kwargs:
+            raise TypeError(f'Unsupported options of {type(self).__name__}: '
+                            f'{", ".join(sorted(kwargs))}')
+        if not is_secure_transport(url):
+            raise InsecureTransportError()
+
+        token = self.session.token or {}
+        expires_at = token.get('expires_at')
+        if expires_at is not None and float(expires_at) < time.time():
+            raise TokenExpiredError()
+
+        if params:
+            query = urlencode([(k, v) for k, v in params.items()
+                               if v is not None], doseq=True)
+            if query:
+                url = f'{url}{"&" if "?" in url else "?"}{query}'
+
+        request_headers = {'Accept': '*/*',
+                           'Accept-Encoding': 'gzip, deflate'}
+        if 'access_token' in token:
+            request_headers['Authorization'] = \
+                f'Bearer {token["access_token"]}'
+        if json is not None and data is None:
+            data = _dumps(json)
+            request_headers['Content-Type'] = 'application/json'
+        if headers:
+            request_headers.update(headers)
+
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            resp = self.pool.request(method, url, body=data,
+                                     headers=request_headers,
+                                     timeout=_timeout(timeout),
+                                     retries=self._retries)
+        except urllib3.exceptions.MaxRetryError as e:
+            raise _translate(e.reason or e) from e
+        except urllib3.exceptions.HTTPError as e:
+            raise _translate(e) from e
+
+        return Urllib3Response(resp.status, resp.headers, resp.data,
+                               resp.reason, url)
+
+    def refresh_token(self, token_url, refresh_token=None, auth=None,
+                      **kwargs):
+        return self.session.refresh_token(token_url,
+                                          refresh_token=refresh_token,
+                                          auth=auth, **kwargs)
+
+    def close(self):
+        self.pool.clear()
+        self.session.close()
+
+
+def _dumps(body):
+    return json.dumps(body, allow_nan=False).encode('utf-8')
+
+
+def _timeout(timeout):
+    if timeout is None:
+        return urllib3.Timeout(connect=None, read=None)
+    if isinstance(timeout, tuple):
+        return urllib3.Timeout(connect=timeout[0], read=timeout[1])
+    return urllib3.Timeout(connect=timeout, read=timeout)
+
+
+def _translate(error):
+    if isinstance(error, urllib3.exceptions.ConnectTimeoutError):
+        return ConnectTimeout(str(error))
+    if isinstance(error, urllib3.exceptions.ReadTimeoutError):
+        return ReadTimeout(str(error))
+    return ConnectionError(str(error))
@@ -1,3 +1,47 @@
+from typing import Mapping, NamedTuple
+from requests.structures import CaseInsensitiveDict
+
+
+class RawResponse(NamedTuple):
+    """An undecoded response body returned in the raw mode.
+
+    The content is decompressed (Requests removes the content encoding
+    while reading the response), so the headers describing the encoded
+    body, ``Content-Encoding`` and ``Content-Length``, are left out.
+    The response can be forwarded with its headers as it is.
+
+    Attributes:
+        content (bytes): The body as the server sent it, except for
+            the content encoding (e.g. gzip), which was removed.
+        headers (Mapping[str, str]): The headers of the response,
+            e.g. ``Content-Type``.
+        status_code (int): The HTTP status code.
+
+    """
+
+    content: bytes
+    headers: Mapping[str, str]
+    status_code: int
+
+    def view(self) -> memoryview:
+        """Returns a memoryview of the content (without copying it)."""
+
+        return memoryview(self.content)
+
+
+class EncodedJson(bytes):
+    """A request body that has already been encoded as JSON.
+
+    Pass it instead of the usual body (for example, to
+    :py:meth:`~.classification.Classification.save_student_classifications`)
+    and it is sent as it is, without being serialized again.
+    See :py:func:`~.bulk.encode_s2t_chunks`.
+
+    """
+
+    __slots__ = ()
+
+
 def remove_none_entries(dictionary):
     keys = [k for k in dictionary if dictionary[k] is None]
     for k in keys:
@@ -14,6 +58,28 @@ def make_dict_body(object):
     return object
 
 
+def make_dict_bodies(objects):
+    if isinstance(objects, EncodedJson):
+        return objects
+
+    if objects is None:
+        return list()
+
+    return [make_dict_body(o) for o in objects]
+
+
+def encoded_json_as_data(kwargs):
+    body = kwargs.get('json')
+    if not isinstance(body, EncodedJson):
+        return kwargs
+
+    headers = dict(kwargs.get('headers') or {})
+    headers.setdefault('Content-Type', 'application/json')
+    result = dict(kwargs, data=body, headers=headers)
+    del result['json']
+    return result
+
+
 def get_body_or_raise_error(resp, exp_code):
     if resp.status_code == exp_code and exp_code == 204:
         return None  # Since 204 is for 'No Content'
@@ -32,3 +98,16 @@ def get_body_or_raise_error(resp, exp_code):
             return None
 
     resp.raise_for_status()
+
+
+def get_raw_body_or_raise_error(resp, exp_code):
+    if resp.status_code == exp_code:
+        headers = resp.headers
+        if 'Content-Encoding' in headers:
+            # The content has been decoded, these describe the encoded one
+            headers = CaseInsensitiveDict(headers)
+            del headers['Content-Encoding']
+            headers.pop('Content-Length', None)
+        return RawResponse(resp.content or b'', headers, resp.status_code)
+
+    resp.raise_for_status()
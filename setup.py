@@ -20,6 +20,8 @@ setup(
                       'appdirs>=1.4.3', 'dataclasses>=0.4'],
     setup_requires=['pytest-runner>=3.0'],
     tests_require=['pytest>=3.4.0', 'flexmock>=0.10.2', 'betamax>=0.8.0'],
+    extras_require={'benchmark': ['pytest-benchmark>=3.1.0'],
+                    'export': ['pyarrow>=0.15.0']},
     classifiers=[
         'Intended Audience :: Developers',
         'License :: OSI Approved :: MIT License',
@@ -0,0 +1,12 @@
+import pytest
+from classification import classification
+from fakes import FakeSession
+
+
+@pytest.fixture
+def make_client():
+    def factory(responder, **options):
+        session = FakeSession(responder)
+        return classification.Classification('dummy', 'dummy',
+                                             session=session, **options)
+    return factory
@@ -0,0 +1,113 @@
+import json
+from requests import HTTPError
+
+
+class FakeResponse:
+    """A minimal stand-in for :py:class:`requests.Response`."""
+
+    def __init__(self, status_code=200, body=None, headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    @property
+    def content(self):
+        if self.body is None:
+            return b''
+        return json.dumps(self.body).encode('utf-8')
+
+    def json(self):
+        if self.body is None:
+            raise ValueError('No JSON body')
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPError(f'{self.status_code} Error', response=self)
+
+
+class FakeSession:
+    """Records requests and answers them with the given responder."""
+
+    def __init__(self, responder):
+        self.responder = responder
+        self.calls = []
+        self.token = {'access_token': 'dummy', 'refresh_token': 'dummy'}
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        return self.responder(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def close(self):
+        pass
+
+
+class FakePortal:
+    """Answers the course endpoints from in-memory data.
+
+    Attributes:
+        definitions (list): Classification definitions.
+        groups (Dict[str, List[str]]): Usernames in each group.
+        grades (Dict[str, Dict[str, Any]]): Grades in the s2t format.
+        editors (Dict[str, Set[str]]): Editors per course.
+        saved (list): Bodies of the saved student classifications.
+
+    """
+
+    def __init__(self, definitions=None, groups=None, grades=None):
+        self.definitions = definitions or []
+        self.groups = groups or {}
+        self.grades = grades or {}
+        self.editors = {}
+        self.saved = []
+
+    def __call__(self, method, url, **kwargs):
+        parts = url.split('/public/', 1)[1].split('/')
+
+        if method == 'GET' and parts[-1] == 'classifications':
+            return FakeResponse(200, self.definitions)
+        if method == 'GET' and parts[-1] == 'student-groups':
+            return FakeResponse(200, [{'code': c, 'name': c.title()}
+                                      for c in self.groups])
+        if method == 'GET' and parts[-1] == 'student-classifications':
+            group = parts[-2]
+            usernames = sorted(self.grades) if group == 'ALL' \
+                else self.groups.get(group, [])
+            return FakeResponse(200, [
+                {'username': u, 'firstName': u.title(), 'lastName': u,
+                 'email': f'{u}@example.com',
+                 'classificationMap': dict(self.grades.get(u, {}))}
+                for u in usernames])
+        if method == 'PUT' and parts[-1] == 'student-classifications':
+            body = kwargs['json'] if 'json' in kwargs \
+                else json.loads(kwargs['data'])
+            self.saved.append(body)
+            for item in body:
+                self.grades.setdefault(item['studentUsername'], {})[
+                    item['classificationIdentifier']] = item.get('value')
+            return FakeResponse(201)
+        if parts[-2:-1] == ['editors'] or parts[-1] == 'editors':
+            course = parts[1]
+            editors = self.editors.setdefault(course, set())
+            if method == 'GET':
+                return FakeResponse(200, sorted(editors))
+            if method == 'PUT':
+                editors.add(parts[-1])
+                return FakeResponse(201)
+            if method == 'DELETE':
+                editors.discard(parts[-1])
+                return FakeResponse(204)
+
+        return FakeResponse(404)
@@ -0,0 +1,84 @@
+from classification import WriteBatcher
+from fakes import FakePortal, FakeResponse
+import pytest
+import requests
+
+
+@pytest.fixture
+def portal():
+    return FakePortal()
+
+
+def test_updates_are_merged_per_course(make_client, portal):
+    client = make_client(portal)
+
+    with WriteBatcher(client, max_delay=60) as batcher:
+        futures = [batcher.submit('MI-PYT', 'alice', 'hw1', 1),
+                   batcher.submit('MI-PYT', 'bob', 'hw1', 2),
+                   batcher.submit('BI-PYT', 'alice', 'hw1', 3),
+                   batcher.submit('MI-PYT', 'alice', 'hw2', 4, 'B192')]
+        assert batcher.flush(timeout=5)
+
+    assert all(f.done() and f.exception() is None for f in futures)
+    calls = sorted((url.split('/courses/')[1].split('/')[0],
+                    kwargs['params'].get('semester', ''), len(kwargs['json']))
+                   for _, url, kwargs in client.session.calls)
+    assert calls == [('BI-PYT', '', 1), ('MI-PYT', '', 2),
+                     ('MI-PYT', 'B192', 1)]
+    assert batcher.batches == 3
+
+
+def test_last_write_wins(make_client, portal):
+    client = make_client(portal)
+
+    with WriteBatcher(client, max_delay=60) as batcher:
+        first = batcher.submit('MI-PYT', 'alice', 'hw1', 1)
+        second = batcher.submit('MI-PYT', 'alice', 'hw1', 5)
+
+    assert first.result(timeout=5) is None and second.done()
+    assert portal.saved == [[{'classificationIdentifier': 'hw1',
+                              'studentUsername': 'alice', 'value': 5}]]
+    assert batcher.collapsed == 1
+
+
+def test_size_window(make_client, portal):
+    client = make_client(portal)
+
+    with WriteBatcher(client, max_delay=60, max_size=3) as batcher:
+        futures = [batcher.submit('MI-PYT', f'student{i}', 'hw1', i)
+                   for i in range(3)]
+        for future in futures:
+            future.result(timeout=5)
+        assert len(portal.saved) == 1
+
+        batcher.submit('MI-PYT', 'student4', 'hw1', 4)
+
+    assert [len(body) for body in portal.saved] == [3, 1]
+
+
+def test_time_window(make_client, portal):
+    client = make_client(portal)
+
+    with WriteBatcher(client, max_delay=0.05) as batcher:
+        batcher.submit('MI-PYT', 'alice', 'hw1', 1).result(timeout=5)
+
+    assert portal.grades == {'alice': {'hw1': 1}}
+
+
+def test_errors_reach_the_futures(make_client):
+    client = make_client(lambda method, url, **kwargs: FakeResponse(500))
+
+    with WriteBatcher(client, max_delay=60) as batcher:
+        future = batcher.submit('MI-PYT', 'alice', 'hw1', 1)
+
+    with pytest.raises(requests.HTTPError):
+        future.result(timeout=5)
+    assert not future.cancel()
+
+
+def test_closed_batcher_refuses_updates(make_client, portal):
+    batcher = WriteBatcher(make_client(portal))
+    batcher.close()
+
+    with pytest.raises(RuntimeError):
+        batcher.submit('MI-PYT', 'alice', 'hw1', 1)
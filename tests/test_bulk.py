@@ -0,0 +1,92 @@
+from classification import Compression
+from classification.bulk import encode_s2t_chunks, encode_t2s_chunks, \
+    upload_chunks
+from classification.payloadconverters import save_request_from_s2t, \
+    save_request_from_t2s
+from classification.utils import EncodedJson
+from fakes import FakePortal
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import json
+import pytest
+
+
+GRADES = {f'student{i:03d}': {f'hw{t}': i * t for t in range(i % 4 + 1)}
+          for i in range(100)}
+
+TASKS = {'hw1': {'alice': 1, 'bob': 2}, 'hw2': {'alice': 3},
+         'exam': {'bob': 'A', 'carol': None}}
+
+
+def decode(chunks):
+    return [item for chunk in chunks for item in json.loads(chunk)]
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_s2t_chunks_match_the_converter(processes):
+    chunks = encode_s2t_chunks(GRADES, chunk_size=20, processes=processes)
+
+    assert all(isinstance(chunk, EncodedJson) for chunk in chunks)
+    assert decode(chunks) == save_request_from_s2t(GRADES, as_dicts=True)
+    # Students are never split between chunks
+    for chunk in chunks:
+        usernames = {item['studentUsername'] for item in json.loads(chunk)}
+        for username in usernames:
+            assert sum(item['studentUsername'] == username
+                       for item in json.loads(chunk)) == len(GRADES[username])
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_t2s_chunks_match_the_converter(processes):
+    chunks = encode_t2s_chunks(TASKS, chunk_size=2, processes=processes)
+
+    assert len(chunks) == 2
+    assert decode(chunks) == save_request_from_t2s(TASKS, as_dicts=True)
+
+
+def test_concurrent_calls_do_not_mix_data():
+    courses = {name: {f'{name}{i:03d}': {'hw1': i} for i in range(60)}
+               for name in 'ab'}
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = dict(zip(courses, executor.map(
+            lambda s2t: encode_s2t_chunks(s2t, chunk_size=10, processes=2),
+            courses.values())))
+
+    for name, chunks in results.items():
+        assert decode(chunks) == save_request_from_s2t(courses[name],
+                                                       as_dicts=True)
+
+
+def test_empty_input():
+    assert encode_s2t_chunks({}) == []
+
+
+def test_upload(make_client):
+    portal = FakePortal()
+    client = make_client(portal)
+    chunks = encode_s2t_chunks(GRADES, chunk_size=50, processes=1)
+
+    assert upload_chunks(client, 'MI-PYT', chunks, 'B192') == len(chunks)
+
+    assert portal.grades == {u: g for u, g in GRADES.items() if g}
+    _, _, kwargs = client.session.calls[0]
+    assert kwargs['headers']['Content-Type'] == 'application/json'
+    assert kwargs['params'] == {'semester': 'B192'}
+
+
+def test_encoded_chunks_are_compressed(make_client):
+    sent = []
+
+    def responder(method, url, **kwargs):
+        sent.append(kwargs)
+        return FakePortal()(method, url, **dict(
+            kwargs, data=gzip.decompress(kwargs['data'])))
+
+    client = make_client(responder, compression=Compression(threshold=100))
+    chunk, = encode_s2t_chunks(GRADES, processes=1)
+
+    client.save_student_classifications('MI-PYT', chunk)
+
+    assert sent[0]['headers']['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(sent[0]['data']) == chunk
@@ -0,0 +1,164 @@
+from classification import classification
+from classification.circuitbreaker import CircuitBreaker
+from classification.exceptions import CircuitOpenError
+from classification.retrying import RetryPolicy
+from fakes import FakeResponse
+from oauthlib.oauth2 import TokenExpiredError
+from requests.exceptions import ConnectionError
+import pytest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(**kwargs):
+    clock = FakeClock()
+    options = dict(window_size=4, minimum_calls=4, reset_timeout=10,
+                   clock=clock)
+    options.update(kwargs)
+    return CircuitBreaker(**options), clock
+
+
+def raising(error):
+    def send():
+        raise error
+    return send
+
+
+def test_opens_on_failure_rate():
+    breaker, clock = make_breaker()
+    for success in [True, False, True]:
+        breaker.record('editor', success, 0.1)
+    assert breaker.state('editor') == 'closed'
+
+    breaker.record('editor', False, 0.1)
+    assert breaker.state('editor') == 'open'
+    assert breaker.state('settings') == 'closed'
+
+    with pytest.raises(CircuitOpenError) as e:
+        breaker.allow('editor')
+    assert e.value.group == 'editor'
+    assert e.value.retry_in == 10
+    breaker.allow('settings')
+
+
+def test_opens_on_slow_calls():
+    breaker, clock = make_breaker(slow_call_threshold=1.0,
+                                  slow_call_rate_threshold=0.75)
+    for duration in [2, 2, 0.5, 3]:
+        breaker.record('editor', True, duration)
+    assert breaker.state('editor') == 'open'
+
+
+def test_half_open_probe_closes_circuit():
+    breaker, clock = make_breaker(minimum_calls=1)
+    breaker.record('editor', False, 0.1)
+
+    clock.now = 10
+    assert breaker.state('editor') == 'half_open'
+    breaker.allow('editor')
+    with pytest.raises(CircuitOpenError):
+        breaker.allow('editor')
+
+    breaker.record('editor', True, 0.1)
+    assert breaker.state('editor') == 'closed'
+
+
+def test_failed_probe_opens_circuit_again():
+    breaker, clock = make_breaker(minimum_calls=1)
+    breaker.record('editor', False, 0.1)
+
+    clock.now = 10
+    breaker.allow('editor')
+    breaker.record('editor', False, 0.1)
+    assert breaker.state('editor') == 'open'
+
+    clock.now = 15
+    with pytest.raises(CircuitOpenError):
+        breaker.allow('editor')
+
+
+def test_probe_raising_other_error_is_released():
+    breaker, clock = make_breaker(minimum_calls=1)
+    breaker.record('editor', False, 0.1)
+
+    clock.now = 10
+    breaker.allow('editor')
+    with pytest.raises(TokenExpiredError):
+        breaker.measure('editor', raising(TokenExpiredError()))
+    assert breaker.state('editor') == 'half_open'
+
+    breaker.allow('editor')
+    breaker.measure('editor', lambda: FakeResponse(200))
+    assert breaker.state('editor') == 'closed'
+
+
+def test_client_probe_survives_token_refresh(make_client, monkeypatch):
+    monkeypatch.setattr(classification, 'save_token', lambda token: None)
+    breaker, clock = make_breaker(minimum_calls=1)
+    breaker.record('editor', False, 0.1)
+    clock.now = 10
+    outcomes = [TokenExpiredError(), FakeResponse(200, ['editor'])]
+
+    def responder(method, url, **kwargs):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    client = make_client(responder, circuit_breaker=breaker)
+    client.session.refresh_token = lambda url, **kwargs: {
+        'access_token': 'new', 'refresh_token': 'new'}
+
+    assert client.get_editors('MI-PYT') == ['editor']
+    assert breaker.state('editor') == 'closed'
+
+
+def test_client_fails_fast(make_client):
+    breaker, clock = make_breaker(minimum_calls=2, window_size=2)
+
+    def responder(method, url, **kwargs):
+        if 'editors' in url:
+            raise ConnectionError('down')
+        return FakeResponse(200, {'ok': True})
+
+    client = make_client(responder, circuit_breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            client.get_editors('MI-PYT')
+
+    with pytest.raises(CircuitOpenError):
+        client.get_editors('MI-PYT')
+    assert len(client.session.calls) == 2
+
+    assert client.get_settings() == {'ok': True}
+
+
+def test_client_errors_do_not_open_circuit(make_client):
+    breaker, clock = make_breaker(minimum_calls=1, window_size=1)
+    client = make_client(lambda method, url, **kwargs: FakeResponse(404),
+                         circuit_breaker=breaker)
+
+    for _ in range(3):
+        with pytest.raises(Exception) as e:
+            client.get_editors('MI-PYT')
+        assert not isinstance(e.value, CircuitOpenError)
+
+
+def test_open_circuit_is_not_retried(make_client):
+    breaker, clock = make_breaker(minimum_calls=1, window_size=1)
+    delays = []
+    client = make_client(lambda method, url, **kwargs: FakeResponse(503),
+                         circuit_breaker=breaker,
+                         retry_policy=RetryPolicy(sleep=delays.append))
+
+    with pytest.raises(CircuitOpenError):
+        client.get_editors('MI-PYT')
+    assert len(client.session.calls) == 1
+    assert len(delays) == 1
@@ -0,0 +1,97 @@
+from classification import Compression, Instrumentation
+from fakes import FakeResponse
+import gzip
+import json
+import pytest
+import zlib
+
+
+GRADES = {f'student{i:04d}': {'homework_1': 5, 'homework_2': 4.5,
+                              'exam': 'A'}
+          for i in range(500)}
+
+
+def recorder(*statuses):
+    statuses = list(statuses)
+    requests = []
+
+    def responder(method, url, **kwargs):
+        requests.append(kwargs)
+        return FakeResponse(statuses.pop(0) if statuses else 201)
+
+    return responder, requests
+
+
+def test_large_body_is_gzipped(make_client):
+    responder, requests = recorder()
+    client = make_client(responder, compression=Compression())
+
+    client.save_student_classifications_simple_s2t('BI-PYT', GRADES)
+
+    sent = requests[0]
+    assert 'json' not in sent
+    assert sent['headers']['Content-Encoding'] == 'gzip'
+    assert sent['headers']['Content-Type'] == 'application/json'
+    body = json.loads(gzip.decompress(sent['data']))
+    assert len(body) == 1500
+    assert len(sent['data']) * 10 < len(json.dumps(body))
+
+
+def test_deflate(make_client):
+    responder, requests = recorder()
+    client = make_client(responder,
+                         compression=Compression(encoding='deflate'))
+
+    client.save_student_classifications_simple_s2t('BI-PYT', GRADES)
+
+    assert requests[0]['headers']['Content-Encoding'] == 'deflate'
+    assert len(json.loads(zlib.decompress(requests[0]['data']))) == 1500
+
+
+def test_small_body_is_not_compressed(make_client):
+    responder, requests = recorder()
+    client = make_client(responder, compression=Compression())
+
+    client.save_student_classifications_simple_s2t(
+        'BI-PYT', {'alice': {'exam': 'A'}})
+
+    sent = requests[0]
+    assert 'json' not in sent
+    assert json.loads(sent['data'])[0]['studentUsername'] == 'alice'
+    assert sent['headers']['Content-Type'] == 'application/json'
+    assert 'Content-Encoding' not in sent['headers']
+
+
+def test_compressed_response_is_requested(make_client):
+    responder, requests = recorder(200, 200)
+    client = make_client(responder, compression=Compression())
+
+    client.get_settings()
+    client.get_settings(headers={'accept-encoding': 'identity'})
+
+    assert requests[0]['headers']['Accept-Encoding'] == 'gzip, deflate'
+    assert requests[1]['headers'] == {'accept-encoding': 'identity'}
+
+
+def test_unsupported_media_type_falls_back(make_client):
+    responder, requests = recorder(415, 201, 201)
+    metrics = Instrumentation()
+    compression = Compression()
+    client = make_client(responder, compression=compression,
+                         instrumentation=metrics)
+
+    client.save_student_classifications_simple_s2t('BI-PYT', GRADES)
+    client.save_student_classifications_simple_s2t('BI-PYT', GRADES)
+
+    assert 'data' in requests[0]
+    assert 'json' in requests[1] and 'json' in requests[2]
+    for sent in requests[1:]:
+        assert sent['headers'] == {'Accept-Encoding': 'gzip, deflate'}
+    assert not compression.supported
+    assert metrics.snapshot()['counters']['compression_fallbacks'] == \
+        {'save_student_classifications': 1}
+
+
+def test_unknown_encoding():
+    with pytest.raises(ValueError):
+        Compression(encoding='br')
@@ -0,0 +1,69 @@
+from classification.editors import EditorReconciler
+from fakes import FakePortal, FakeResponse
+
+
+def make_portal():
+    portal = FakePortal()
+    portal.editors = {'BI-PYT': {'alice', 'bob', 'root'},
+                      'BI-ZUM': set(),
+                      'MI-PYT': {'carol'}}
+    return portal
+
+
+DESIRED = {'BI-PYT': ['alice', 'carol'],
+           'BI-ZUM': ['alice'],
+           'MI-PYT': ['carol']}
+
+
+def test_diff_does_not_change_anything(make_client):
+    portal = make_portal()
+    reconciler = EditorReconciler(make_client(portal), protected=['root'])
+
+    changes = reconciler.diff(DESIRED)
+
+    assert (changes['BI-PYT'].add, changes['BI-PYT'].delete) == \
+        (['carol'], ['bob'])
+    assert changes['BI-ZUM'].add == ['alice']
+    assert not changes['MI-PYT']
+    assert portal.editors['BI-ZUM'] == set()
+
+
+def test_reconcile_makes_only_needed_calls(make_client):
+    portal = make_portal()
+    client = make_client(portal)
+
+    EditorReconciler(client, max_workers=2).reconcile(DESIRED)
+
+    assert portal.editors == {'BI-PYT': {'alice', 'carol'},
+                              'BI-ZUM': {'alice'}, 'MI-PYT': {'carol'}}
+    writes = [(m, url.rsplit('/', 3)[-3:]) for m, url, _
+              in client.session.calls if m != 'GET']
+    assert sorted(writes) == [
+        ('DELETE', ['BI-PYT', 'editors', 'bob']),
+        ('DELETE', ['BI-PYT', 'editors', 'root']),
+        ('PUT', ['BI-PYT', 'editors', 'carol']),
+        ('PUT', ['BI-ZUM', 'editors', 'alice'])]
+
+
+def test_add_only_and_failures(make_client):
+    portal = make_portal()
+
+    def responder(method, url, **kwargs):
+        if method == 'PUT' and url.endswith('BI-ZUM/editors/alice'):
+            return FakeResponse(500)
+        return portal(method, url, **kwargs)
+
+    changes = EditorReconciler(make_client(responder),
+                               remove_extra=False).reconcile(DESIRED)
+
+    assert changes['BI-PYT'].delete == []
+    assert list(changes['BI-ZUM'].failed) == ['alice']
+    assert portal.editors['BI-PYT'] == {'alice', 'bob', 'carol', 'root'}
+
+
+def test_dry_run(make_client):
+    portal = make_portal()
+    changes = EditorReconciler(make_client(portal)).reconcile(
+        DESIRED, dry_run=True)
+    assert changes['BI-ZUM'].add == ['alice']
+    assert portal.editors['BI-ZUM'] == set()
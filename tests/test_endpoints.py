@@ -0,0 +1,106 @@
+from classification import Classification, ClassificationParamsProxy
+from classification.codegen import generated_sources, splice_generated
+from classification.endpoints import ENDPOINTS, Endpoint, path, query
+from fakes import FakeResponse, FakeSession
+import inspect
+import pytest
+
+
+def recording_client():
+    session = FakeSession(lambda method, url, **kwargs: FakeResponse(200, []))
+    return Classification('dummy', 'dummy', session=session), session.calls
+
+
+def test_route_and_params():
+    client, calls = recording_client()
+
+    client.find_classification('MI-PYT', 'exam', lang='cs')
+
+    method, url, kwargs = calls[0]
+    assert method == 'GET'
+    assert url == f'{Classification.API_URL}/public/courses/MI-PYT' \
+                  f'/classifications/exam'
+    assert kwargs['params'] == {'lang': 'cs'}
+
+
+def test_required_query_params_are_always_sent():
+    client, calls = recording_client()
+    client.session.responder = lambda method, url, **kwargs: \
+        FakeResponse(201)
+
+    client.clone_classification_definitions('B192', 'BI-PYT', 'B191',
+                                             'MI-PYT', False)
+
+    method, url, kwargs = calls[0]
+    assert url.endswith('/courses/MI-PYT/classifications/clones/BI-PYT')
+    assert kwargs['params'] == {'target-semester': 'B192',
+                                'source-semester': 'B191',
+                                'remove-existing': False}
+
+
+def test_signatures_and_docs_follow_the_table():
+    for name, endpoint in ENDPOINTS.items():
+        method = getattr(Classification, name)
+        parameters = list(inspect.signature(method).parameters)
+
+        expected = ['self'] + [p.name for p in endpoint.params]
+        if endpoint.raw:
+            expected.append('raw')
+        assert parameters == expected + ['kwargs']
+
+        for param in endpoint.params:
+            assert f'    {param.name}: ' in method.__doc__
+
+
+def test_checked_in_methods_match_the_table():
+    for path_, source in generated_sources().items():
+        with open(path_) as f:
+            text = f.read()
+        assert splice_generated(text, source) == text, \
+            f'{path_} is out of date, run python -m classification.codegen'
+
+
+def test_methods_have_source():
+    source = inspect.getsource(Classification.get_editors)
+    assert source.lstrip().startswith('@traced')
+    assert "self._request('get_editors', 'GET', 200," in source
+
+    source = inspect.getsource(ClassificationParamsProxy.try_validity)
+    assert 'self.classification' in source
+
+
+def test_splice_needs_markers():
+    with pytest.raises(ValueError):
+        splice_generated('class Empty:\n    pass\n', '')
+
+
+def test_route_must_match_path_params():
+    with pytest.raises(ValueError):
+        Endpoint('broken', 'editor', 'GET', '/courses/{course_code}', 200,
+                 'Broken.', (path('course', 'Course.'),))
+
+    endpoint = Endpoint('fine', 'editor', 'GET', '/courses/{course}', 200,
+                        'Fine.', (path('course', 'Course.'),
+                                  query('lang', 'Language tag.')))
+    assert [p.name for p in endpoint.query] == ['lang']
+    assert endpoint.body is None
+
+
+def test_proxy_wrappers():
+    signature = inspect.signature(
+        ClassificationParamsProxy.find_student_classifications_for_definitions)
+    assert list(signature.parameters) == ['self', 'identifier', 'course_code',
+                                          'group_code', 'semester', 'raw',
+                                          'kwargs']
+    assert 'expression' in inspect.signature(
+        ClassificationParamsProxy.try_validity).parameters
+
+    session = FakeSession(lambda method, url, **kwargs: FakeResponse(200, []))
+    proxy = ClassificationParamsProxy('dummy', 'dummy', session=session,
+                                      course_code='MI-PYT', semester='B192')
+    proxy.find_student_classifications_for_definitions('exam')
+
+    method, url, kwargs = session.calls[0]
+    assert url.endswith('/courses/MI-PYT/group/ALL'
+                        '/student-classifications/exam')
+    assert kwargs['params'] == {'semester': 'B192'}
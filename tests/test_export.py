@@ -0,0 +1,116 @@
+from classification import export
+from classification.export import CourseExporter
+from fakes import FakePortal
+import csv
+import threading
+import time
+import pytest
+
+
+DEFINITIONS = [{'identifier': 'hw1', 'valueType': 'NUMBER',
+                'minimumRequiredValue': 5.0, 'mandatory': True},
+               {'identifier': 'note', 'valueType': 'STRING'}]
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(FakePortal(
+        DEFINITIONS, groups={'g1': ['alice'], 'g2': ['bob']},
+        grades={'alice': {'hw1': 8, 'note': 'ok'},
+                'bob': {'hw1': 2.5, 'passed': False}}))
+
+
+def read_csv(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_csv_export(client, tmpdir):
+    exporter = CourseExporter(client, batch_size=2, members=True)
+    result = exporter.export(['BI-PYT', 'BI-ZUM'], str(tmpdir.join('out')),
+                             semester='B201')
+
+    assert {t: rows for t, (_, rows) in result.items()} == \
+        {'definitions': 4, 'groups': 4, 'members': 4, 'grades': 8}
+
+    grades = read_csv(result['grades'][0])
+    assert {'course': 'BI-PYT', 'semester': 'B201', 'username': 'bob',
+            'identifier': 'passed', 'value': 'false', 'number': ''} in grades
+    assert {'course': 'BI-ZUM', 'semester': 'B201', 'username': 'alice',
+            'identifier': 'hw1', 'value': '8', 'number': '8.0'} in grades
+
+    definitions = read_csv(result['definitions'][0])
+    assert [d['identifier'] for d in definitions
+            if d['course'] == 'BI-PYT'] == ['hw1', 'note']
+    assert read_csv(result['members'][0])[0]['group_code'] in ('g1', 'g2')
+
+
+class TrackingExporter(CourseExporter):
+    """Counts courses downloaded but not written yet."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.held = self.peak = 0
+        self._lock = threading.Lock()
+
+    def _download(self, course_code, semester, **kwargs):
+        with self._lock:
+            self.held += 1
+            self.peak = max(self.peak, self.held)
+        result = super()._download(course_code, semester, **kwargs)
+
+        def written():
+            yield from result
+            with self._lock:
+                self.held -= 1
+
+        return written()
+
+
+def test_courses_in_memory_are_bounded(client, tmpdir, monkeypatch):
+    write = export._CsvWriter.write
+
+    def slow_write(self, rows):
+        time.sleep(0.002)
+        return write(self, rows)
+
+    monkeypatch.setattr(export._CsvWriter, 'write', slow_write)
+    exporter = TrackingExporter(client, max_workers=2)
+
+    result = exporter.export([f'C{i}' for i in range(12)], str(tmpdir))
+
+    assert result['definitions'][1] == 24
+    assert exporter.peak <= 2
+    assert exporter.held == 0
+
+
+def test_members_are_optional(client, tmpdir):
+    result = CourseExporter(client).export(['BI-PYT'], str(tmpdir))
+    assert 'members' not in result
+    assert not tmpdir.join('members.csv').exists()
+
+
+def test_unknown_format(client):
+    with pytest.raises(ValueError):
+        CourseExporter(client, format='xlsx')
+
+
+@pytest.mark.parametrize('format', ['parquet', 'arrow'])
+def test_columnar_export(client, tmpdir, format):
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet
+
+    result = CourseExporter(client, format=format, batch_size=3).export(
+        ['BI-PYT', 'BI-ZUM'], str(tmpdir))
+    path, rows = result['grades']
+
+    if format == 'parquet':
+        table = pyarrow.parquet.read_table(path)
+    else:
+        with pa.ipc.open_file(path) as reader:
+            table = reader.read_all()
+
+    assert table.num_rows == rows == 8
+    assert table.schema.field('number').type == pa.float64()
+    assert sorted(v for v in table.column('number').to_pylist()
+                  if v is not None) == [2.5, 2.5, 8.0, 8.0]
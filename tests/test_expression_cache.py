@@ -0,0 +1,86 @@
+from classification.entities import ExpressionParseRequestDto, \
+    ExpressionParseAllRequestDto
+from classification.expressioncache import ExpressionCache, MISS
+from fakes import FakeResponse
+import pytest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_key_ignores_dict_order():
+    key_1 = ExpressionCache.make_key('try_validity', {'a': 1, 'b': 2})
+    key_2 = ExpressionCache.make_key('try_validity', {'b': 2, 'a': 1})
+    assert key_1 == key_2
+    assert key_1 != ExpressionCache.make_key('evaluate_all', {'a': 1, 'b': 2})
+
+
+def test_lru_eviction():
+    cache = ExpressionCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert cache.get('b') is MISS
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+
+
+def test_ttl_expiration():
+    clock = FakeClock()
+    cache = ExpressionCache(ttl=10, clock=clock)
+    cache.put('a', {'valid': True})
+
+    clock.now = 9.9
+    assert cache.get('a') == {'valid': True}
+
+    clock.now = 10
+    assert cache.get('a') is MISS
+    assert len(cache) == 0
+
+
+def test_returned_values_are_copies():
+    cache = ExpressionCache()
+    cache.put('a', {'errors': []})
+    cache.get('a')['errors'].append('oops')
+    assert cache.get('a') == {'errors': []}
+
+
+def test_invalid_maxsize():
+    with pytest.raises(ValueError):
+        ExpressionCache(maxsize=0)
+
+
+def test_try_validity_hits_server_once(make_client):
+    def responder(method, url, **kwargs):
+        return FakeResponse(201, {'valid': True, 'echo': kwargs['json']})
+
+    client = make_client(responder, expression_cache=ExpressionCache())
+    dto = ExpressionParseRequestDto(expression='lab01 + lab02',
+                                    expected_result_type='NUMBER')
+
+    first = client.try_validity(dto)
+    second = client.try_validity({'expression': 'lab01 + lab02',
+                                  'expectedResultType': 'NUMBER'})
+    client.try_validity(ExpressionParseRequestDto(expression='lab01'))
+
+    assert first == second
+    assert len(client.session.calls) == 2
+
+
+def test_evaluate_all_and_try_validity_do_not_share_entries(make_client):
+    client = make_client(lambda method, url, **kwargs: FakeResponse(201, {}),
+                         expression_cache=ExpressionCache())
+
+    client.evaluate_all(ExpressionParseAllRequestDto(expressions=['x']))
+    client.evaluate_all(ExpressionParseAllRequestDto(expressions=['x']))
+    client.try_validity({'expressions': ['x']})
+
+    assert len(client.session.calls) == 2
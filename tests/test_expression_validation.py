@@ -0,0 +1,84 @@
+from fakes import FakeResponse
+import threading
+
+
+DEFINITIONS = [
+    {'identifier': 'lab01', 'calculated': False, 'valueType': 'NUMBER'},
+    {'identifier': 'lab02', 'calculated': False, 'valueType': 'NUMBER'},
+    {'identifier': 'total', 'calculated': True, 'valueType': 'NUMBER',
+     'expression': 'lab01 + lab02'},
+    {'identifier': 'sum', 'calculated': True, 'valueType': 'NUMBER',
+     'expression': 'lab01 + lab02'},
+    {'identifier': 'passed', 'calculated': True, 'valueType': 'BOOLEAN',
+     'expression': 'total > 50'},
+    {'identifier': 'mark', 'calculated': True, 'valueType': 'STRING',
+     'expression': 'mark(total)'},
+]
+
+
+def make_responder(answered=None):
+    lock = threading.Lock()
+    sent = {'evaluate_all': [], 'try_validity': []}
+
+    def responder(method, url, **kwargs):
+        if method == 'GET':
+            return FakeResponse(200, DEFINITIONS)
+
+        body = kwargs['json']
+        with lock:
+            if url.endswith('/course-expressions/analyses'):
+                sent['evaluate_all'].append(body['expressions'])
+                result = {k: {'valid': True, 'expression': e}
+                          for k, e in body['expressions'].items()
+                          if answered is None or k in answered}
+                return FakeResponse(201, result)
+
+            sent['try_validity'].append(body)
+            return FakeResponse(201, {'valid': False,
+                                      'expression': body['expression']})
+
+    return responder, sent
+
+
+def test_expressions_are_deduplicated_and_mapped_back(make_client):
+    responder, sent = make_responder()
+    client = make_client(responder)
+
+    results = client.validate_course_expressions('MI-PYT', 'B171')
+
+    assert len(sent['evaluate_all']) == 1
+    assert sorted(sent['evaluate_all'][0].values()) == \
+        ['lab01 + lab02', 'mark(total)', 'total > 50']
+    assert sent['try_validity'] == []
+
+    assert set(results) == {'total', 'sum', 'passed', 'mark'}
+    assert results['total'] == results['sum']
+    assert results['passed']['expression'] == 'total > 50'
+
+
+def test_expressions_are_split_into_batches(make_client):
+    responder, sent = make_responder()
+    client = make_client(responder)
+
+    results = client.validate_course_expressions('MI-PYT', batch_size=2)
+
+    assert sorted(len(batch) for batch in sent['evaluate_all']) == [1, 2]
+    assert len(results) == 4
+
+
+def test_leftovers_are_checked_one_by_one(make_client):
+    responder, sent = make_responder(answered={'total'})
+    client = make_client(responder)
+
+    results = client.validate_course_expressions('MI-PYT')
+
+    assert results['total']['valid'] is True
+    assert results['mark'] == {'valid': False, 'expression': 'mark(total)'}
+    assert sorted(b['expectedResultType'] for b in sent['try_validity']) \
+        == ['BOOLEAN', 'STRING']
+
+
+def test_no_calculated_classifications(make_client):
+    client = make_client(lambda method, url, **kwargs:
+                         FakeResponse(200, DEFINITIONS[:2]))
+    assert client.validate_course_expressions('MI-PYT') is None
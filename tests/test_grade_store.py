@@ -0,0 +1,166 @@
+from classification.entities import StudentClassificationPreviewDto
+from classification.gradestore import GradeStore
+from fakes import FakePortal, FakeResponse
+import pytest
+
+
+DEFINITIONS = [{'identifier': 'hw1', 'minimumRequiredValue': 5.0,
+                'mandatory': True},
+               {'identifier': 'hw2', 'minimumRequiredValue': 5.0,
+                'mandatory': False},
+               {'identifier': 'exam', 'minimumRequiredValue': 50,
+                'mandatory': True},
+               {'identifier': 'passed'}]
+
+
+@pytest.fixture
+def portal():
+    return FakePortal(DEFINITIONS,
+                      groups={'g1': ['alice', 'bob'], 'g2': ['carol']},
+                      grades={'alice': {'hw1': 8.0, 'exam': 70,
+                                        'passed': True},
+                              'bob': {'hw1': 3.0, 'hw2': 1.0, 'exam': 50},
+                              'carol': {'hw1': 5.0, 'exam': 12.5},
+                              'dave': {}})
+
+
+@pytest.fixture
+def store(make_client, portal):
+    return GradeStore(make_client(portal), 'BI-PYT').load()
+
+
+def test_load_builds_indexes(store):
+    assert sorted(store.students()) == ['alice', 'bob', 'carol', 'dave']
+    assert store.student('bob') == {'hw1': 3.0, 'hw2': 1.0, 'exam': 50}
+    assert store.task('exam') == {'alice': 70, 'bob': 50, 'carol': 12.5}
+    assert store.group('g1') == {'alice': store.student('alice'),
+                                 'bob': store.student('bob')}
+    assert set(store.group()) == {'alice', 'bob', 'carol', 'dave'}
+    assert store.groups_of('carol') == ['g2']
+
+
+def test_range(store):
+    assert store.range('hw1') == {'bob': 3.0, 'carol': 5.0, 'alice': 8.0}
+    assert list(store.range('hw1', 3.0, 5.0)) == ['bob', 'carol']
+    assert list(store.range('hw1', maximum=5.0,
+                            exclusive_maximum=True)) == ['bob']
+    assert store.range('passed') == {}
+    assert store.range('unknown', 0) == {}
+
+
+def test_below_minimum(store):
+    assert store.below_minimum() == {'bob': ['hw1'], 'carol': ['exam']}
+    assert store.below_minimum(mandatory_only=False) == \
+        {'bob': ['hw1', 'hw2'], 'carol': ['exam']}
+    assert store.below_minimum(include_missing=True)['dave'] == \
+        ['exam', 'hw1']
+
+
+def test_saves_update_indexes(store, portal):
+    store.save_student_classifications_simple_s2t({'bob': {'hw1': 9.0}})
+    store.save_student_classifications_simple_t2s({'exam': {'dave': 1}})
+    store.save_student_classifications([StudentClassificationPreviewDto(
+        classification_identifier='exam', student_username='carol',
+        value='absent')])
+
+    assert portal.grades['bob']['hw1'] == 9.0
+    assert store.range('hw1') == {'carol': 5.0, 'alice': 8.0, 'bob': 9.0}
+    assert store.task('exam') == {'alice': 70, 'bob': 50, 'carol': 'absent',
+                                  'dave': 1}
+    assert store.below_minimum() == {'dave': ['exam']}
+
+
+def test_failed_save_keeps_indexes(make_client):
+    portal = FakePortal(DEFINITIONS, grades={'bob': {'hw1': 3.0}})
+    store = GradeStore(make_client(portal), 'BI-PYT').load()
+    portal.grades = None  # breaks the fake server
+
+    with pytest.raises(Exception):
+        store.save_student_classifications_simple_s2t({'bob': {'hw1': 9.0}})
+
+    assert store.student('bob') == {'hw1': 3.0}
+
+
+class CalculatingPortal(FakePortal):
+    """Recomputes the calculated ``total`` after every save."""
+
+    def __call__(self, method, url, **kwargs):
+        resp = super().__call__(method, url, **kwargs)
+        if method == 'PUT':
+            for grades in self.grades.values():
+                grades['total'] = grades.get('hw1', 0) + grades.get('exam', 0)
+        return resp
+
+
+TOTAL = {'identifier': 'total', 'calculated': True,
+         'minimumRequiredValue': 60, 'mandatory': True}
+
+
+def test_saves_refresh_calculated_values(make_client):
+    portal = CalculatingPortal([TOTAL], grades={
+        'alice': {'hw1': 8.0, 'exam': 70, 'total': 78.0},
+        'bob': {'hw1': 3.0, 'exam': 50, 'total': 53.0}})
+    store = GradeStore(make_client(portal), 'BI-PYT').load(groups=False)
+    assert store.below_minimum() == {'bob': ['total']}
+
+    store.save_student_classifications_simple_s2t({'bob': {'exam': 60}})
+
+    assert store.student('bob') == {'hw1': 3.0, 'exam': 60, 'total': 63.0}
+    assert store.range('total') == {'bob': 63.0, 'alice': 78.0}
+    assert store.below_minimum() == {}
+
+
+def test_failed_refresh_drops_calculated_values(make_client):
+    portal = CalculatingPortal([TOTAL], grades={
+        'bob': {'hw1': 3.0, 'exam': 50, 'total': 53.0}})
+    client = make_client(lambda method, url, **kwargs: portal(
+        method, url, **kwargs) if method == 'PUT' else FakeResponse(503))
+    store = GradeStore(client, 'BI-PYT')
+    store.set_definitions([TOTAL])
+    store.add_records([{'username': 'bob',
+                        'classificationMap': dict(portal.grades['bob'])}])
+
+    with pytest.raises(Exception):
+        store.save_student_classifications_simple_s2t({'bob': {'exam': 60}})
+
+    assert store.student('bob') == {'hw1': 3.0, 'exam': 60}
+    assert store.range('total') == {}
+
+
+def test_bulk_indexes_match_single_updates():
+    records = [{'username': f's{i:03d}',
+                'classificationMap': {'hw1': (i * 7) % 13, 'hw2': i % 3,
+                                      'note': str(i)}}
+               for i in range(200)]
+    bulk = GradeStore()
+    bulk.add_records(records[:120])
+    bulk.add_records(records[80:] + [dict(records[5], classificationMap={
+        'hw1': 99})])
+
+    single = GradeStore()
+    for record in records + [dict(records[5], classificationMap={
+            'hw1': 99})]:
+        for identifier in list(single.student(record['username'])):
+            single._set(record['username'], identifier, None, remove=True)
+        for identifier, value in record['classificationMap'].items():
+            single._set(record['username'], identifier, value)
+
+    for identifier in ('hw1', 'hw2', 'note'):
+        assert bulk._entries.get(identifier, []) == \
+            single._entries.get(identifier, [])
+        assert bulk._keys.get(identifier, []) == \
+            single._keys.get(identifier, [])
+        assert bulk.task(identifier) == single.task(identifier)
+    assert bulk.student('s005') == {'hw1': 99}
+
+
+def test_add_records_replaces_student():
+    store = GradeStore()
+    store.add_records([{'username': 'bob',
+                        'classificationMap': {'hw1': 1, 'hw2': 2}}])
+    store.add_records([{'username': 'bob',
+                        'classificationMap': {'hw1': 4}}])
+
+    assert store.student('bob') == {'hw1': 4}
+    assert store.range('hw1') == {'bob': 4}
+    assert store.range('hw2') == {}
@@ -0,0 +1,89 @@
+from classification.exceptions import ColumnMappingError
+from classification.importer import GradeImporter
+from fakes import FakePortal
+import pytest
+
+
+DEFINITIONS = [{'identifier': 'hw1', 'valueType': 'NUMBER'},
+               {'identifier': 'bonus', 'valueType': 'BOOLEAN'},
+               {'identifier': 'note', 'valueType': 'STRING'},
+               {'identifier': 'total', 'valueType': 'NUMBER',
+                'calculated': True, 'expression': 'hw1'}]
+
+
+@pytest.fixture
+def portal():
+    return FakePortal(DEFINITIONS)
+
+
+def write_sheet(tmpdir, text):
+    path = tmpdir.join('sheet.csv')
+    path.write_text(text, encoding='utf-8-sig')
+    return str(path)
+
+
+def test_csv_is_saved_in_chunks(make_client, portal, tmpdir):
+    rows = '\n'.join(f'student{i},{i},ano,' for i in range(10))
+    path = write_sheet(tmpdir, 'username,hw1,bonus,note\n' + rows + '\n')
+    progress = []
+
+    importer = GradeImporter(make_client(portal), 'BI-PYT', chunk_size=3,
+                             max_workers=2, progress=progress.append)
+    stats = importer.import_csv(path)
+
+    assert stats == {'rows': 10, 'grades': 20, 'chunks': 7}
+    assert [p['chunks'] for p in progress] == list(range(1, 8))
+    assert sorted(len(body) for body in portal.saved) == [2] + [3] * 6
+    assert portal.grades['student7'] == {'hw1': 7.0, 'bonus': True}
+
+
+def test_column_mapping_and_locale(make_client, portal, tmpdir):
+    path = write_sheet(tmpdir, 'login;Úkol 1;Poznámka;Ignored\n'
+                               'novak;7,5;Výborně;x\n'
+                               ';1;2;3\n')
+
+    importer = GradeImporter(make_client(portal), 'BI-PYT',
+                             username_column='login',
+                             columns={'Úkol 1': 'hw1', 'Poznámka': 'note'})
+    stats = importer.import_csv(path, delimiter=';')
+
+    assert stats['grades'] == 2
+    assert portal.grades == {'novak': {'hw1': 7.5, 'note': 'Výborně'}}
+
+
+def test_invalid_columns_save_nothing(make_client, portal, tmpdir):
+    path = write_sheet(tmpdir, 'user,hw1,total,hw9\nnovak,1,2,3\n')
+
+    with pytest.raises(ColumnMappingError) as info:
+        GradeImporter(make_client(portal), 'BI-PYT').import_csv(path)
+
+    assert len(info.value.problems) == 4
+    assert portal.saved == []
+
+
+def test_invalid_cell(make_client, portal):
+    importer = GradeImporter(make_client(portal), 'BI-PYT', chunk_size=1)
+    rows = [{'username': 'a', 'bonus': 'yes'},
+            {'username': 'b', 'bonus': 'maybe'}]
+
+    with pytest.raises(ColumnMappingError, match='Row 2'):
+        importer.import_rows(iter(rows), ['username', 'bonus'])
+
+    assert portal.grades == {'a': {'bonus': True}}
+
+
+def test_parquet(make_client, portal, tmpdir):
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet
+
+    path = str(tmpdir.join('sheet.parquet'))
+    pyarrow.parquet.write_table(pa.table({
+        'username': ['a', 'b', 'c'], 'hw1': [1.5, None, 3.0],
+        'bonus': [True, False, None]}), path)
+
+    stats = GradeImporter(make_client(portal), 'BI-PYT') \
+        .import_parquet(path, batch_size=2)
+
+    assert stats['grades'] == 4
+    assert portal.grades == {'a': {'hw1': 1.5, 'bonus': True},
+                             'b': {'bonus': False}, 'c': {'hw1': 3.0}}
@@ -0,0 +1,115 @@
+from classification.expressioncache import ExpressionCache
+from classification.instrumentation import Histogram, Instrumentation
+from classification.retrying import RetryPolicy
+from fakes import FakeResponse
+from requests.exceptions import ConnectionError
+import pytest
+
+
+def test_histogram_is_cumulative():
+    histogram = Histogram([1, 5])
+    for value in [0.5, 1, 3, 10]:
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [(1, 2), (5, 3), (float('inf'), 4)]
+    assert histogram.snapshot() == {'buckets': {'1.0': 2, '5.0': 3,
+                                                '+Inf': 4},
+                                    'count': 4, 'sum': 14.5}
+
+
+def scripted(*responses):
+    responses = list(responses)
+
+    def responder(method, url, **kwargs):
+        resp = responses.pop(0)
+        if isinstance(resp, Exception):
+            raise resp
+        return resp
+
+    return responder
+
+
+def test_requests_are_measured(make_client):
+    metrics = Instrumentation()
+    client = make_client(scripted(FakeResponse(503),
+                                  FakeResponse(200, ['laskobor'])),
+                         instrumentation=metrics,
+                         retry_policy=RetryPolicy(sleep=lambda s: None))
+
+    client.get_editors('MI-PYT')
+    snapshot = metrics.snapshot()
+
+    editors = snapshot['endpoints']['get_editors']
+    assert editors['latency']['count'] == 2
+    assert editors['responses'] == {'503': 1, '200': 1}
+    assert editors['size']['sum'] == len(b'["laskobor"]')
+    assert snapshot['counters']['retries'] == {'get_editors': 1}
+    assert snapshot['stages']['decode']['count'] == 1
+
+
+def test_hooks_are_called(make_client):
+    metrics = Instrumentation()
+    events = []
+    metrics.add_pre_request_hook(
+        lambda endpoint, method, url, kwargs: events.append(('pre', method)))
+    metrics.add_post_request_hook(
+        lambda endpoint, method, url, resp, duration, error:
+        events.append(('post', type(error).__name__ if error else
+                       resp.status_code)))
+
+    client = make_client(scripted(FakeResponse(204),
+                                  ConnectionError('reset')),
+                         instrumentation=metrics)
+    client.delete_editor('MI-PYT', 'laskobor')
+    with pytest.raises(ConnectionError):
+        client.delete_editor('MI-PYT', 'laskobor')
+
+    assert events == [('pre', 'DELETE'), ('post', 204),
+                      ('pre', 'DELETE'), ('post', 'ConnectionError')]
+    assert metrics.snapshot()['endpoints']['delete_editor']['responses'] \
+        == {'204': 1, 'error': 1}
+
+
+def test_cache_hits_and_stages_are_counted(make_client):
+    metrics = Instrumentation()
+    client = make_client(lambda method, url, **kwargs: FakeResponse(201, {}),
+                         instrumentation=metrics,
+                         expression_cache=ExpressionCache())
+
+    client.try_validity({'expression': '1 + 1'})
+    client.try_validity({'expression': '1 + 1'})
+    client.save_student_classifications_simple_s2t('MI-PYT',
+                                                   {'s': {'lab01': 1}})
+    snapshot = metrics.snapshot()
+
+    assert snapshot['counters']['cache_hits'] == {'try_validity': 1}
+    assert snapshot['counters']['cache_misses'] == {'try_validity': 1}
+    assert snapshot['stages']['serialize']['count'] == 3
+    assert snapshot['stages']['convert']['count'] == 1
+
+
+def test_prometheus_export(make_client):
+    metrics = Instrumentation(namespace='portal')
+    client = make_client(scripted(FakeResponse(200, {})),
+                         instrumentation=metrics)
+    client.get_settings()
+    metrics.increment('token_refreshes')
+
+    text = metrics.to_prometheus()
+
+    assert '# TYPE portal_request_duration_seconds histogram' in text
+    assert 'portal_request_duration_seconds_count' \
+           '{endpoint="get_settings"} 1' in text
+    assert 'portal_responses_total{endpoint="get_settings",' \
+           'status="200"} 1' in text
+    assert 'portal_token_refreshes_total 1' in text
+    assert 'portal_stage_duration_seconds_bucket{stage="decode",' \
+           'le="+Inf"} 1' in text
+
+
+def test_reset():
+    metrics = Instrumentation()
+    metrics.increment('retries', 'get_settings')
+    metrics.reset()
+    assert metrics.snapshot() == {'endpoints': {}, 'counters': {},
+                                  'stages': {}}
@@ -0,0 +1,87 @@
+from classification import GradeJournal
+from fakes import FakePortal, FakeResponse
+import json
+import pytest
+import requests
+
+
+GRADES = {f'student{i}': {'hw1': i, 'hw2': i + 1} for i in range(5)}
+
+
+@pytest.fixture
+def journal(tmp_path):
+    with GradeJournal(str(tmp_path / 'journal.jsonl'),
+                      chunk_size=4) as journal:
+        yield journal
+
+
+def failing_after(portal, successes):
+    calls = []
+
+    def responder(method, url, **kwargs):
+        calls.append(url)
+        if len(calls) > successes:
+            return FakeResponse(503)
+        return portal(method, url, **kwargs)
+
+    return responder
+
+
+def test_successful_upload_leaves_nothing_pending(make_client, journal):
+    portal = FakePortal()
+
+    stats = journal.save_s2t(make_client(portal), 'MI-PYT', GRADES)
+
+    assert stats == {'chunks': 3, 'grades': 10}
+    assert [len(body) for body in portal.saved] == [4, 4, 2]
+    assert portal.grades == GRADES
+    assert journal.pending() == []
+
+
+def test_only_uncommitted_chunks_are_replayed(make_client, journal):
+    portal = FakePortal()
+
+    with pytest.raises(requests.HTTPError):
+        journal.save_s2t(make_client(failing_after(portal, 1)),
+                         'MI-PYT', GRADES, semester='B192')
+
+    pending = journal.pending()
+    assert [len(chunk['body']) for chunk in pending] == [4, 2]
+    assert {chunk['semester'] for chunk in pending} == {'B192'}
+
+    stats = journal.replay(make_client(portal))
+
+    assert stats == {'chunks': 2, 'grades': 6}
+    assert [len(body) for body in portal.saved] == [4, 4, 2]
+    assert portal.grades == GRADES
+    assert journal.replay(make_client(portal)) == {'chunks': 0, 'grades': 0}
+
+
+def test_incomplete_record_is_ignored(make_client, journal):
+    portal = FakePortal()
+    with open(journal.path, 'w') as f:
+        f.write(json.dumps({'op': 'write', 'id': 'a', 'course_code': 'C',
+                            'semester': None,
+                            'body': [{'classificationIdentifier': 'hw1',
+                                      'studentUsername': 'alice',
+                                      'value': 1}]}) + '\n')
+        f.write('{"op": "write", "id": "b", "cour')
+
+    journal.save_s2t(make_client(portal), 'MI-PYT', {'bob': {'hw1': 2}})
+
+    assert [c['id'] for c in journal.pending()] == ['a']
+
+
+def test_compact(make_client, journal):
+    portal = FakePortal()
+    journal.save_s2t(make_client(portal), 'MI-PYT', GRADES)
+    with pytest.raises(requests.HTTPError):
+        journal.save_t2s(make_client(failing_after(portal, 0)), 'MI-PYT',
+                         {'hw3': {'alice': 1}})
+
+    journal.compact()
+
+    with open(journal.path) as f:
+        assert len(f.readlines()) == 1
+    assert journal.replay(make_client(portal)) == {'chunks': 1, 'grades': 1}
+    assert portal.grades['alice'] == {'hw3': 1}
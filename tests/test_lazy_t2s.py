@@ -0,0 +1,57 @@
+from classification import ClassificationParamsProxy
+from classification.payloadconverters import TransposedView
+from fakes import FakePortal, FakeSession
+import pytest
+
+
+GRADES = {'alice': {'hw1': 1, 'hw2': 2, 'exam': 30},
+          'bob': {'hw1': 3, 'exam': 40},
+          'carol': {'hw2': 4}}
+
+
+@pytest.fixture
+def portal():
+    return FakePortal(grades={u: dict(g) for u, g in GRADES.items()})
+
+
+def test_lazy_result_matches_eager(make_client, portal):
+    client = make_client(portal)
+
+    eager = client.find_student_group_classifications_simple_t2s('BI-PYT')
+    lazy = client.find_student_group_classifications_simple_t2s(
+        'BI-PYT', lazy=True)
+
+    assert isinstance(lazy, TransposedView)
+    assert lazy['hw2'] == {'alice': 2, 'carol': 4}
+    assert lazy == eager
+    assert lazy.materialize() == eager
+    assert type(lazy.materialize()) is dict
+
+
+def test_only_accessed_columns_are_built(make_client, portal):
+    client = make_client(portal)
+    lazy = client.find_student_group_classifications_simple_t2s(
+        'BI-PYT', lazy=True)
+
+    assert lazy['exam'] == {'alice': 30, 'bob': 40}
+    assert list(lazy._columns) == ['exam']
+
+
+def test_lazy_result_can_be_saved_back(make_client, portal):
+    client = make_client(portal)
+    lazy = client.find_student_group_classifications_simple_t2s(
+        'BI-PYT', lazy=True)
+    lazy['hw1']['bob'] = 5
+
+    client.save_student_classifications_simple_t2s('BI-PYT', lazy)
+
+    assert portal.grades['bob'] == {'hw1': 5, 'exam': 40}
+    assert len(portal.saved[0]) == 6
+
+
+def test_proxy_passes_lazy(portal):
+    proxy = ClassificationParamsProxy('dummy', 'dummy',
+                                      session=FakeSession(portal),
+                                      course_code='BI-PYT', group_code='ALL')
+    lazy = proxy.find_student_group_classifications_simple_t2s(lazy=True)
+    assert lazy['hw1'] == {'alice': 1, 'bob': 3}
@@ -0,0 +1,113 @@
+from classification.mirror import GradeMirror
+from fakes import FakePortal
+import pytest
+
+
+DEFINITIONS = [{'identifier': 'hw1', 'valueType': 'NUMBER',
+                'minimumRequiredValue': 5.0, 'mandatory': True},
+               {'identifier': 'hw2', 'valueType': 'NUMBER'},
+               {'identifier': 'passed', 'valueType': 'BOOLEAN',
+                'calculated': True, 'expression': 'hw1 >= 5'}]
+
+
+@pytest.fixture
+def portal():
+    return FakePortal(DEFINITIONS,
+                      groups={'g1': ['alice', 'bob'], 'g2': ['carol']},
+                      grades={'alice': {'hw1': 8.0, 'passed': True},
+                              'bob': {'hw1': 3.0, 'hw2': 10.0},
+                              'carol': {'hw2': 4.5},
+                              'dave': {}})
+
+
+@pytest.fixture
+def mirror(make_client, portal, tmpdir):
+    client = make_client(portal)
+    mirror = GradeMirror(client, str(tmpdir.join('mirror', 'db.sqlite')))
+    yield mirror
+    mirror.close()
+
+
+def test_sync_stores_course(mirror):
+    stats = mirror.sync('BI-PYT')
+
+    assert stats['inserted'] == 5
+    assert [d['identifier'] for d in mirror.definitions('BI-PYT')] == \
+        ['hw1', 'hw2', 'passed']
+    assert mirror.groups('BI-PYT') == [{'code': 'g1', 'name': 'G1'},
+                                       {'code': 'g2', 'name': 'G2'}]
+    assert mirror.student('BI-PYT', 'alice') == {'hw1': 8.0, 'passed': True}
+    assert mirror.task('BI-PYT', 'hw2') == {'bob': 10.0, 'carol': 4.5}
+    assert mirror.group('BI-PYT', 'g1') == {
+        'alice': {'hw1': 8.0, 'passed': True},
+        'bob': {'hw1': 3.0, 'hw2': 10.0}}
+    assert mirror.group('BI-PYT')['dave'] == {}
+
+
+def test_filtered_queries(mirror):
+    mirror.sync('BI-PYT')
+
+    assert mirror.s2t('BI-PYT', identifier='hw1', maximum=4.99) == \
+        {'bob': {'hw1': 3.0}}
+    assert mirror.s2t('BI-PYT', group_code='g1', minimum=9) == \
+        {'bob': {'hw2': 10.0}}
+    assert mirror.s2t('BI-PYT', semester='B201') == {}
+
+
+def test_sync_applies_only_changes(mirror, make_client, portal):
+    mirror.sync('BI-PYT')
+    calls = len(mirror.client.session.calls)
+
+    unchanged = mirror.sync('BI-PYT')
+    assert unchanged['changed'] == []
+    assert len(mirror.client.session.calls) == calls * 2
+
+    portal.grades['alice']['hw1'] = 9.0
+    portal.grades['carol']['hw1'] = 1.0
+    del portal.grades['bob']['hw2']
+    portal.groups['g2'].append('dave')
+
+    stats = mirror.sync('BI-PYT')
+    assert stats['changed'] == ['grades', 'group:g2']
+    assert (stats['inserted'], stats['updated'], stats['deleted']) == \
+        (1, 1, 1)
+    assert mirror.task('BI-PYT', 'hw1') == \
+        {'alice': 9.0, 'bob': 3.0, 'carol': 1.0}
+    assert set(mirror.group('BI-PYT', 'g2')) == {'carol', 'dave'}
+
+
+def test_removed_group_is_forgotten(mirror, portal):
+    mirror.sync('BI-PYT')
+    del portal.groups['g2']
+
+    stats = mirror.sync('BI-PYT')
+
+    assert 'group:g2' in stats['changed']
+    assert mirror.group('BI-PYT', 'g2') == {}
+
+
+def test_fresh_course_is_not_downloaded(make_client, portal, tmpdir):
+    now = [1000.0]
+    client = make_client(portal)
+    mirror = GradeMirror(client, str(tmpdir.join('db.sqlite')),
+                         clock=lambda: now[0])
+    mirror.sync('BI-PYT')
+    assert mirror.synced_at('BI-PYT') == 1000.0
+    calls = len(client.session.calls)
+
+    now[0] += 30
+    assert mirror.sync('BI-PYT', max_age=60)['skipped']
+    assert len(client.session.calls) == calls
+
+    now[0] += 60
+    assert not mirror.sync('BI-PYT', max_age=60)['skipped']
+    assert mirror.synced_at('BI-PYT') == 1090.0
+
+
+def test_sync_many_and_semesters(mirror):
+    results = mirror.sync_many(['BI-PYT', 'BI-ZUM'], semester='B201')
+
+    assert set(results) == {'BI-PYT', 'BI-ZUM'}
+    assert mirror.student('BI-ZUM', 'bob', 'B201') == \
+        {'hw1': 3.0, 'hw2': 10.0}
+    assert mirror.student('BI-ZUM', 'bob') == {}
@@ -0,0 +1,187 @@
+from classification.orchestration import Plan, Orchestrator
+from classification.retrying import RetryPolicy
+from fakes import FakeResponse, FakePortal
+from requests import HTTPError
+from requests.exceptions import ReadTimeout
+import threading
+import time
+import pytest
+
+
+class Recorder:
+    """A client whose methods record their calls."""
+
+    def __init__(self, failures=None, delay=0):
+        self.calls = []
+        self.failures = dict(failures or {})
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        def method(*args, **kwargs):
+            with self._lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+            time.sleep(self.delay)
+            with self._lock:
+                self.running -= 1
+                self.calls.append((name,) + args)
+                left = self.failures.get(args, 0)
+                if left:
+                    self.failures[args] = left - 1
+                    raise HTTPError(response=FakeResponse(503))
+            return list(args)
+        return method
+
+
+TEMPLATE = [{'name': 'clone:{course}',
+             'method': 'clone_classification_definitions',
+             'args': ['B192', '{course}', 'B191', '{course}', False]},
+            {'name': 'groups:{course}', 'method': 'get_course_groups',
+             'args': ['{course}']},
+            {'name': 'editor:{course}', 'method': 'add_editor',
+             'args': ['{course}', 'novakjan'],
+             'requires': ['clone:{course}', 'groups:{course}']}]
+
+
+def test_order_respects_requirements():
+    plan = Plan()
+    plan.add('c', 'get_editors', requires=['b'])
+    plan.add('b', 'get_editors', requires=['a'])
+    plan.add('a', 'get_editors')
+    assert [s.name for s in plan.order()] == ['a', 'b', 'c']
+
+
+@pytest.mark.parametrize('steps', [
+    [{'name': 'a', 'method': 'm', 'requires': ['b']},
+     {'name': 'b', 'method': 'm', 'requires': ['a']}],
+    [{'name': 'a', 'method': 'm', 'requires': ['missing']}],
+])
+def test_invalid_plans(steps):
+    with pytest.raises(ValueError):
+        Plan.from_dict({'steps': steps}).order()
+
+
+def test_duplicate_step():
+    plan = Plan()
+    plan.add('a', 'get_editors')
+    with pytest.raises(ValueError):
+        plan.add('a', 'get_editors')
+
+
+def test_run_with_bounded_parallelism():
+    client = Recorder(delay=0.01)
+    plan = Plan.for_courses([f'C{i}' for i in range(6)], TEMPLATE)
+
+    result = Orchestrator(client, max_workers=3).run(plan)
+
+    assert result.ok
+    assert result.done['editor:C4'] == ['C4', 'novakjan']
+    assert client.peak == 3
+    calls = [c[0] for c in client.calls]
+    for course in range(6):
+        editor = client.calls.index(('add_editor', f'C{course}',
+                                     'novakjan'))
+        clone = client.calls.index(('clone_classification_definitions',
+                                    'B192', f'C{course}', 'B191',
+                                    f'C{course}', False))
+        assert clone < editor
+    assert len(calls) == 18
+
+
+def test_failures_are_retried_or_skip_dependents():
+    client = Recorder(failures={('C1',): 1, ('C2',): 5})
+    plan = Plan.for_courses(['C1', 'C2'], TEMPLATE)
+    policy = RetryPolicy(max_attempts=3, sleep=lambda s: None)
+
+    result = Orchestrator(client, retry_policy=policy).run(plan)
+
+    assert 'editor:C1' in result.done
+    assert list(result.failed) == ['groups:C2']
+    assert result.skipped == ['editor:C2']
+    assert not result.ok
+
+
+@pytest.mark.parametrize('retry_post, calls', [(False, 1), (True, 2)])
+def test_post_steps_are_retried_only_if_allowed(make_client, retry_post,
+                                                calls):
+    outcomes = [ReadTimeout('slow'), FakeResponse(201)]
+
+    def responder(method, url, **kwargs):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    client = make_client(responder)
+    plan = Plan()
+    plan.add('save', 'save_classification', 'MI-PYT', {'identifier': 'hw'})
+    policy = RetryPolicy(max_attempts=3, retry_post=retry_post,
+                         sleep=lambda s: None)
+
+    result = Orchestrator(client, retry_policy=policy).run(plan)
+
+    assert len(client.session.calls) == calls
+    assert result.ok == retry_post
+    if not retry_post:
+        assert isinstance(result.failed['save'], ReadTimeout)
+
+
+def test_checkpoint_resumes(tmpdir):
+    checkpoint = str(tmpdir.join('run.json'))
+    plan = Plan.for_courses(['C1', 'C2'], TEMPLATE)
+
+    client = Recorder(failures={('C2',): 1})
+    first = Orchestrator(client, checkpoint=checkpoint).run(plan)
+    assert list(first.failed) == ['groups:C2']
+
+    client = Recorder()
+    second = Orchestrator(client, checkpoint=checkpoint).run(plan)
+
+    assert second.ok
+    assert sorted(client.calls) == [('add_editor', 'C2', 'novakjan'),
+                                    ('get_course_groups', 'C2')]
+    assert second.done['clone:C1'] == ['B192', 'C1', 'B191', 'C1', False]
+
+
+def test_run_with_real_client(make_client):
+    portal = FakePortal(groups={'101': ['alice']})
+    client = make_client(portal)
+    plan = Plan.for_courses(['MI-PYT', 'BI-PYT'], [
+        {'name': 'groups:{course}', 'method': 'get_course_groups',
+         'args': ['{course}'], 'kwargs': {'semester': 'B192'}},
+        {'name': 'editor:{course}', 'method': 'add_editor',
+         'args': ['{course}', 'novakjan'], 'kwargs': {'timeout': 10},
+         'requires': ['groups:{course}']}])
+
+    result = Orchestrator(client).run(plan)
+
+    assert result.ok
+    assert result.done['groups:MI-PYT'] == [{'code': '101',
+                                             'name': '101'}]
+    assert portal.editors == {'MI-PYT': {'novakjan'},
+                              'BI-PYT': {'novakjan'}}
+
+
+@pytest.mark.parametrize('step', [
+    {'method': 'clone_classification_definitions',
+     'args': ['B192', 'MI-PYT', 'B191', 'MI-PYT']},
+    {'method': 'add_editor', 'args': ['MI-PYT', 'novakjan'],
+     'kwargs': {'semester': 'B192'}},
+    {'method': 'get_course_groups', 'args': ['MI-PYT', 'B192', 'cs', 'x',
+                                             'y']},
+    {'method': 'no_such_method'},
+])
+def test_invalid_steps_fail_before_anything_runs(make_client, step):
+    client = make_client(FakePortal())
+    plan = Plan.from_dict({'steps': [
+        {'name': 'editors', 'method': 'get_editors', 'args': ['MI-PYT']},
+        dict(step, name='bad')]})
+
+    with pytest.raises(ValueError) as e:
+        Orchestrator(client).run(plan)
+
+    assert '"bad"' in str(e.value)
+    assert client.session.calls == []
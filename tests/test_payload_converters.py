@@ -1,5 +1,6 @@
 from classification import entities, payloadconverters
 from pytest import fixture
+import pytest
 
 
 def test_student_to_tasks_to_save_request_conversion():
@@ -199,3 +200,48 @@ def test_task_to_students_from_get_response_converter(get_request_payload):
                 }
     actual = payloadconverters.t2s_from_get_response(input)
     assert actual == expected
+
+
+def test_s2t_variants_agree(get_request_payload):
+    expected = payloadconverters.s2t_from_get_response(get_request_payload)
+
+    shared = payloadconverters.s2t_from_get_response(get_request_payload,
+                                                     copy=False)
+
+    assert shared == expected
+    assert shared['student_1'] is \
+        get_request_payload[0]['classificationMap']
+    assert expected['student_1'] is not \
+        get_request_payload[0]['classificationMap']
+
+
+def test_save_request_as_dicts():
+    s2t = {'student_1': {'lab1': 5, 'lab2': None}}
+    t2s = {'lab1': {'student_1': 5}, 'lab2': {'student_1': None}}
+
+    expected = [dto.to_dict()
+                for dto in payloadconverters.save_request_from_s2t(s2t)]
+
+    assert payloadconverters.save_request_from_s2t(s2t, as_dicts=True) == \
+        payloadconverters.save_request_from_t2s(t2s, as_dicts=True) == \
+        expected
+    assert expected[1] == {'classificationIdentifier': 'lab2',
+                           'studentUsername': 'student_1'}
+
+
+def test_transposed_view(get_request_payload):
+    s2t = payloadconverters.s2t_from_get_response(get_request_payload)
+    t2s = payloadconverters.t2s_from_get_response(get_request_payload)
+
+    view = payloadconverters.TransposedView(s2t)
+
+    assert view['pandas'] == t2s['pandas']
+    assert 'wt3' in view and 'missing' not in view
+    assert list(view) == list(t2s)
+    assert len(view) == len(t2s)
+    assert view == t2s
+    assert view.materialize() == t2s
+    assert payloadconverters.TransposedView(t2s).materialize() == s2t
+
+    with pytest.raises(KeyError):
+        view['missing']
@@ -0,0 +1,87 @@
+from classification.classification import Classification
+from classification.endpoints import ENDPOINTS
+from classification.ratelimiting import TokenBucket, SQLiteTokenBucket, \
+    RateLimiter
+from fakes import FakeResponse
+import inspect
+import re
+import pytest
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_bucket_allows_burst_then_waits():
+    time = FakeTime()
+    bucket = TokenBucket(rate=2, capacity=3, clock=time.clock,
+                         sleep=time.sleep)
+
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert bucket.acquire() == pytest.approx(0.5)
+
+    time.now += 10
+    assert bucket.acquire() == 0
+
+
+def test_bucket_rejects_invalid_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_sqlite_buckets_share_state(tmp_path):
+    time = FakeTime()
+    path = str(tmp_path / 'limits' / 'buckets.sqlite')
+    first = SQLiteTokenBucket(path, 'portal', rate=1, capacity=2,
+                              clock=time.clock, sleep=time.sleep)
+    second = SQLiteTokenBucket(path, 'portal', rate=1, capacity=2,
+                               clock=time.clock, sleep=time.sleep)
+    other = SQLiteTokenBucket(path, 'other', rate=1, capacity=1,
+                              clock=time.clock, sleep=time.sleep)
+
+    assert first.acquire() == 0
+    assert second.acquire() == 0
+    assert first.acquire() == pytest.approx(1)
+    assert other.acquire() == 0
+
+
+def test_rate_limiter_groups():
+    time = FakeTime()
+    editors = TokenBucket(rate=1, clock=time.clock, sleep=time.sleep)
+    limiter = RateLimiter(groups={'editor': editors})
+
+    assert limiter.acquire('editor') == 0
+    assert limiter.acquire('editor') == pytest.approx(1)
+    assert limiter.acquire('settings') == 0
+
+
+def test_every_api_call_belongs_to_a_group():
+    source = inspect.getsource(Classification)
+    used = set(re.findall(r"self\._request\(\s*'(\w+)'", source))
+    grouped = {e for endpoints in Classification.ENDPOINT_GROUPS.values()
+               for e in endpoints}
+    assert used == grouped == set(ENDPOINTS)
+
+
+def test_client_goes_through_limiter(make_client):
+    acquired = []
+    limiter = RateLimiter()
+    limiter.acquire = acquired.append
+
+    client = make_client(lambda method, url, **kwargs: FakeResponse(200, [1]),
+                         rate_limiter=limiter)
+    client.get_editors('MI-PYT')
+    client.find_student_group_classifications('MI-PYT')
+    client.get_course_groups('MI-PYT')
+
+    assert acquired == ['editor', 'student_classification', 'student_group']
@@ -0,0 +1,95 @@
+import gzip
+import io
+import json
+import urllib3
+from classification import ClassificationParamsProxy
+from classification.singleflight import SingleFlight
+from classification.utils import RawResponse
+from fakes import FakePortal, FakeResponse, FakeSession
+import pytest
+import requests
+
+
+GRADES = {'alice': {'hw1': 1, 'exam': 30},
+          'bob': {'hw1': 3}}
+
+
+@pytest.fixture
+def portal():
+    return FakePortal(grades={u: dict(g) for u, g in GRADES.items()})
+
+
+def test_raw_body_is_not_decoded(make_client, portal):
+    client = make_client(portal)
+
+    raw = client.find_student_group_classifications('BI-PYT', raw=True)
+
+    assert isinstance(raw, RawResponse)
+    assert raw.status_code == 200
+    assert isinstance(raw.content, bytes)
+    assert json.loads(raw.content) == \
+        client.find_student_group_classifications('BI-PYT')
+
+
+def test_view_does_not_copy(make_client, portal):
+    client = make_client(portal)
+    raw = client.get_course_groups('BI-PYT', raw=True)
+
+    view = raw.view()
+    assert view.obj is raw.content
+    assert bytes(view[:1]) == b'['
+
+
+def test_headers_are_kept(make_client):
+    def responder(method, url, **kwargs):
+        return FakeResponse(200, {'a': 1},
+                            {'Content-Type': 'application/json'})
+
+    raw = make_client(responder).get_settings(raw=True)
+    assert raw.headers['Content-Type'] == 'application/json'
+
+
+def test_gzipped_response_is_decoded_without_encoding_headers(make_client):
+    body = json.dumps({'unsubscribeEmails': False}).encode()
+    compressed = gzip.compress(body)
+
+    def responder(method, url, **kwargs):
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.raw = urllib3.HTTPResponse(
+            io.BytesIO(compressed), preload_content=False,
+            headers={'Content-Type': 'application/json',
+                     'Content-Encoding': 'gzip',
+                     'Content-Length': str(len(compressed))})
+        resp.headers = requests.structures.CaseInsensitiveDict(
+            resp.raw.headers)
+        return resp
+
+    raw = make_client(responder).get_settings(raw=True)
+
+    assert raw.content == body
+    assert raw.headers['Content-Type'] == 'application/json'
+    assert 'Content-Encoding' not in raw.headers
+    assert 'Content-Length' not in raw.headers
+
+
+def test_error_is_raised(make_client):
+    client = make_client(lambda method, url, **kwargs: FakeResponse(404))
+
+    with pytest.raises(requests.HTTPError):
+        client.find_classification('BI-PYT', 'exam', raw=True)
+
+
+def test_raw_and_decoded_are_not_coalesced():
+    key = SingleFlight.make_key('GET', 'url', {'a': 1})
+
+    assert key == SingleFlight.make_key('GET', 'url', {'a': 1}, raw=False)
+    assert key != SingleFlight.make_key('GET', 'url', {'a': 1}, raw=True)
+
+
+def test_proxy_passes_raw(portal):
+    proxy = ClassificationParamsProxy('dummy', 'dummy',
+                                      session=FakeSession(portal),
+                                      course_code='BI-PYT')
+    raw = proxy.find_student_group_classifications(raw=True)
+    assert isinstance(raw, RawResponse)
@@ -0,0 +1,110 @@
+from classification import classification
+from classification.retrying import RetryPolicy, parse_retry_after
+from fakes import FakeResponse
+from oauthlib.oauth2 import TokenExpiredError
+from requests import HTTPError
+from requests.exceptions import ConnectionError
+import pytest
+
+
+def make_policy(**kwargs):
+    delays = []
+    policy = RetryPolicy(jitter=False, sleep=delays.append, **kwargs)
+    return policy, delays
+
+
+def scripted(*outcomes):
+    outcomes = list(outcomes)
+
+    def responder(method, url, **kwargs):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return responder
+
+
+@pytest.mark.parametrize(['value', 'expected'],
+                         [(None, None), ('3', 3.0), ('-1', 0.0),
+                          ('soon', None),
+                          ('Thu, 01 Jan 1970 00:01:40 GMT', 60.0)])
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value, now=40) == expected
+
+
+def test_backoff_is_exponential_and_capped():
+    policy = RetryPolicy(backoff_base=1, backoff_cap=5, jitter=False)
+    assert [policy.backoff(a) for a in range(1, 6)] == [1, 2, 4, 5, 5]
+    assert policy.backoff(1, retry_after=10) == 10
+
+
+def test_backoff_jitter_stays_in_bounds():
+    policy = RetryPolicy(backoff_base=1, backoff_cap=5)
+    assert all(0 <= policy.backoff(4) <= 5 for _ in range(100))
+
+
+@pytest.mark.parametrize(['method', 'retry_post', 'allowed'],
+                         [('GET', False, True), ('put', False, True),
+                          ('DELETE', False, True), ('POST', False, False),
+                          ('POST', True, True)])
+def test_allows_method(method, retry_post, allowed):
+    assert RetryPolicy(retry_post=retry_post).allows_method(method) \
+        == allowed
+
+
+def test_transient_failures_are_retried(make_client):
+    policy, delays = make_policy(max_attempts=4)
+    client = make_client(scripted(ConnectionError('reset'),
+                                  FakeResponse(503),
+                                  FakeResponse(502,
+                                               headers={'Retry-After': '7'}),
+                                  FakeResponse(200, {'ok': True})),
+                         retry_policy=policy)
+
+    assert client.get_settings() == {'ok': True}
+    assert delays == [0.5, 1.0, 7.0]
+
+
+def test_gives_up_after_max_attempts(make_client):
+    policy, delays = make_policy(max_attempts=2)
+    client = make_client(scripted(FakeResponse(504), FakeResponse(504)),
+                         retry_policy=policy)
+
+    with pytest.raises(HTTPError):
+        client.get_editors('MI-PYT')
+    assert len(delays) == 1
+
+
+def test_client_errors_are_not_retried(make_client):
+    policy, delays = make_policy()
+    client = make_client(scripted(FakeResponse(404)), retry_policy=policy)
+
+    with pytest.raises(HTTPError):
+        client.get_editors('MI-PYT')
+    assert delays == []
+
+
+def test_post_is_not_retried_by_default(make_client):
+    policy, delays = make_policy()
+    client = make_client(scripted(ConnectionError('reset')),
+                         retry_policy=policy)
+
+    with pytest.raises(ConnectionError):
+        client.save_classification('MI-PYT', {'identifier': 'lab01'})
+    assert delays == []
+
+
+def test_retry_composes_with_token_refresh(make_client, monkeypatch):
+    monkeypatch.setattr(classification, 'save_token', lambda token: None)
+    policy, delays = make_policy()
+    client = make_client(scripted(TokenExpiredError(),
+                                  FakeResponse(503),
+                                  FakeResponse(200, ['editor'])),
+                         retry_policy=policy)
+    client.session.refresh_token = lambda url, **kwargs: {
+        'access_token': 'new', 'refresh_token': 'new'}
+
+    assert client.get_editors('MI-PYT') == ['editor']
+    assert client.session.token['access_token'] == 'new'
+    assert delays == [0.5]
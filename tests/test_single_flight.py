@@ -0,0 +1,102 @@
+from classification.singleflight import SingleFlight
+from fakes import FakeResponse
+import threading
+import time
+import pytest
+
+
+def test_key_ignores_none_params_and_order():
+    key_1 = SingleFlight.make_key('get', 'url', {'a': 1, 'b': None, 'c': 'x'})
+    key_2 = SingleFlight.make_key('GET', 'url', {'c': 'x', 'a': 1})
+    assert key_1 == key_2
+    assert key_1 != SingleFlight.make_key('GET', 'url', {'a': 2, 'c': 'x'})
+
+
+def test_sequential_calls_are_not_shared():
+    group = SingleFlight()
+    assert group.do('key', lambda: 1) == 1
+    assert group.do('key', lambda: 2) == 2
+    assert group.coalesced == 0
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def run_concurrently(count, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_concurrent_calls_share_result_and_error():
+    group = SingleFlight()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        raise KeyError('boom')
+
+    def caller():
+        try:
+            group.do('key', slow)
+        except KeyError as e:
+            results.append(e)
+
+    threads = run_concurrently(5, caller)
+    wait_until(lambda: group.coalesced == 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 5
+
+
+def test_client_coalesces_identical_gets(make_client):
+    release = threading.Event()
+    results = []
+
+    def responder(method, url, **kwargs):
+        release.wait(5)
+        return FakeResponse(200, [{'identifier': 'lab01'}])
+
+    client = make_client(responder, single_flight=SingleFlight())
+
+    def caller():
+        results.append(client.find_classifications_for_course(
+            'MI-PYT', 'B171', 'cs'))
+
+    threads = run_concurrently(8, caller)
+    wait_until(lambda: client.single_flight.coalesced == 7)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(client.session.calls) == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_client_does_not_coalesce_writes(make_client):
+    client = make_client(lambda method, url, **kwargs: FakeResponse(201),
+                         single_flight=SingleFlight())
+    client.add_editor('MI-PYT', 'laskobor')
+    client.add_editor('MI-PYT', 'laskobor')
+    assert len(client.session.calls) == 2
+
+
+@pytest.mark.parametrize('params', [('B171', 'cs'), ('B172', 'cs'),
+                                    ('B171', 'en')])
+def test_client_passes_params(make_client, params):
+    client = make_client(lambda method, url, **kwargs: FakeResponse(200, [1]),
+                         single_flight=SingleFlight())
+    client.find_classifications_for_course('MI-PYT', *params)
+    _, _, kwargs = client.session.calls[0]
+    assert kwargs['params'] == {'semester': params[0], 'lang': params[1]}
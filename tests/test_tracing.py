@@ -0,0 +1,95 @@
+from classification import classification
+from classification.tracing import InMemoryTracer, NoOpTracer, \
+    OpenTelemetryTracer
+from fakes import FakeResponse
+from oauthlib.oauth2 import TokenExpiredError
+from contextlib import contextmanager
+import pytest
+
+
+def test_spans_are_nested():
+    tracer = InMemoryTracer()
+    with tracer.start_span('parent', {'course': 'MI-PYT'}) as parent:
+        with tracer.start_span('child'):
+            pass
+
+    child, root = tracer.spans
+    assert tracer.roots() == [root]
+    assert tracer.children(parent) == [child]
+    assert child.trace_id == root.trace_id
+    assert root.attributes == {'course': 'MI-PYT'}
+    assert root.duration >= child.duration >= 0
+
+
+def test_span_records_error():
+    tracer = InMemoryTracer()
+    with pytest.raises(KeyError):
+        with tracer.start_span('failing'):
+            raise KeyError('boom')
+    assert isinstance(tracer.spans[0].error, KeyError)
+
+
+def test_no_op_tracer():
+    with NoOpTracer().start_span('anything') as span:
+        span.set_attribute('key', 'value')
+
+
+def test_open_telemetry_adapter_drops_none_attributes():
+    calls = []
+
+    class FakeOtelTracer:
+        @contextmanager
+        def start_as_current_span(self, name, attributes):
+            calls.append((name, attributes))
+            yield
+
+    with OpenTelemetryTracer(FakeOtelTracer()).start_span(
+            'op', {'course': 'MI-PYT', 'semester': None}):
+        pass
+    assert calls == [('op', {'course': 'MI-PYT'})]
+
+
+def test_bulk_save_is_one_trace(make_client, monkeypatch):
+    monkeypatch.setattr(classification, 'save_token', lambda token: None)
+    outcomes = [TokenExpiredError(), FakeResponse(201)]
+
+    def responder(method, url, **kwargs):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    tracer = InMemoryTracer()
+    client = make_client(responder, tracer=tracer)
+    client.session.refresh_token = lambda url, **kwargs: {
+        'access_token': 'new', 'refresh_token': 'new'}
+
+    client.save_student_classifications_simple_t2s(
+        'MI-PYT', {'lab01': {'student': 5}}, 'B171')
+
+    root, = tracer.roots()
+    assert root.name == 'save_student_classifications_simple_t2s'
+    assert root.attributes == {'course': 'MI-PYT', 'semester': 'B171'}
+
+    names = [s.name for s in tracer.children(root)]
+    assert names == ['convert', 'save_student_classifications']
+
+    save = tracer.children(root)[1]
+    assert [s.name for s in tracer.children(save)] == \
+        ['serialize', 'HTTP PUT', 'refresh_token',
+         'serialize', 'HTTP PUT', 'decode']
+    assert isinstance(tracer.children(save)[1].error, TokenExpiredError)
+    http = tracer.children(save)[-2]
+    assert http.attributes['http.status_code'] == 201
+    assert http.attributes['endpoint'] == 'save_student_classifications'
+
+
+def test_group_attribute(make_client):
+    tracer = InMemoryTracer()
+    client = make_client(lambda method, url, **kwargs: FakeResponse(200, []),
+                         tracer=tracer)
+    client.find_student_group_classifications('MI-PYT', 'Pa-101')
+
+    root, = tracer.roots()
+    assert root.attributes == {'course': 'MI-PYT', 'group': 'Pa-101'}
+    assert [s.name for s in tracer.children(root)] == ['HTTP GET', 'decode']
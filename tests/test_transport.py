@@ -0,0 +1,207 @@
+from classification import classification, Urllib3Transport
+from classification.transport import Transport, Urllib3Response
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from oauthlib.oauth2 import InsecureTransportError
+from requests.exceptions import ConnectionError, HTTPError
+from requests_oauthlib import OAuth2Session
+import gzip
+import json
+import socket
+import threading
+import time
+import pytest
+
+
+class RecordingServer:
+    """Answers every request with the next scripted response
+    and records what it received."""
+
+    def __init__(self):
+        self.requests = []
+        self.responses = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def handle_one(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                server.requests.append({
+                    'method': self.command, 'path': self.path,
+                    'headers': dict(self.headers),
+                    'body': self.rfile.read(length)})
+                status, body = server.responses.pop(0) \
+                    if server.responses else (200, None)
+                data = b'' if body is None else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_PUT = do_POST = do_DELETE = handle_one
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        host, port = self.httpd.server_address[:2]
+        self.url = f'http://{host}:{port}'
+        threading.Thread(target=self.httpd.serve_forever, args=(0.01,),
+                         daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setenv('OAUTHLIB_INSECURE_TRANSPORT', '1')
+    server = RecordingServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def client(server):
+    session = OAuth2Session(client_id='dummy',
+                            token={'access_token': 'secret',
+                                   'refresh_token': 'again',
+                                   'token_type': 'Bearer'})
+    client = classification.Classification(
+        'dummy', 'dummy', session=session,
+        transport=Urllib3Transport.from_session)
+    client.API_URL = server.url
+    yield client
+    client.drop_session()
+
+
+def test_interface():
+    assert isinstance(OAuth2Session(), Transport)
+    assert issubclass(Urllib3Transport, Transport)
+    with pytest.raises(TypeError):
+        Transport()
+
+
+def test_session_is_wrapped(client):
+    assert isinstance(client.session, Urllib3Transport)
+    assert client.session.token['access_token'] == 'secret'
+
+
+def test_get_with_bearer_token_and_params(client, server):
+    server.responses.append((200, [{'identifier': 'lab01'}]))
+
+    result = client.find_classifications_for_course('MI-PYT',
+                                                    semester='B182')
+
+    assert result == [{'identifier': 'lab01'}]
+
+    request = server.requests[0]
+    assert request['method'] == 'GET'
+    assert request['path'] == \
+        '/public/courses/MI-PYT/classifications?semester=B182'
+    assert request['headers']['Authorization'] == 'Bearer secret'
+    assert request['headers']['Accept-Encoding'] == 'gzip, deflate'
+
+
+def test_none_params_are_dropped(client, server):
+    server.responses.append((200, []))
+
+    client.find_classifications_for_course('MI-PYT')
+
+    assert '?' not in server.requests[0]['path']
+
+
+def test_put_json_body(client, server):
+    server.responses.append((201, None))
+
+    client.save_student_classifications_simple_s2t(
+        'MI-PYT', {'alice': {'lab01': 5}})
+
+    request = server.requests[0]
+    assert request['method'] == 'PUT'
+    assert request['headers']['Content-Type'] == 'application/json'
+    assert json.loads(request['body']) == [
+        {'classificationIdentifier': 'lab01',
+         'studentUsername': 'alice', 'value': 5}]
+
+
+def test_compressed_response_is_decoded(client, server):
+    body = gzip.compress(json.dumps(['editor']).encode())
+
+    class Handler(server.httpd.RequestHandlerClass):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server.httpd.RequestHandlerClass = Handler
+
+    assert client.get_editors('MI-PYT') == ['editor']
+
+
+def test_error_status_raises_http_error(client, server):
+    server.responses.append((404, None))
+
+    with pytest.raises(HTTPError) as info:
+        client.get_editors('MI-PYT')
+    assert info.value.response.status_code == 404
+
+
+def test_expired_token_is_refreshed(client, server, monkeypatch):
+    monkeypatch.setattr(classification, 'save_token', lambda token: None)
+    calls = []
+
+    def refresh_token(url, **kwargs):
+        calls.append(kwargs['refresh_token'])
+        return {'access_token': 'new', 'refresh_token': 'new',
+                'token_type': 'Bearer'}
+
+    client.session.session.refresh_token = refresh_token
+    client.session.token = dict(client.session.token,
+                                expires_at=time.time() - 10)
+    server.responses.append((200, ['editor']))
+
+    assert client.get_editors('MI-PYT') == ['editor']
+    assert calls == ['again']
+    assert len(server.requests) == 1
+    assert server.requests[0]['headers']['Authorization'] == 'Bearer new'
+
+
+def test_connection_error(client):
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        client.API_URL = f'http://127.0.0.1:{s.getsockname()[1]}'
+
+    with pytest.raises(ConnectionError):
+        client.get_editors('MI-PYT')
+
+
+def test_insecure_transport(server, monkeypatch):
+    monkeypatch.delenv('OAUTHLIB_INSECURE_TRANSPORT')
+    transport = Urllib3Transport(OAuth2Session(token={'access_token': 'x'}))
+
+    with pytest.raises(InsecureTransportError):
+        transport.request('GET', server.url)
+
+
+def test_unsupported_options(server):
+    transport = Urllib3Transport(OAuth2Session(token={'access_token': 'x'}))
+
+    with pytest.raises(TypeError):
+        transport.request('GET', server.url, cookies={'a': 'b'})
+
+
+def test_response():
+    response = Urllib3Response(200, {}, b'{"a": 1}', 'OK', 'http://x')
+
+    assert response.json() == {'a': 1}
+    response.raise_for_status()
+    with pytest.raises(HTTPError):
+        Urllib3Response(503, {}, b'', 'Unavailable',
+                        'http://x').raise_for_status()